@@ -1,7 +1,10 @@
 from uuid import UUID
 from datetime import datetime, timezone
+import hashlib
+from time import time
 from sqlmodel import select
-from fastapi import Depends, Request, HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
+from fastapi import Depends, Header, Request, HTTPException
 import jwt
 from fastapi.security import OAuth2PasswordBearer
 from typing import Annotated
@@ -13,16 +16,26 @@ from app.auth.models import (
     RefreshToken,
     InternalRefreshToken
 )
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.users.models import UserRead
 from app.core.exceptions import InternalError, TokenError, UserNotFoundError
-from app.users.CRUD import get_user_by_uuid
-from app.core.database import get_db_session
+from app.users.CRUD import get_cached_user
+from app.core.database import SessionDep, get_async_db_session
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
+# Claims of the verified access tokens, by SHA-256 digest of the token, each
+# until the token expires: a request runs `jwt.decode` once per token instead
+# of once per dependency and per request
+ACCESS_TOKEN_CACHE: TTLCache[bytes, InternalAccessTokenPayload] = TTLCache(
+    "access_tokens",
+    maxsize=settings.ACCESS_TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
 
 def create_access_token(payload: PublicAccessTokenPayload) -> str:
     try:
@@ -36,6 +49,10 @@ def create_access_token(payload: PublicAccessTokenPayload) -> str:
 
 
 def decode_access_token(token: str) -> InternalAccessTokenPayload:
+    digest = hashlib.sha256(token.encode()).digest()
+    token_payload = ACCESS_TOKEN_CACHE.get(digest)
+    if token_payload is not None:
+        return token_payload
     try:
         payload = jwt.decode(
             jwt=token,
@@ -43,7 +60,7 @@ def decode_access_token(token: str) -> InternalAccessTokenPayload:
             algorithms=[settings.TOKEN_ALGORITHM],
             options={"verify_iss": True},
         )
-        return InternalAccessTokenPayload(
+        token_payload = InternalAccessTokenPayload(
             user_uuid=UUID(payload["user_uuid"]),
             orga_uuids=[UUID(orga) for orga in payload["orga_uuids"]],
             role=payload["role"],
@@ -54,12 +71,18 @@ def decode_access_token(token: str) -> InternalAccessTokenPayload:
         raise TokenError(f"Invalid token : {e}")
     except Exception as e:
         raise InternalError(f"Error decoding access token : {e}")
+    # Invalid tokens are not cached: each one is checked again
+    ttl = payload["exp"] - time() if "exp" in payload else None
+    ACCESS_TOKEN_CACHE.set(digest, token_payload, ttl=ttl)
+    return token_payload
 
 
-async def get_current_user(token: TokenDep) -> UserRead:
+async def get_current_user(token: TokenDep, session: SessionDep) -> UserRead:
     try:
         token_payload = decode_access_token(token)
-        user = await get_user_by_uuid(user_uuid=token_payload.user_uuid)
+        user = await get_cached_user(
+            user_uuid=token_payload.user_uuid, session=session
+        )
         if user is None:
             raise UserNotFoundError()
         assert user.uuid == token_payload.user_uuid
@@ -73,28 +96,51 @@ async def get_current_user(token: TokenDep) -> UserRead:
 CurrentUser = Annotated[UserRead, Depends(get_current_user)]
 
 
-async def verify_organization_access(request: Request, token: TokenDep):
-    token_payload = decode_access_token(token)
-    assert request is not None
-
-    # Vérifier l'unicité de la clef orga_uuid dans la requête
-    request_body = await request.json()
-    assert isinstance(request_body, dict)
-    assert "orga_uuid" in request_body
-    assert isinstance(request_body["orga_uuid"], str)
-    orga_uuid = UUID(request_body["orga_uuid"])
+async def verify_organization_access(
+    request: Request,
+    token: TokenDep,
+    x_organisation_uuid: UUID | None = Header(
+        None, description="Organisation of the routes without `orga_uuid` path"
+    ),
+) -> UUID:
+    """
+    Organisation the request acts on, from the `orga_uuid` path parameter or
+    the `X-Organisation-UUID` header, checked against the (cached) token
+    claims. The body is never read: it may be large, or absent.
+    """
+    path_orga_uuid = request.path_params.get("orga_uuid")
+    try:
+        orga_uuid = UUID(str(path_orga_uuid)) if path_orga_uuid else None
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid orga_uuid")
+    if orga_uuid is None:
+        orga_uuid = x_organisation_uuid
+    elif x_organisation_uuid not in (None, orga_uuid):
+        raise HTTPException(
+            status_code=400,
+            detail="X-Organisation-UUID does not match the orga_uuid of the path",
+        )
+    if orga_uuid is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Organisation missing: set the X-Organisation-UUID header",
+        )
 
+    token_payload = decode_access_token(token)
     if orga_uuid in token_payload.orga_uuids:
-        return
+        return orga_uuid
 
     raise HTTPException(
         status_code=403, detail="User not authorized for this organization"
     )
 
+
 VerifiedOrganization = Annotated[UUID, Depends(verify_organization_access)]
 
 
-async def create_refresh_token(user_uuid: UUID) -> str:
+async def create_refresh_token(
+    user_uuid: UUID, session: AsyncSession | None = None
+) -> str:
     payload = RefreshTokenPayload(user_uuid=str(user_uuid))
     token = jwt.encode(
         payload.model_dump(),
@@ -103,10 +149,10 @@ async def create_refresh_token(user_uuid: UUID) -> str:
     )
     refresh_token = RefreshToken(user_uuid=user_uuid, refreshtoken_payload=token)
 
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         session.add(refresh_token)
-        session.commit()
-        session.refresh(refresh_token)
+        await session.flush()
+        await session.refresh(refresh_token)
     return token
 
 
@@ -130,15 +176,17 @@ def decode_refresh_token(token: str) -> InternalRefreshToken:
     except Exception:
         raise InternalError("Error decoding refresh token")
 
-async def check_refresh_token_validity(token: str, user_uuid: UUID) -> bool:
-    with get_db_session() as session:
+async def check_refresh_token_validity(
+    token: str, user_uuid: UUID, session: AsyncSession | None = None
+) -> bool:
+    async with get_async_db_session(session) as session:
         statement = select(RefreshToken).where(
             RefreshToken.user_uuid == user_uuid,
             RefreshToken.refreshtoken_payload == token,
             not RefreshToken.is_revoked,
             RefreshToken.exp > datetime.now(timezone.utc),
         )
-        refresh_token = session.exec(statement).first()
+        refresh_token = (await session.exec(statement)).first()
 
         if not refresh_token:
             raise TokenError("Refresh token is invalid, expired, or has been revoked")
@@ -146,28 +194,29 @@ async def check_refresh_token_validity(token: str, user_uuid: UUID) -> bool:
         return True
 
 
-async def revoke_refresh_token(token: str, user_uuid: UUID):
-    with get_db_session() as session:
+async def revoke_refresh_token(
+    token: str, user_uuid: UUID, session: AsyncSession | None = None
+):
+    async with get_async_db_session(session) as session:
         statement = select(RefreshToken).where(
             RefreshToken.user_uuid == user_uuid,
             RefreshToken.refreshtoken_payload == token,
         )
-        refresh_token = session.exec(statement).first()
+        refresh_token = (await session.exec(statement)).first()
 
         if refresh_token:
             refresh_token.is_revoked = True
-            session.commit()
-            session.refresh(refresh_token)
+            await session.flush()
+            await session.refresh(refresh_token)
 
 
-async def delete_expired_tokens():
-    with get_db_session() as session:
+async def delete_expired_tokens(session: AsyncSession | None = None):
+    async with get_async_db_session(session) as session:
         statement = select(RefreshToken).where(
             RefreshToken.exp <= datetime.now(timezone.utc)
         )
-        expired_tokens = session.exec(statement).first()
-        assert expired_tokens is not None
+        expired_tokens = (await session.exec(statement)).all()
         for token in expired_tokens:
-            session.delete(token)
+            await session.delete(token)
 
-        session.commit()
+        await session.flush()
@@ -18,15 +18,16 @@ from app.core.exceptions import (
     UserNotFoundError,
     AuthenticationError,
 )
-from app.core.config import settings
+from app.core.database import SessionDep
+from app.core.passwords import PASSWORD_HASHER
 
 
 router = APIRouter()
 
 
-def _verify_password(plain_password: str, hashed_password: str) -> bool:
+async def _verify_password(plain_password: str, hashed_password: str) -> bool:
     try:
-        return settings.pwd_context.verify(secret=plain_password, hash=hashed_password)
+        return await PASSWORD_HASHER.verify(plain_password, hashed_password)
     except Exception:
         raise InternalError("Error during password verification")
 
@@ -37,15 +38,19 @@ async def read_main():
 
 
 @router.post("/login", response_model=dict, status_code=200)
-async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_access_token(
+    session: SessionDep, form_data: OAuth2PasswordRequestForm = Depends()
+):
     try:
-        user = await get_user_by_email(email=form_data.username)
-        if not user or not _verify_password(
+        user = await get_user_by_email(email=form_data.username, session=session)
+        if not user or not await _verify_password(
             plain_password=form_data.password, hashed_password=user.password
         ):
             raise AuthenticationError()
 
-        user_organisations_uuids = await get_all_orgas_of_user(user_uuid=user.uuid)
+        user_organisations_uuids = await get_all_orgas_of_user(
+            user_uuid=user.uuid, session=session
+        )
 
         access_token_payload = PublicAccessTokenPayload(
             user_uuid=str(user.uuid),
@@ -54,7 +59,7 @@ async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
         )
 
         access_token = create_access_token(access_token_payload)
-        refresh_token = await create_refresh_token(user.uuid)
+        refresh_token = await create_refresh_token(user.uuid, session=session)
 
         return {
             "access_token": access_token,
@@ -80,21 +85,25 @@ async def test_token(user: CurrentUser):
 
 
 @router.post("/refresh", response_model=dict, status_code=200)
-async def refresh_access_token(refresh_token: str):
+async def refresh_access_token(refresh_token: str, session: SessionDep):
     try:
         refresh_payload = decode_refresh_token(refresh_token)
-        user = await get_user_by_uuid(user_uuid=refresh_payload.user_uuid)
+        user = await get_user_by_uuid(
+            user_uuid=refresh_payload.user_uuid, session=session
+        )
         if not user:
             raise UserNotFoundError()
 
         try:
             assert await check_refresh_token_validity(
-                token=refresh_token, user_uuid=user.uuid
+                token=refresh_token, user_uuid=user.uuid, session=session
             )
         except AssertionError as e:
             raise TokenError(f"Refresh token is invalid or has been revoked : {e}")
 
-        user_organisations_uuids = await get_all_orgas_of_user(user_uuid=user.uuid)
+        user_organisations_uuids = await get_all_orgas_of_user(
+            user_uuid=user.uuid, session=session
+        )
 
         new_access_token_payload = PublicAccessTokenPayload(
             user_uuid=str(user.uuid),
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import CRUD
+from app.auth.CRUD import ACCESS_TOKEN_CACHE, create_access_token, decode_access_token
+from app.auth.models import PublicAccessTokenPayload
+from app.core import cache
+from app.core.config import settings
+from app.core.exceptions import TokenError
+from app.main import app
+from app.organisations.models_permissions import Role
+
+
+def _token(expires_in: timedelta) -> str:
+    return create_access_token(
+        PublicAccessTokenPayload(
+            user_uuid="123e4567-e89b-12d3-a456-426614174000",
+            orga_uuids=["123e4567-e89b-12d3-a456-426614174001"],
+            role=Role.OWNER.value,
+            exp=datetime.now(timezone.utc) + expires_in,
+        )
+    )
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Number of signature checks made by `decode_access_token`."""
+    calls = []
+    decode = CRUD.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(CRUD.jwt, "decode", counting_decode)
+    ACCESS_TOKEN_CACHE.clear()
+    return calls
+
+
+def test_verified_tokens_are_cached_until_they_expire(decodes, monkeypatch):
+    token = _token(timedelta(minutes=5))
+
+    first = decode_access_token(token)
+    assert decode_access_token(token) == first
+    assert len(decodes) == 1
+    assert ACCESS_TOKEN_CACHE.stats()["hits"] == 1
+
+    # Past the token's exp, the entry is gone
+    later = cache.monotonic() + 5 * 60 + 1
+    monkeypatch.setattr(cache, "monotonic", lambda: later)
+    decode_access_token(token)
+    assert len(decodes) == 2
+
+
+def test_invalid_tokens_are_not_cached(decodes):
+    for _ in range(2):
+        with pytest.raises(TokenError):
+            decode_access_token(_token(timedelta(minutes=5)) + "x")
+    assert len(decodes) == 2
+    assert ACCESS_TOKEN_CACHE.stats()["size"] == 0
+
+
+def test_cache_stats_are_exposed(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "internal-secret")
+    response = TestClient(app).get(
+        "/internal/caches", headers={"X-Internal-Token": "internal-secret"}
+    )
+    assert response.status_code == 200
+    assert {"hits", "misses", "hit_ratio"} <= set(response.json()["access_tokens"])
@@ -1,9 +1,33 @@
 from sqlmodel import select
-from app.clients.models import Client, ClientCreate, ClientRead, ClientUpdate
+from app.clients.models import (
+    Client,
+    ClientCreate,
+    ClientMatch,
+    ClientRead,
+    ClientUpdate,
+)
 from app.core.exceptions import DatabaseOperationError, ClientNotFoundError
 from app.core.database import get_db_session
+from app.core.loading import load_policy
+from app.core.pagination import KeysetPagination, Page
+from app.core.trigrams import (
+    PERSON_SEARCH_COLUMNS,
+    PERSON_SEARCH_DIGIT_COLUMNS,
+    TrigramSearch,
+)
 from uuid import UUID
 
+# ClientRead serialises no relationship
+CLIENT_READ_LOADING = load_policy()
+
+CLIENT_PAGINATION = KeysetPagination(
+    Client.id, {"id": Client.id, "created_at": Client.created_at}
+)
+
+CLIENT_SEARCH = TrigramSearch(
+    Client, PERSON_SEARCH_COLUMNS, PERSON_SEARCH_DIGIT_COLUMNS
+)
+
 
 def create_client(client_create: ClientCreate) -> ClientRead:
     """
@@ -46,7 +70,7 @@ def get_client_by_uuid(client_id: int) -> ClientRead:
         HTTPException: If the client is not found or if the user is not authorized.
     """
     with get_db_session() as session:
-        client = session.get(Client, client_id)
+        client = session.get(Client, client_id, options=CLIENT_READ_LOADING)
         if not client:
             raise ClientNotFoundError(f"Client with id {client_id} not found")
         return ClientRead.model_validate(client)
@@ -112,34 +136,75 @@ def delete_client(client_id: int) -> ClientRead:
 
 
 def get_clients_by_organisation(
-    orga_uuid: UUID, skip: int = 0, limit: int = 100
-) -> list[ClientRead]:
+    orga_uuid: UUID,
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str = "id",
+    descending: bool = False,
+) -> Page[ClientRead]:
     """
-    Retrieve a list of clients for a specific organisation.
+    Retrieve a page of clients for a specific organisation.
 
     Args:
 
         orga_uuid (UUID): The ID of the organisation.
-        skip (int): The number of clients to skip (for pagination).
+        cursor (str | None): The `next_cursor` of the previous page, None for the first page.
         limit (int): The maximum number of clients to return.
+        sort_by (str): The field to sort by, one of `CLIENT_PAGINATION.sort_fields`.
+        descending (bool): Whether to sort in descending order.
 
     Returns:
-        list[ClientRead]: A list of retrieved clients for the specified organisation.
+        Page[ClientRead]: The retrieved clients and the cursor of the next page.
 
     Raises:
+        PaginationError: If the cursor or the sort field is invalid.
         DatabaseOperationError: If an error occurs during the retrieval operation.
     """
+    statement = CLIENT_PAGINATION.apply(
+        select(Client)
+        .where(Client.orga_uuid == orga_uuid)
+        .options(*CLIENT_READ_LOADING),
+        sort_by,
+        descending,
+        cursor,
+        limit,
+    )
     with get_db_session() as session:
         try:
-            statement = (
-                select(Client)
-                .where(Client.orga_uuid == orga_uuid)
-                .offset(skip)
-                .limit(limit)
-            )
             clients = session.exec(statement).all()
-            return [ClientRead.model_validate(client) for client in clients]
+            return CLIENT_PAGINATION.page(
+                clients, sort_by, descending, limit, ClientRead
+            )
         except Exception as e:
             raise DatabaseOperationError(
                 f"Failed to retrieve clients for organisation: {str(e)}"
             )
+
+
+def search_clients(orga_uuid: UUID, query: str, limit: int = 20) -> list[ClientMatch]:
+    """
+    Fuzzy lookup of the clients of an organisation by partial name, company,
+    email or phone number, tolerant to typos.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        query (str): What the clerk typed.
+        limit (int): The maximum number of clients to return.
+
+    Returns:
+        List[ClientMatch]: The matching clients, best first.
+
+    Raises:
+        DatabaseOperationError: If an error occurs during the lookup.
+    """
+    with get_db_session() as session:
+        try:
+            return [
+                ClientMatch.model_validate({**client.model_dump(), "score": score})
+                for client, score in CLIENT_SEARCH.search(
+                    session, orga_uuid, query, limit
+                )
+            ]
+        except Exception as e:
+            raise DatabaseOperationError(f"Failed to search clients: {str(e)}")
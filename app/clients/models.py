@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, Index, SQLModel, Relationship
 from datetime import datetime
 from uuid import UUID
 
@@ -24,12 +24,18 @@ class ClientBase(SQLModel):
 
 
 class Client(ClientBase, table=True):
+    # Tenant-scoped lookups, in the (filter, id) order used to paginate
+    __table_args__ = (
+        Index("ix_client_orga_uuid_id", "orga_uuid", "id"),
+        Index("ix_client_orga_uuid_created_at_id", "orga_uuid", "created_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     lots_buy: list["Lot"] | None = Relationship(
         back_populates="buyer",
-        sa_relationship_kwargs={"foreign_keys": "Lot.buyer_id", "lazy": "selectin"},
+        sa_relationship_kwargs={"foreign_keys": "Lot.buyer_id"},
     )
     orga_uuid: UUID = Field(
         default=None, foreign_key="organisation.uuid", nullable=False
@@ -38,30 +44,34 @@ class Client(ClientBase, table=True):
         back_populates="clients",
         sa_relationship_kwargs={
             "foreign_keys": "Client.orga_uuid",
-            "lazy": "selectin",
         },
     )
     invoices: list["Invoice"] | None = Relationship(
         back_populates="client",
         sa_relationship_kwargs={
             "foreign_keys": "Invoice.client_id",
-            "lazy": "selectin",
         },
     )
 
 
 class ClientCreate(ClientBase):
-    orga_uuid: int | None = None
+    orga_uuid: UUID | None = None
     pass
 
 
 class ClientRead(ClientBase):
     id: int
-    orga_uuid: int
+    orga_uuid: UUID
     created_at: datetime
     updated_at: datetime
 
 
+class ClientMatch(ClientRead):
+    """A client found by the fuzzy lookup, `score` from 0 to 1."""
+
+    score: float
+
+
 class ClientUpdate(SQLModel):
     first_name: str | None = None
     last_name: str | None = None
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+import threading
+from time import monotonic
+from typing import Any, Generic, Protocol, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_caches: dict[str, "TTLCache"] = {}
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU cache whose entries expire `ttl` seconds after being set.
+
+    Each worker has its own copy: invalidating an entry only reaches the
+    worker that made the change, the others serve it until it expires. Keep
+    `ttl` to what a stale value may cost. Safe to share between threads.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        _caches[name] = self
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def peek(self, key: K) -> V | None:
+        """Like `get`, without counting a hit or a miss nor refreshing `key`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= monotonic():
+                return None
+            return entry[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Cache `value` for `ttl` seconds, the cache's `ttl` by default."""
+        with self._lock:
+            self._entries[key] = (
+                monotonic() + (self.ttl if ttl is None else ttl),
+                value,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+            }
+
+
+class CacheBackend(Protocol[K, V]):
+    """
+    Cache shared by the code paths of one kind of record. `InProcessCache`
+    is the default; a shared cache (Redis...) implementing these methods can
+    replace it, so that an invalidation reaches every worker.
+    """
+
+    async def get(self, key: K) -> V | None: ...
+
+    async def set(self, key: K, value: V, ttl: float | None = None) -> None: ...
+
+    async def invalidate(self, key: K) -> None: ...
+
+
+class InProcessCache(Generic[K, V]):
+    """`CacheBackend` over a `TTLCache` of the worker."""
+
+    def __init__(self, cache: TTLCache[K, V]):
+        self.cache = cache
+
+    async def get(self, key: K) -> V | None:
+        return self.cache.get(key)
+
+    async def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def invalidate(self, key: K) -> None:
+        self.cache.invalidate(key)
+
+
+def get_cache_stats() -> dict[str, dict[str, Any]]:
+    """Statistics of every cache of the process, by name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
@@ -1,6 +1,21 @@
 from app.core.config import settings
-from contextlib import contextmanager
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, contextmanager
+from itertools import chain
+import logging
+from time import monotonic
+from typing import Annotated, Any
+from uuid import UUID
+from fastapi import Depends, Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session as ORMSession
 from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from app.core.migrations import run_migrations
+from app.core.query_stats import instrument_engine
 
 # Import all models
 from app.clients.models import Client  # noqa: F401
@@ -13,12 +28,62 @@ from app.users.models import User  # noqa: F401
 from app.organisations.models_permissions import UserOrganisationLink  # noqa: F401
 from app.inventories.models import Inventory  # noqa: F401
 
-engine = create_engine(settings.DATABASE_URL)
+logger = logging.getLogger(__name__)
+
+
+def _engine_options(url: str, poolclass: type) -> dict[str, Any]:
+    options: dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and not parsed.database:
+        # In-memory SQLite lives in a single connection: keep the default pool
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    **_engine_options(settings.DATABASE_URL, InstrumentedQueuePool),
+)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    **_engine_options(settings.ASYNC_DATABASE_URL, InstrumentedAsyncAdaptedQueuePool),
+)
+async_replica_engine = (
+    create_async_engine(
+        settings.ASYNC_REPLICA_DATABASE_URL,
+        **_engine_options(
+            settings.ASYNC_REPLICA_DATABASE_URL, InstrumentedAsyncAdaptedQueuePool
+        ),
+    )
+    if settings.ASYNC_REPLICA_DATABASE_URL
+    else None
+)
+instrument_engine(engine, explain_engine=engine)
+instrument_engine(async_engine.sync_engine, explain_engine=engine)
+if async_replica_engine is not None:
+    instrument_engine(async_replica_engine.sync_engine)
+
+# Per process: monotonic time of the last committed write of each tenant
+_tenant_writes: dict[UUID, float] = {}
+_replica_unavailable_until = 0.0
 
 
 def init_db():
+    """
+    Drop every table and rebuild the schema from scratch.
+
+    Destructive: only meant for tests. The application upgrades the schema
+    through `run_migrations` at startup instead.
+    """
     SQLModel.metadata.drop_all(engine)
-    SQLModel.metadata.create_all(engine)
+    run_migrations(engine)
 
 
 @contextmanager
@@ -32,3 +97,148 @@ def get_db_session():
         raise
     finally:
         session.close()
+
+
+def mark_tenant_write(orga_uuid: UUID) -> None:
+    """
+    Record that `orga_uuid` just wrote to the primary. ORM flushes are tracked
+    automatically; Core statements (bulk inserts...) must call this.
+    """
+    _tenant_writes[orga_uuid] = monotonic()
+
+
+def _recently_written(orga_uuid: UUID) -> bool:
+    written_at = _tenant_writes.get(orga_uuid)
+    if written_at is None:
+        return False
+    if monotonic() - written_at >= settings.READ_YOUR_WRITES_SECONDS:
+        del _tenant_writes[orga_uuid]
+        return False
+    return True
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _collect_written_tenants(session: ORMSession, flush_context: Any) -> None:
+    for obj in chain(session.new, session.dirty, session.deleted):
+        orga_uuid = getattr(obj, "orga_uuid", None)
+        if isinstance(orga_uuid, UUID):
+            session.info.setdefault("written_tenants", set()).add(orga_uuid)
+
+
+@event.listens_for(ORMSession, "after_commit")
+def _mark_written_tenants(session: ORMSession) -> None:
+    for orga_uuid in session.info.pop("written_tenants", ()):
+        mark_tenant_write(orga_uuid)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _forget_written_tenants(session: ORMSession) -> None:
+    session.info.pop("written_tenants", None)
+
+
+async def _open_read_only_session(orga_uuid: UUID | None) -> AsyncSession:
+    """
+    Session on the replica when one is configured and usable, on the primary
+    otherwise (no replica, tenant inside its read-your-writes window, or
+    replica unreachable).
+    """
+    global _replica_unavailable_until
+
+    use_replica = (
+        async_replica_engine is not None
+        and monotonic() >= _replica_unavailable_until
+        and not (orga_uuid is not None and _recently_written(orga_uuid))
+    )
+    if use_replica:
+        session = AsyncSession(async_replica_engine, expire_on_commit=False)
+        try:
+            # Connect now rather than on the first query, while falling back
+            # is still transparent for the caller
+            await session.connection()
+            return session
+        except (exc.DBAPIError, exc.TimeoutError, OSError) as e:
+            await session.close()
+            _replica_unavailable_until = (
+                monotonic() + settings.REPLICA_RETRY_AFTER_SECONDS
+            )
+            logger.warning("Read replica unavailable, using the primary: %s", e)
+    return AsyncSession(async_engine, expire_on_commit=False)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Await `callback` once the transaction of `session` is committed (not if
+    it is rolled back), typically to invalidate a cache: before the commit,
+    other sessions still read the previous values.
+    """
+    session.info.setdefault("after_commit_callbacks", []).append(callback)
+
+
+@asynccontextmanager
+async def get_async_db_session(
+    session: AsyncSession | None = None,
+    read_only: bool = False,
+    orga_uuid: UUID | None = None,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Async counterpart of `get_db_session`, to be used from `async def` code.
+
+    When `session` is given (typically the request-scoped one from
+    `SessionDep`) it is yielded as is: its owner decides when to commit, so
+    several CRUD calls share one connection and one transaction. Otherwise a
+    new session is opened, committed on success and rolled back on error.
+
+    `read_only` sessions are routed to the read replica when one is
+    configured. Pass the tenant's `orga_uuid` so that its reads go to the
+    primary for `READ_YOUR_WRITES_SECONDS` after it wrote.
+
+    Objects are not expired on commit: once the session is closed their
+    attributes can still be read without triggering I/O on the event loop.
+    """
+    if session is not None:
+        yield session
+        return
+
+    if read_only:
+        session = await _open_read_only_session(orga_uuid)
+    else:
+        session = AsyncSession(async_engine, expire_on_commit=False)
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        session.info.pop("after_commit_callbacks", None)
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+    for callback in session.info.pop("after_commit_callbacks", ()):
+        await callback()
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency providing a unit of work for the whole request: the
+    transaction is committed once the endpoint returns, or rolled back if it
+    raises.
+    """
+    async with get_async_db_session() as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Read-only flavour of `get_session` for GET endpoints, routed to the
+    replica. The tenant is taken from the `orga_uuid` path parameter; a
+    malformed one is left to the endpoint's validation (422).
+    """
+    try:
+        orga_uuid = UUID(str(request.path_params["orga_uuid"]))
+    except (KeyError, ValueError):
+        orga_uuid = None
+    async with get_async_db_session(read_only=True, orga_uuid=orga_uuid) as session:
+        yield session
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
@@ -79,6 +79,27 @@ class PermissionDenied(BaseAPIException):
         super().__init__(message, "PERMISSION_DENIED")
 
 
+class PaginationError(BaseAPIException):
+    """Exception raised for an invalid cursor or sort field."""
+
+    def __init__(self, message: str = "Invalid pagination parameters"):
+        super().__init__(message, "INVALID_PAGINATION")
+
+
+class FieldSelectionError(BaseAPIException):
+    """Exception raised when unknown fields are requested."""
+
+    def __init__(self, message: str = "Invalid fields selection"):
+        super().__init__(message, "INVALID_FIELDS")
+
+
+class SpreadsheetError(BaseAPIException):
+    """Exception raised when an imported spreadsheet cannot be read."""
+
+    def __init__(self, message: str = "Invalid spreadsheet"):
+        super().__init__(message, "INVALID_SPREADSHEET")
+
+
 class NotFoundError(BaseAPIException):
     """Generic exception for resource not found."""
 
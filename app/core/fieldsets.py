@@ -0,0 +1,58 @@
+from functools import lru_cache
+from pydantic import BaseModel, create_model
+from sqlmodel import SQLModel
+
+from app.core.exceptions import FieldSelectionError
+
+
+def selectable_fields(
+    read_model: type[BaseModel], table_model: type[SQLModel]
+) -> set[str]:
+    """Fields of `read_model` stored as columns of `table_model`."""
+    columns = table_model.__table__.columns.keys()  # type: ignore[attr-defined]
+    return set(read_model.model_fields) & set(columns)
+
+
+def parse_fields(
+    fields: str | None,
+    read_model: type[BaseModel],
+    table_model: type[SQLModel],
+    always: tuple[str, ...] = ("id",),
+) -> tuple[str, ...] | None:
+    """
+    Parse a `fields=name,stock_number` query parameter into the columns to
+    select, `always` first. None (no projection) when `fields` is empty.
+
+    Raises:
+        FieldSelectionError: If a field is not a column of the read model.
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = set(requested) - selectable_fields(read_model, table_model)
+    if unknown:
+        raise FieldSelectionError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Selectable fields: "
+            + ", ".join(sorted(selectable_fields(read_model, table_model)))
+        )
+    return tuple(dict.fromkeys((*always, *requested)))
+
+
+@lru_cache(maxsize=256)
+def trimmed_model(
+    read_model: type[BaseModel], fields: tuple[str, ...]
+) -> type[BaseModel]:
+    """
+    Copy of `read_model` restricted to `fields`, with the same types and
+    defaults. Models are cached, so each field combination is built once.
+    """
+    return create_model(  # type: ignore[call-overload]
+        f"{read_model.__name__}Fields",
+        **{
+            name: (
+                read_model.model_fields[name].annotation,
+                read_model.model_fields[name],
+            )
+            for name in fields
+        },
+    )
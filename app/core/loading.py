@@ -0,0 +1,19 @@
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.base import ExecutableOption
+
+
+def load_policy(*options: ExecutableOption) -> tuple[ExecutableOption, ...]:
+    """
+    Loader options of a query: the relationships given (`selectinload`,
+    `joinedload`...) are loaded with it, any other one raises when accessed.
+
+    Relationships are lazy on the models, and lazy loading is both an N+1
+    and, on an `AsyncSession`, an error. Each CRUD query states what its
+    read model serialises, so loading anything else fails loudly instead
+    of silently costing a query:
+
+        LOT_READ = load_policy(selectinload(Lot.organisation).raiseload("*"))
+        select(Lot).options(*LOT_READ)
+        await session.get(Lot, lot_id, options=LOT_READ)
+    """
+    return (*options, raiseload("*"))
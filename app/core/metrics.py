@@ -0,0 +1,72 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Any
+
+# Upper bounds, in milliseconds, shared by the latency histograms
+DEFAULT_LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram, safe to update from several threads.
+
+    Each observation is counted in the first bucket whose upper bound is
+    greater than or equal to the value; larger values land in "+Inf".
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{bound:g}" for bound in self.buckets] + ["le_inf"]
+            return {
+                "count": self.count,
+                "sum": round(self.total, 3),
+                "max": round(self.max, 3),
+                "buckets": dict(zip(labels, self._counts)),
+            }
+
+
+class Counter:
+    """Monotonic counter, safe to update from several threads."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self.value = 0
@@ -0,0 +1,267 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+
+from sqlalchemy import Connection, Engine, func, inspect, select, text
+from sqlmodel import Field, SQLModel
+
+from app.core.trigrams import (
+    PERSON_SEARCH_COLUMNS,
+    PERSON_SEARCH_DIGIT_COLUMNS,
+    search_document_sql,
+)
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key of the Postgres advisory lock serialising concurrent upgrades
+_MIGRATION_LOCK_KEY = 0x656E6B61
+
+
+class SchemaVersion(SQLModel, table=True):
+    __tablename__ = "schema_version"
+
+    version: int = Field(primary_key=True)
+    description: str
+    applied_at: datetime = Field(default_factory=datetime.now)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A versioned schema change.
+
+    `upgrade` runs on fresh databases as well as on databases built by older
+    releases (or by the former `create_all` at startup), so it must be
+    idempotent: create with `checkfirst`, `IF NOT EXISTS`, etc.
+    """
+
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _create_all(conn: Connection) -> None:
+    SQLModel.metadata.create_all(conn, checkfirst=True)
+
+
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    """Upgrade creating the indexes of the models with these names."""
+
+    def upgrade(conn: Connection) -> None:
+        indexes = {
+            index.name: index
+            for table in SQLModel.metadata.tables.values()
+            for index in table.indexes
+        }
+        for name in names:
+            indexes[name].create(conn, checkfirst=True)
+
+    return upgrade
+
+
+def _add_lot_inventory_uuid(conn: Connection) -> None:
+    """Link lots to the inventory they were listed in."""
+    lot = SQLModel.metadata.tables["lot"]
+    if "inventory_uuid" not in {c["name"] for c in inspect(conn).get_columns("lot")}:
+        column_type = lot.c.inventory_uuid.type.compile(dialect=conn.dialect)
+        conn.execute(
+            text(
+                f"ALTER TABLE lot ADD COLUMN inventory_uuid {column_type} "
+                "REFERENCES inventory (uuid)"
+            )
+        )
+    _create_indexes("ix_lot_inventory_uuid_id")(conn)
+
+
+_LOT_FTS_COLUMNS = "name, description, category"
+
+_SQLITE_LOT_SEARCH = [
+    # External content table: the text stays in `lot`, only the index is
+    # stored. unicode61 folds case and accents, FTS5 has no French stemmer
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS lot_fts USING fts5(
+        {_LOT_FTS_COLUMNS}, content='lot', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS lot_fts_insert AFTER INSERT ON lot BEGIN
+        INSERT INTO lot_fts(rowid, {_LOT_FTS_COLUMNS})
+        VALUES (new.id, new.name, new.description, new.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS lot_fts_delete AFTER DELETE ON lot BEGIN
+        INSERT INTO lot_fts(lot_fts, rowid, {_LOT_FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.description, old.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS lot_fts_update
+    AFTER UPDATE OF {_LOT_FTS_COLUMNS} ON lot BEGIN
+        INSERT INTO lot_fts(lot_fts, rowid, {_LOT_FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.description, old.category);
+        INSERT INTO lot_fts(rowid, {_LOT_FTS_COLUMNS})
+        VALUES (new.id, new.name, new.description, new.category);
+    END
+    """,
+    # Index the existing lots, and recover from a `lot` table rebuilt under
+    # the index (the triggers go with the table, the index stays)
+    "INSERT INTO lot_fts(lot_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES_LOT_SEARCH = [
+    # Maintained by Postgres on insert and update, name ranked above category
+    # above description
+    """
+    ALTER TABLE lot ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('french', coalesce(category, '')), 'B')
+        || setweight(to_tsvector('french', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_lot_search_vector ON lot USING gin (search_vector)",
+]
+
+
+def _create_lot_search_index(conn: Connection) -> None:
+    """Full-text index over the name, description and category of lots."""
+    statements = {
+        "sqlite": _SQLITE_LOT_SEARCH,
+        "postgresql": _POSTGRES_LOT_SEARCH,
+    }.get(conn.dialect.name, [])
+    for statement in statements:
+        conn.exec_driver_sql(statement)
+
+
+def _create_person_trigram_indexes(conn: Connection) -> None:
+    """
+    Trigram indexes of the fuzzy lookup of clients and sellers. Postgres
+    only, the other databases use the in-process index of `TrigramSearch`.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    document = search_document_sql(PERSON_SEARCH_COLUMNS, PERSON_SEARCH_DIGIT_COLUMNS)
+    for table_name in ("client", "seller"):
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS ix_{table_name}_search_trgm "
+            f"ON {table_name} USING gin (({document}) gin_trgm_ops)"
+        )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Initial schema", _create_all),
+    Migration(
+        2,
+        "Tenant and foreign key indexes",
+        _create_indexes(
+            "ix_lot_orga_uuid_id",
+            "ix_lot_sale_id_id",
+            "ix_lot_seller_id_id",
+            "ix_lot_buyer_id_id",
+            "ix_lot_invoice_id_id",
+            "ix_sale_orga_uuid_id",
+            "ix_client_orga_uuid_id",
+            "ix_seller_orga_uuid_id",
+            "ix_invoice_orga_uuid_id",
+            "ix_invoice_client_id_id",
+            "ix_invoice_sale_id_id",
+            "ix_inventory_orga_uuid_uuid",
+            "ix_inventory_seller_id",
+            "ix_userorganisationlink_orga_uuid",
+        ),
+    ),
+    Migration(
+        3,
+        "Keyset pagination indexes",
+        _create_indexes(
+            "ix_lot_orga_uuid_created_at_id",
+            "ix_sale_orga_uuid_created_at_id",
+            "ix_client_orga_uuid_created_at_id",
+            "ix_seller_orga_uuid_created_at_id",
+            "ix_inventory_orga_uuid_created_at_uuid",
+            "ix_inventory_orga_uuid_inventory_date_uuid",
+        ),
+    ),
+    Migration(4, "Lot inventory link", _add_lot_inventory_uuid),
+    Migration(5, "Lot full-text search index", _create_lot_search_index),
+    Migration(6, "Client and seller trigram indexes", _create_person_trigram_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def _current_version(conn: Connection) -> int:
+    if not inspect(conn).has_table(SchemaVersion.__tablename__):
+        return 0
+    version = conn.execute(select(func.max(SchemaVersion.version))).scalar()
+    return version or 0
+
+
+def get_schema_version(engine: Engine) -> int:
+    with engine.connect() as conn:
+        return _current_version(conn)
+
+
+@contextmanager
+def _migration_transaction(engine: Engine) -> Iterator[Connection]:
+    """
+    Transaction holding a database-wide lock, so that workers booting at the
+    same time apply migrations one after the other.
+    """
+    if engine.dialect.name == "sqlite":
+        # pysqlite does not open transactions before DDL: drive them by hand,
+        # BEGIN IMMEDIATE takes the write lock straight away
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except Exception:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+            conn.exec_driver_sql("COMMIT")
+        return
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": _MIGRATION_LOCK_KEY}
+            )
+        yield conn
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Bring the schema up to `LATEST_VERSION` and return the resulting version.
+
+    An up-to-date database costs a single version check. Otherwise pending
+    migrations are applied in one locked transaction; the version is read
+    again once the lock is held since another worker may have just upgraded.
+    """
+    if get_schema_version(engine) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    with _migration_transaction(engine) as conn:
+        SchemaVersion.__table__.create(conn, checkfirst=True)  # type: ignore[attr-defined]
+        current = _current_version(conn)
+        for migration in MIGRATIONS:
+            if migration.version <= current:
+                continue
+            logger.info(
+                "Applying migration %s: %s", migration.version, migration.description
+            )
+            migration.upgrade(conn)
+            conn.execute(
+                SchemaVersion.__table__.insert().values(  # type: ignore[attr-defined]
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.now(),
+                )
+            )
+            current = migration.version
+    return current
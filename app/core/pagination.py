@@ -0,0 +1,190 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Sequence
+import json
+from typing import Any, Generic, TypeVar
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.exceptions import PaginationError
+from app.core.responses import type_adapter
+
+T = TypeVar("T")
+S = TypeVar("S")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a list, `next_cursor` is None on the last page."""
+
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class KeysetPagination:
+    """
+    Keyset pagination over a table ordered by (sort field, id).
+
+    Instead of skipping `offset` rows, each page starts right after the last
+    row of the previous one, as a `WHERE (sort, id) > (last sort, last id)`
+    condition. With an index on (tenant, sort field, id) every page costs the
+    same as the first one. The position is handed to clients as an opaque
+    cursor, which also records the sort so that it cannot be reused with
+    another one.
+    """
+
+    def __init__(
+        self,
+        id_column: InstrumentedAttribute,
+        sort_fields: dict[str, InstrumentedAttribute],
+    ):
+        self.id_column = id_column
+        self.sort_fields = sort_fields
+
+    def _sort_column(self, sort_by: str) -> InstrumentedAttribute:
+        try:
+            return self.sort_fields[sort_by]
+        except KeyError:
+            raise PaginationError(
+                f"Cannot sort by {sort_by!r}, expected one of: "
+                + ", ".join(self.sort_fields)
+            )
+
+    def encode_cursor(self, sort_by: str, descending: bool, row: Any) -> str:
+        position = [
+            sort_by,
+            descending,
+            getattr(row, self._sort_column(sort_by).key),
+            getattr(row, self.id_column.key),
+        ]
+        raw = json.dumps(position, default=str, separators=(",", ":")).encode()
+        return urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(
+        self, cursor: str, sort_by: str, descending: bool
+    ) -> tuple[Any, Any]:
+        try:
+            raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            cursor_sort_by, cursor_descending, value, id_ = json.loads(raw)
+        except (ValueError, TypeError):
+            raise PaginationError("Malformed cursor")
+        if (cursor_sort_by, cursor_descending) != (sort_by, descending):
+            raise PaginationError("Cursor was issued for another sort order")
+        sort_column = self._sort_column(sort_by)
+        try:
+            return (
+                TypeAdapter(sort_column.type.python_type).validate_python(value),
+                TypeAdapter(self.id_column.type.python_type).validate_python(id_),
+            )
+        except ValidationError:
+            raise PaginationError("Malformed cursor")
+
+    def apply(
+        self,
+        statement: S,
+        sort_by: str,
+        descending: bool,
+        cursor: str | None,
+        limit: int,
+    ) -> S:
+        """
+        Order `statement`, start it after `cursor` and fetch one extra row,
+        telling `page` whether there is a next page.
+        """
+        sort_column = self._sort_column(sort_by)
+        if sort_column is self.id_column:
+            keys: tuple[InstrumentedAttribute, ...] = (self.id_column,)
+        else:
+            keys = (sort_column, self.id_column)
+
+        if cursor is not None:
+            value, id_ = self.decode_cursor(cursor, sort_by, descending)
+            if len(keys) == 1:
+                left, right = self.id_column, id_
+            else:
+                # Row value comparison, served by the (..., sort, id) index
+                left = tuple_(*keys)
+                right = tuple_(
+                    *(literal(v, k.type) for k, v in zip(keys, (value, id_)))
+                )
+            statement = statement.where(  # type: ignore[attr-defined]
+                left < right if descending else left > right
+            )
+        order_by = [key.desc() if descending else key.asc() for key in keys]
+        return statement.order_by(*order_by).limit(  # type: ignore[attr-defined]
+            limit + 1
+        )
+
+    def page(
+        self,
+        rows: Sequence[Any],
+        sort_by: str,
+        descending: bool,
+        limit: int,
+        item_type: type[T],
+        page_model: type[Page] = Page,
+    ) -> Page[T]:
+        """
+        Build the page, an instance of `page_model`, from the rows fetched by
+        a statement from `apply`. Rows (ORM objects or `Row`) are validated
+        as `item_type` in a single `TypeAdapter` call.
+        """
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(sort_by, descending, rows[-1])
+        items = type_adapter(list[item_type]).validate_python(  # type: ignore[valid-type]
+            rows, from_attributes=True
+        )
+        return page_model(items=items, next_cursor=next_cursor)
+
+
+class OffsetPagination:
+    """
+    Pagination of results ordered by a computed score, such as a search
+    rank, which cannot start after a key: the opaque cursor holds the number
+    of rows already returned. Meant for lists read from the top (relevance),
+    since deep pages cost the rows they skip.
+    """
+
+    def __init__(self, max_offset: int = 10_000):
+        self.max_offset = max_offset
+
+    def decode_cursor(self, cursor: str | None) -> int:
+        if cursor is None:
+            return 0
+        try:
+            offset = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except ValueError:
+            raise PaginationError("Malformed cursor")
+        if not isinstance(offset, int) or not 0 <= offset <= self.max_offset:
+            raise PaginationError("Malformed cursor")
+        return offset
+
+    def encode_cursor(self, offset: int) -> str | None:
+        if offset > self.max_offset:
+            return None
+        return urlsafe_b64encode(str(offset).encode()).decode().rstrip("=")
+
+    def apply(self, statement: S, cursor: str | None, limit: int) -> S:
+        """Skip the rows of the previous pages and fetch one extra row."""
+        return statement.offset(  # type: ignore[attr-defined]
+            self.decode_cursor(cursor)
+        ).limit(limit + 1)
+
+    def page(
+        self,
+        rows: Sequence[Any],
+        cursor: str | None,
+        limit: int,
+        item_type: type[T],
+        page_model: type[Page] = Page,
+    ) -> Page[T]:
+        """Build the page from the rows fetched by a statement from `apply`."""
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(self.decode_cursor(cursor) + limit)
+        items = type_adapter(list[item_type]).validate_python(  # type: ignore[valid-type]
+            rows, from_attributes=True
+        )
+        return page_model(items=items, next_cursor=next_cursor)
@@ -0,0 +1,78 @@
+from time import perf_counter
+from typing import Any
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+from app.core.metrics import Counter, Histogram
+
+
+class PoolMetrics:
+    """Checkout statistics collected by an instrumented pool."""
+
+    def __init__(self) -> None:
+        self.wait_time_ms = Histogram()
+        self.timeouts = Counter()
+
+
+class _InstrumentedPoolMixin:
+    """
+    Times every checkout, from the moment a connection is requested until it
+    is handed over (including the time spent waiting for a free slot and the
+    pre-ping), and counts checkouts that hit `pool_timeout`.
+    """
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.metrics.timeouts.inc()
+            raise
+        finally:
+            self.metrics.wait_time_ms.observe((perf_counter() - start) * 1000)
+
+    def recreate(self):
+        # engine.dispose() swaps the pool: keep the history across it
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_pool_stats(engine: Engine) -> dict[str, Any]:
+    """
+    Current occupation of the engine's pool, plus the checkout histogram when
+    the pool is instrumented.
+    """
+    pool = engine.pool
+    stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if isinstance(metrics, PoolMetrics):
+        stats.update(
+            timeouts=metrics.timeouts.value,
+            wait_time_ms=metrics.wait_time_ms.snapshot(),
+        )
+    return stats
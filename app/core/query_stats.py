@@ -0,0 +1,168 @@
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import logging
+import re
+from time import perf_counter
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.slow_queries import register_explain_engine, report_slow_query
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    route: str | None = None
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        # Statements are parameterised, so the text is already the "shape":
+        # the same query run for each parent row shows up with the same text
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def repeated_shapes(
+        self, threshold: int = settings.N_PLUS_ONE_THRESHOLD
+    ) -> dict[str, int]:
+        """Statements run at least `threshold` times: likely N+1 patterns."""
+        return {
+            shape: count
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        }
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(route: str | None = None) -> Iterator[QueryStats]:
+    """
+    Collect the statements executed in the current context (request, task...)
+    into a fresh `QueryStats`. Tasks and threads started from it inherit the
+    context, so the queries they run are counted too.
+    """
+    stats = QueryStats(route=route)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault("query_start_time", []).append(perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed_ms = (perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    report_slow_query(
+        conn.engine,
+        statement,
+        parameters,
+        elapsed_ms,
+        executemany,
+        stats.route if stats is not None else None,
+    )
+
+
+def _handle_error(exception_context: Any) -> None:
+    # after_cursor_execute is skipped for failing statements
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def instrument_engine(engine: Engine, explain_engine: Engine | None = None) -> None:
+    """
+    Count and time every statement sent through `engine`. Slow statements
+    are logged, with their plan when `explain_engine` is given.
+    """
+    if explain_engine is not None:
+        register_explain_engine(engine, explain_engine)
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware counting the statements of each HTTP request, sent back
+    in the `X-DB-Query-Count` and `X-DB-Time-Ms` headers and logged, with the
+    statements repeated enough to be N+1 patterns.
+
+    The headers go out with the start of the response: the statements run
+    while a streamed body (`StreamingResponse`) is produced come later and
+    are not counted in them, only in the log written once the body is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.total_ms:.2f}"
+            await send(message)
+
+        route = f"{scope['method']} {scope['path']}"
+        with track_queries(route=route) as stats:
+            await self.app(scope, receive, send_with_stats)
+
+        repeated = stats.repeated_shapes()
+        log_fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "db_query_count": stats.count,
+            "db_time_ms": round(stats.total_ms, 2),
+            "db_repeated_statements": repeated,
+        }
+        if repeated:
+            logger.warning("Possible N+1 queries", extra=log_fields)
+        else:
+            logger.info("Request database usage", extra=log_fields)
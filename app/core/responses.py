@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    """`TypeAdapter` of `type_`, its validator and serializer built once."""
+    return TypeAdapter(type_)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    Default response class of the API.
+
+    Content that FastAPI already serialised (dicts, lists...) is encoded
+    with orjson. Read models built by the CRUD layer can be returned as is,
+    `FastJSONResponse(lot)`: they are dumped straight to JSON bytes by
+    pydantic-core, skipping the `response_model` round trip (`model_dump`,
+    validation again, serialisation) FastAPI applies to returned models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return type_adapter(type(content)).dump_json(content)
+        if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+            return type_adapter(list[type(content[0])]).dump_json(content)  # type: ignore[index]
+        return super().render(content)
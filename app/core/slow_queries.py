@@ -0,0 +1,147 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+import logging
+import threading
+from typing import Any
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A single worker: plans are captured one at a time, off the request path
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain")
+# Plans queued or being captured, bounded by SLOW_QUERY_EXPLAIN_MAX_PENDING
+_pending_explains = 0
+_pending_lock = threading.Lock()
+# Engine the statement ran on -> sync engine able to explain it on the side
+_explain_engines: dict[Engine, Engine] = {}
+# Set while capturing a plan, so that the EXPLAIN itself is never reported
+_explaining: ContextVar[bool] = ContextVar("explaining", default=False)
+
+_EXPLAINABLE = ("SELECT", "WITH")
+
+
+def register_explain_engine(engine: Engine, explain_engine: Engine) -> None:
+    """
+    Plans of slow statements run on `engine` are captured through
+    `explain_engine`. Async engines run their statements in a greenlet, so
+    they are explained through a sync engine pointing at the same database.
+    """
+    _explain_engines[engine] = explain_engine
+
+
+def explain_statement(
+    engine: Engine, statement: str, parameters: Any, analyze: bool = False
+) -> list[str]:
+    """
+    Plan of `statement`, one entry per line, captured on a new connection of
+    `engine`. With `analyze` the statement is really executed (PostgreSQL
+    only) inside a transaction which is then rolled back.
+    """
+    match engine.dialect.name:
+        case "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        case "postgresql" if analyze:
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+        case _:
+            prefix = "EXPLAIN "
+    if isinstance(parameters, list):
+        parameters = tuple(parameters)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters or ()).all()
+        conn.rollback()
+    # SQLite returns (id, parent, notused, detail), PostgreSQL a single column
+    return [str(row[-1]) for row in rows]
+
+
+def _log_slow_query(
+    fields: dict[str, Any], plan: list[str] | None = None, error: str | None = None
+) -> None:
+    logger.warning(
+        "Slow query (%.1f ms) from %s: %s\n%s",
+        fields["duration_ms"],
+        fields["route"] or "outside a request",
+        fields["statement"],
+        "\n".join(plan or []),
+        extra={**fields, "plan": plan, "explain_error": error},
+    )
+
+
+def _reserve_explain() -> bool:
+    """Count one more pending plan, unless the backlog is full."""
+    global _pending_explains
+    with _pending_lock:
+        if _pending_explains >= settings.SLOW_QUERY_EXPLAIN_MAX_PENDING:
+            return False
+        _pending_explains += 1
+        return True
+
+
+def _release_explain() -> None:
+    global _pending_explains
+    with _pending_lock:
+        _pending_explains -= 1
+
+
+def _explain_and_log(explain_engine: Engine, fields: dict[str, Any]) -> None:
+    token = _explaining.set(True)
+    try:
+        plan = explain_statement(
+            explain_engine,
+            fields["statement"],
+            fields["parameters"],
+            analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE
+            and fields["statement"].lstrip().upper().startswith("SELECT"),
+        )
+    except Exception as e:
+        _log_slow_query(fields, error=repr(e))
+    else:
+        _log_slow_query(fields, plan=plan)
+    finally:
+        _explaining.reset(token)
+        _release_explain()
+
+
+def report_slow_query(
+    engine: Engine,
+    statement: str,
+    parameters: Any,
+    duration_ms: float,
+    executemany: bool,
+    route: str | None,
+) -> Future | None:
+    """
+    Log `statement` when it took longer than `SLOW_QUERY_THRESHOLD_MS`.
+    Reads are logged with their plan, captured in the background; the
+    returned future completes once the entry is logged. When the database is
+    slow enough for `SLOW_QUERY_EXPLAIN_MAX_PENDING` plans to be waiting,
+    statements are logged without one rather than adding to its load.
+    """
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None or duration_ms < threshold or _explaining.get():
+        return None
+
+    fields = {
+        "statement": statement,
+        "parameters": parameters,
+        "duration_ms": round(duration_ms, 2),
+        "route": route,
+    }
+    explain_engine = _explain_engines.get(engine)
+    if (
+        settings.SLOW_QUERY_EXPLAIN
+        and explain_engine is not None
+        and not executemany
+        and statement.lstrip().upper().startswith(_EXPLAINABLE)
+    ):
+        if not _reserve_explain():
+            _log_slow_query(fields, error="Not explained: too many plans pending")
+            return None
+        try:
+            return _explain_executor.submit(_explain_and_log, explain_engine, fields)
+        except RuntimeError:
+            # The executor is shut down, at interpreter exit
+            _release_explain()
+    _log_slow_query(fields)
+    return None
@@ -0,0 +1,374 @@
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import heapq
+from itertools import chain
+from math import ceil
+import re
+import threading
+from time import monotonic
+from typing import Any
+from uuid import UUID
+from sqlalchemy import Select, event, func, literal, literal_column, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session as ORMSession
+from sqlmodel import SQLModel
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Columns of clients and sellers matched by the fuzzy lookup, phone numbers
+# by their digits only
+PERSON_SEARCH_COLUMNS = ("first_name", "last_name", "company", "email")
+PERSON_SEARCH_DIGIT_COLUMNS = ("phone",)
+
+# pg_trgm's default `word_similarity_threshold`
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+# Larger than any key of a `TrigramIndex`
+_KEY_SPAN = 1 << 63
+
+_WORD = re.compile(r"[^\W_]+")
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Trigrams of `text` as pg_trgm extracts them: lowercased words of letters
+    and digits, padded with two spaces before and one after.
+    """
+    return {
+        padded[i : i + 3]
+        for padded in [f"  {word} " for word in _WORD.findall(text.lower())]
+        for i in range(len(padded) - 2)
+    }
+
+
+def search_document_sql(
+    columns: tuple[str, ...], digit_columns: tuple[str, ...] = ()
+) -> str:
+    """
+    SQL expression of the text matched for a row. Postgres only uses an
+    expression index when the query repeats its expression: the migration
+    creating the index and the queries both build it here.
+    """
+    parts = [f"coalesce({name}, '')" for name in columns] + [
+        f"regexp_replace(coalesce({name}, ''), '[^0-9]', '', 'g')"
+        for name in digit_columns
+    ]
+    return "lower(" + " || ' ' || ".join(parts) + ")"
+
+
+def search_document(
+    values: Iterable[str | None], digit_values: Iterable[str | None] = ()
+) -> str:
+    """Python version of `search_document_sql`, from the column values."""
+    parts = [value or "" for value in values] + [
+        _NON_DIGIT.sub("", value or "") for value in digit_values
+    ]
+    return " ".join(parts).lower()
+
+
+class TrigramIndex:
+    """
+    In-process trigram index of short documents, ranked like pg_trgm's
+    `word_similarity`: the share of the trigrams of the query found in the
+    document, so that a partial name or email matches. Ties go to the lowest
+    key, as in `TrigramSearch.statement`.
+
+    Posting lists are plain lists of keys and documents only keep their
+    text: about 0.5 kB per document. Lookups stay in C set operations:
+
+    - when enough documents hold every trigram of the query, they are the
+      answer (an intersection of the posting lists);
+    - otherwise a document sharing `required` of the `n` trigrams holds one
+      of the `n - required + 1` rarest, whose union gives the candidates
+      counted against each posting list.
+    """
+
+    def __init__(self, threshold: float = WORD_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._postings: dict[str, list[int]] = {}
+        self._documents: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, key: int, text: str) -> None:
+        """Index `text` as the document `key`, replacing its previous text."""
+        with self._lock:
+            self._remove(key)
+            self._documents[key] = text
+            for gram in trigrams(text):
+                self._postings.setdefault(gram, []).append(key)
+
+    def remove(self, key: int) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: int) -> None:
+        text = self._documents.pop(key, None)
+        if text is None:
+            return
+        for gram in trigrams(text):
+            posting = self._postings[gram]
+            posting.remove(key)
+            if not posting:
+                del self._postings[gram]
+
+    def search(self, query: str, limit: int) -> list[tuple[int, float]]:
+        """The `limit` best documents for `query` and their score, best first."""
+        wanted = trigrams(query)
+        if not wanted:
+            return []
+        required = max(1, ceil(self.threshold * len(wanted)))
+        with self._lock:
+            postings = sorted(
+                (self._postings.get(gram, []) for gram in wanted), key=len
+            )
+            complete = set(postings[0]).intersection(*postings[1:])
+            if len(complete) >= limit:
+                return [(key, 1.0) for key in heapq.nsmallest(limit, complete)]
+            candidates = set().union(*postings[: len(wanted) - required + 1])
+            counts: Counter[int] = Counter()
+            for posting in postings:
+                counts.update(candidates.intersection(posting))
+        # Sort key packed in an int, so that nsmallest compares in C
+        best = heapq.nsmallest(
+            limit,
+            (
+                (len(wanted) - count) * _KEY_SPAN + key
+                for key, count in counts.items()
+                if count >= required
+            ),
+        )
+        return [
+            (packed % _KEY_SPAN, (len(wanted) - packed // _KEY_SPAN) / len(wanted))
+            for packed in best
+        ]
+
+
+@dataclass
+class _IndexChange:
+    orga_uuid: UUID
+    # None when the row could not be read: the index must be rebuilt
+    key: int | None
+    # None when the row was deleted
+    text: str | None
+
+
+@dataclass
+class _BuiltIndex:
+    index: TrigramIndex
+    # monotonic() time of the snapshot the index was built from
+    built_at: float
+
+
+@dataclass
+class _Build:
+    future: Future[TrigramIndex] = field(default_factory=Future)
+    # Changes committed while the rows were read, replayed on the new index
+    changes: list[_IndexChange] = field(default_factory=list)
+
+
+class TrigramSearch:
+    """
+    Fuzzy lookup of the rows of a tenant-scoped table on a few text columns.
+
+    On Postgres, the `pg_trgm` expression index of `search_document_sql`
+    ranks rows by `word_similarity`. Elsewhere (SQLite, local runs) a
+    `TrigramIndex` per organisation is built on first use, kept up to date
+    with the ORM changes committed by this worker and rebuilt once older
+    than `FUZZY_INDEX_CACHE_SECONDS` to pick up the changes of the other
+    workers.
+
+    An organisation's index is only built once at a time: concurrent first
+    lookups wait for the same build, and refreshes run in the background
+    while the previous index keeps serving lookups.
+    """
+
+    def __init__(
+        self,
+        model: type[SQLModel],
+        columns: tuple[str, ...],
+        digit_columns: tuple[str, ...] = (),
+    ):
+        self.model = model
+        self.columns = columns
+        self.digit_columns = digit_columns
+        self.document = literal_column(search_document_sql(columns, digit_columns))
+        table_name = model.__tablename__  # type: ignore[attr-defined]
+        self._changes_key = f"trigram_changes_{table_name}"
+        # Entries are set without expiry: `ttl` is the age after which an
+        # index is refreshed, a stale index serves lookups in the meantime
+        self._indexes: TTLCache[UUID, _BuiltIndex] = TTLCache(
+            f"{table_name}_trigram_index",
+            maxsize=settings.FUZZY_INDEX_CACHE_SIZE,
+            ttl=settings.FUZZY_INDEX_CACHE_SECONDS,
+        )
+        self._builds: dict[UUID, _Build] = {}
+        self._builds_lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{table_name}-trigram-index"
+        )
+        event.listen(ORMSession, "after_flush", self._collect_changes)
+        event.listen(ORMSession, "after_commit", self._apply_changes)
+        event.listen(ORMSession, "after_rollback", self._forget_changes)
+
+    def _document_of(self, values: Any) -> str:
+        return search_document(
+            (values[name] for name in self.columns),
+            (values[name] for name in self.digit_columns),
+        )
+
+    def statement(self, orga_uuid: UUID, query: str, limit: int) -> Select:
+        """Postgres query of the best rows and their `score`, best first."""
+        query = query.lower()
+        score = func.word_similarity(query, self.document).label("score")
+        return (
+            select(self.model, score)
+            .where(
+                self.model.orga_uuid == orga_uuid,  # type: ignore[attr-defined]
+                literal(query).op("<%")(self.document),
+            )
+            .order_by(score.desc(), self.model.id)  # type: ignore[attr-defined]
+            .limit(limit)
+        )
+
+    def index(self, session: ORMSession, orga_uuid: UUID) -> TrigramIndex:
+        """
+        The in-process index of the rows of `orga_uuid`. The first lookup
+        builds it, or waits for the build already running; a stale index is
+        returned as is while it is rebuilt in the background.
+        """
+        built = self._indexes.get(orga_uuid)
+        if built is None:
+            return self._build(session.get_bind(), orga_uuid).result()
+        if monotonic() - built.built_at > self._indexes.ttl:
+            self._build(session.get_bind(), orga_uuid, background=True)
+        return built.index
+
+    def _build(
+        self,
+        bind: Engine | Connection,
+        orga_uuid: UUID,
+        background: bool = False,
+    ) -> Future[TrigramIndex]:
+        """The build of the index of `orga_uuid`, started unless running."""
+        with self._builds_lock:
+            build = self._builds.get(orga_uuid)
+            if build is not None:
+                return build.future
+            build = self._builds[orga_uuid] = _Build()
+        if background:
+            self._refresher.submit(self._run_build, bind, orga_uuid, build)
+        else:
+            self._run_build(bind, orga_uuid, build)
+        return build.future
+
+    def _run_build(
+        self, bind: Engine | Connection, orga_uuid: UUID, build: _Build
+    ) -> None:
+        try:
+            built_at = monotonic()
+            index = TrigramIndex()
+            columns = [
+                getattr(self.model, name)
+                for name in ("id", *self.columns, *self.digit_columns)
+            ]
+            # A session of its own: a background build outlives the request
+            with ORMSession(bind) as session:
+                rows = session.execute(
+                    select(*columns).where(
+                        self.model.orga_uuid == orga_uuid  # type: ignore[attr-defined]
+                    )
+                ).mappings()
+                for row in rows:
+                    index.add(row["id"], self._document_of(row))
+        except BaseException as e:
+            with self._builds_lock:
+                del self._builds[orga_uuid]
+            build.future.set_exception(e)
+            return
+        with self._builds_lock:
+            # Changes committed during the build may be missing from the rows
+            # read: adding or removing a row again is harmless
+            for change in build.changes:
+                if change.key is None:
+                    built_at = float("-inf")
+                elif change.text is None:
+                    index.remove(change.key)
+                else:
+                    index.add(change.key, change.text)
+            self._indexes.set(orga_uuid, _BuiltIndex(index, built_at), ttl=float("inf"))
+            del self._builds[orga_uuid]
+        build.future.set_result(index)
+
+    def search(
+        self, session: ORMSession, orga_uuid: UUID, query: str, limit: int
+    ) -> list[tuple[Any, float]]:
+        """
+        The `limit` rows of `orga_uuid` matching `query` best, with their
+        score between 0 and 1, best first.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            return [
+                (row, score)
+                for row, score in session.execute(
+                    self.statement(orga_uuid, query, limit)
+                )
+            ]
+        ranked = self.index(session, orga_uuid).search(query, limit)
+        if not ranked:
+            return []
+        rows = session.scalars(
+            select(self.model).where(
+                self.model.id.in_([key for key, _ in ranked]),  # type: ignore[attr-defined]
+                self.model.orga_uuid == orga_uuid,  # type: ignore[attr-defined]
+            )
+        )
+        rows_by_id = {row.id: row for row in rows}
+        # A row deleted, or moved to another organisation, by another worker
+        # may still be in the index: it is missed, never disclosed
+        return [(rows_by_id[key], score) for key, score in ranked if key in rows_by_id]
+
+    def _collect_changes(self, session: ORMSession, flush_context: Any) -> None:
+        names = (*self.columns, *self.digit_columns)
+        for obj in chain(session.new, session.dirty, session.deleted):
+            if not isinstance(obj, self.model):
+                continue
+            # Loaded values only: reading an expired attribute would query
+            values = obj.__dict__
+            if "orga_uuid" not in values:
+                continue
+            if obj in session.deleted:
+                change = _IndexChange(values["orga_uuid"], values.get("id"), None)
+            elif "id" in values and all(name in values for name in names):
+                change = _IndexChange(
+                    values["orga_uuid"], values["id"], self._document_of(values)
+                )
+            else:
+                change = _IndexChange(values["orga_uuid"], None, None)
+            session.info.setdefault(self._changes_key, []).append(change)
+
+    def _apply_changes(self, session: ORMSession) -> None:
+        for change in session.info.pop(self._changes_key, ()):
+            with self._builds_lock:
+                build = self._builds.get(change.orga_uuid)
+                if build is not None:
+                    build.changes.append(change)
+            built = self._indexes.peek(change.orga_uuid)
+            if built is None:
+                continue
+            if change.key is None:
+                # Refreshed on the next lookup
+                built.built_at = float("-inf")
+            elif change.text is None:
+                built.index.remove(change.key)
+            else:
+                built.index.add(change.key, change.text)
+
+    def _forget_changes(self, session: ORMSession) -> None:
+        session.info.pop(self._changes_key, None)
@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from sqlmodel import select
+from app.core.database import get_async_db_session
+from app.organisations.models_organisations import Organisation
+
+
+def test_async_session_commits_on_success():
+    name = f"Committed {uuid4()}"
+
+    async def scenario():
+        async with get_async_db_session() as session:
+            session.add(Organisation(name=name))
+
+        async with get_async_db_session() as session:
+            statement = select(Organisation).where(Organisation.name == name)
+            return (await session.exec(statement)).all()
+
+    assert len(asyncio.run(scenario())) == 1
+
+
+def test_async_session_rolls_back_on_error():
+    name = f"Rolled back {uuid4()}"
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with get_async_db_session() as session:
+                session.add(Organisation(name=name))
+                await session.flush()
+                raise RuntimeError("boom")
+
+        async with get_async_db_session() as session:
+            statement = select(Organisation).where(Organisation.name == name)
+            return (await session.exec(statement)).all()
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_async_sessions_overlap_on_the_event_loop():
+    events: list[str] = []
+
+    async def query(name: str):
+        events.append("start")
+        async with get_async_db_session() as session:
+            statement = select(Organisation).where(Organisation.name == name)
+            (await session.exec(statement)).all()
+        events.append("end")
+
+    async def ticker():
+        for _ in range(50):
+            events.append("tick")
+            await asyncio.sleep(0)
+
+    async def scenario():
+        await asyncio.gather(*(query(f"orga {i}") for i in range(5)), ticker())
+
+    asyncio.run(scenario())
+    last_end = len(events) - 1 - events[::-1].index("end")
+    # The loop keeps serving other tasks while queries wait on the database
+    assert events.index("tick") < last_end
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import InvalidRequestError
+from app.auth.CRUD import verify_organization_access
+from app.clients.models import Client
+from app.core.database import get_async_db_session, get_db_session
+from app.core.query_stats import track_queries
+from app.lots.CRUD import LOT_READ_LOADING
+from app.lots.models import Lot
+from app.main import app
+from app.organisations.models_organisations import Organisation
+from app.sales.models import Sale
+from app.sellers.CRUD import get_sellers_by_organisation
+from app.sellers.models import Seller
+
+
+@pytest.fixture(scope="module")
+def catalogue():
+    """Lots linked to every relationship they have, none of them serialised."""
+    with get_db_session() as session:
+        org = Organisation(name="Loading policy")
+        session.add(org)
+        session.flush()
+        seller = Seller(orga_uuid=org.uuid)
+        buyer = Client(orga_uuid=org.uuid)
+        sale = Sale(orga_uuid=org.uuid)
+        session.add_all([seller, buyer, sale])
+        session.flush()
+        lots = [
+            Lot(
+                name=f"Lot {i}",
+                orga_uuid=org.uuid,
+                seller_id=seller.id,
+                buyer_id=buyer.id,
+                sale_id=sale.id,
+            )
+            for i in range(3)
+        ]
+        session.add_all(lots)
+        session.commit()
+        return org.uuid, lots[0].id
+
+
+def test_lot_list_only_loads_what_it_serialises(catalogue):
+    orga_uuid, _ = catalogue
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        response = TestClient(app).get(f"/api/v1/lots/organization/{orga_uuid}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    # The lots, then the organisation, sale and seller they reference: no
+    # buyer or invoice
+    assert response.headers["X-DB-Query-Count"] == "4"
+
+
+def test_seller_list_does_not_load_lots(catalogue):
+    orga_uuid, _ = catalogue
+    with track_queries() as stats:
+        page = get_sellers_by_organisation(orga_uuid)
+
+    assert len(page.items) == 1
+    assert stats.count == 1
+
+
+def test_relationships_outside_the_policy_raise(catalogue):
+    _, lot_id = catalogue
+
+    async def scenario():
+        async with get_async_db_session() as session:
+            lot = await session.get(Lot, lot_id, options=LOT_READ_LOADING)
+            assert lot.organisation.name == "Loading policy"
+            with pytest.raises(InvalidRequestError):
+                lot.seller
+
+    asyncio.run(scenario())
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, func, inspect
+from sqlmodel import Session, SQLModel, select
+
+from app.core.migrations import (
+    LATEST_VERSION,
+    SchemaVersion,
+    get_schema_version,
+    run_migrations,
+)
+from app.lots.models import Lot
+from app.organisations.models_organisations import Organisation
+
+
+def test_fresh_database_is_brought_to_latest_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert get_schema_version(engine) == 0
+
+    assert run_migrations(engine) == LATEST_VERSION
+    assert get_schema_version(engine) == LATEST_VERSION
+    # Second boot: nothing left to do
+    assert run_migrations(engine) == LATEST_VERSION
+
+
+def test_existing_data_survives_startup(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    # Schema built by the former drop_all/create_all startup, no version table
+    SQLModel.metadata.create_all(engine)
+    SchemaVersion.__table__.drop(engine)  # type: ignore[attr-defined]
+    with Session(engine) as session:
+        session.add(Organisation(name="Maison de ventes"))
+        session.commit()
+
+    run_migrations(engine)
+    run_migrations(engine)
+
+    with Session(engine) as session:
+        names = session.exec(select(Organisation.name)).all()
+    assert names == ["Maison de ventes"]
+
+
+def test_concurrent_workers_do_not_race(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        versions = list(executor.map(lambda _: run_migrations(engine), range(4)))
+
+    assert versions == [LATEST_VERSION] * 4
+    with engine.connect() as conn:
+        applied = conn.execute(select(func.count()).select_from(SchemaVersion)).scalar()
+    # Each migration was recorded exactly once
+    assert applied == LATEST_VERSION
+
+
+def test_version_1_database_gets_tenant_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'v1.db'}")
+    run_migrations(engine)
+    # Roll back to the state left by version 1, before the indexes existed
+    with engine.begin() as conn:
+        for index in Lot.__table__.indexes:  # type: ignore[attr-defined]
+            index.drop(conn)
+        conn.execute(SchemaVersion.__table__.delete().where(SchemaVersion.version > 1))  # type: ignore[attr-defined]
+
+    run_migrations(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("lot")}
+    assert {"ix_lot_orga_uuid_id", "ix_lot_sale_id_id"} <= indexes
+
+
+def test_legacy_lot_table_gets_inventory_link(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy_lot.db'}")
+    run_migrations(engine)
+    # Lot table of version 1, before lots could belong to an inventory (SQLite
+    # cannot drop a foreign key column: rebuild the table without it)
+    columns = ", ".join(
+        column.name
+        for column in Lot.__table__.columns  # type: ignore[attr-defined]
+        if column.name != "inventory_uuid"
+    )
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"CREATE TABLE lot_v1 AS SELECT {columns} FROM lot")
+        conn.exec_driver_sql("DROP TABLE lot")
+        conn.exec_driver_sql("ALTER TABLE lot_v1 RENAME TO lot")
+        conn.execute(SchemaVersion.__table__.delete().where(SchemaVersion.version > 1))  # type: ignore[attr-defined]
+
+    assert run_migrations(engine) == LATEST_VERSION
+
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns("lot")}
+    indexes = {index["name"] for index in inspector.get_indexes("lot")}
+    referred = {fk["referred_table"] for fk in inspector.get_foreign_keys("lot")}
+    assert "inventory_uuid" in columns
+    assert "ix_lot_inventory_uuid_id" in indexes
+    assert "inventory" in referred
@@ -0,0 +1,67 @@
+import asyncio
+import pytest
+from app.core.exceptions import PaginationError
+from app.lots.CRUD import create_lots_batch, get_lots_of_organisation
+from app.lots.models import LotCreate
+from app.organisations.CRUD import create_organisation
+from app.organisations.models_organisations import OrganisationCreate
+
+
+def _walk(orga_uuid, **kwargs):
+    async def scenario():
+        pages, cursor = [], None
+        while True:
+            page = await get_lots_of_organisation(
+                orga_uuid, cursor=cursor, limit=10, **kwargs
+            )
+            pages.append([lot.id for lot in page.items])
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    return asyncio.run(scenario())
+
+
+@pytest.fixture(scope="module")
+def lots():
+    async def scenario():
+        org = await create_organisation(OrganisationCreate(name="Pagination"))
+        lots = await create_lots_batch(
+            [LotCreate(name=f"Lot {i}", orga_uuid=org.uuid) for i in range(25)]
+        )
+        return org, lots
+
+    return asyncio.run(scenario())
+
+
+def test_pages_follow_each_other(lots):
+    org, created = lots
+    pages = _walk(org.uuid)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == [lot.id for lot in created]
+
+
+def test_descending_sort_on_another_field(lots):
+    org, created = lots
+    pages = _walk(org.uuid, sort_by="created_at", descending=True)
+
+    expected = sorted(created, key=lambda lot: (lot.created_at, lot.id), reverse=True)
+    assert sum(pages, []) == [lot.id for lot in expected]
+
+
+def test_invalid_pagination_parameters(lots):
+    org, _ = lots
+
+    async def scenario():
+        page = await get_lots_of_organisation(org.uuid, limit=10)
+        with pytest.raises(PaginationError):
+            await get_lots_of_organisation(
+                org.uuid, cursor=page.next_cursor, sort_by="created_at"
+            )
+        with pytest.raises(PaginationError):
+            await get_lots_of_organisation(org.uuid, cursor="not-a-cursor")
+        with pytest.raises(PaginationError):
+            await get_lots_of_organisation(org.uuid, sort_by="hammer_price")
+
+    asyncio.run(scenario())
@@ -0,0 +1,59 @@
+import asyncio
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.passwords import PasswordHasher
+
+# Cheapest bcrypt cost, the tests only need real hashes
+FAST_CONTEXT = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+def test_hash_and_verify():
+    hasher = PasswordHasher(FAST_CONTEXT, max_workers=1)
+
+    async def roundtrip():
+        hashed = await hasher.hash("secret")
+        return await hasher.verify("secret", hashed), await hasher.verify(
+            "wrong", hashed
+        )
+
+    assert asyncio.run(roundtrip()) == (True, False)
+    assert hasher.stats()["run_time_ms"]["count"] == 3
+
+
+def test_event_loop_keeps_running_while_hashing():
+    hasher = PasswordHasher(settings.pwd_context, max_workers=1)
+    ticks = []
+
+    async def ticker(done: asyncio.Event):
+        while not done.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0.005)
+
+    async def main():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        await hasher.hash("secret")
+        done.set()
+        await task
+
+    asyncio.run(main())
+    # A bcrypt hash at the default cost takes well over 50 ms
+    assert len(ticks) > 5
+
+
+def test_concurrency_is_capped_and_queue_time_recorded():
+    hasher = PasswordHasher(FAST_CONTEXT, max_workers=1)
+    hashed = FAST_CONTEXT.hash("secret")
+
+    async def burst():
+        return await asyncio.gather(
+            *(hasher.verify("secret", hashed) for _ in range(3))
+        )
+
+    assert asyncio.run(burst()) == [True] * 3
+    stats = hasher.stats()
+    assert stats["in_flight"] == 0
+    assert stats["queue_time_ms"]["count"] == 3
+    # With one worker, the last login waited for the two others
+    assert stats["queue_time_ms"]["max"] >= stats["run_time_ms"]["max"]
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc
+
+from app.core.config import settings
+from app.core.pool import InstrumentedQueuePool, get_pool_stats
+from app.main import app
+
+
+def test_pool_exhaustion_is_counted(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    held = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    stats = get_pool_stats(engine)
+    assert stats["checked_out"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_time_ms"]["count"] == 2
+    assert stats["wait_time_ms"]["max"] >= 50
+
+    held.close()
+    engine.dispose()
+    # The histogram survives the pool being recreated
+    assert get_pool_stats(engine)["wait_time_ms"]["count"] == 2
+
+
+def test_internal_pool_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "internal-secret")
+    client = TestClient(app)
+    response = client.get(
+        "/internal/pool", headers={"X-Internal-Token": "internal-secret"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["primary"]["pool_class"] == "InstrumentedQueuePool"
+    assert body["primary_async"]["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert "wait_time_ms" in body["primary_async"]
+
+
+def test_internal_routes_need_the_token(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", None)
+    assert client.get("/internal/pool").status_code == 404
+
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "internal-secret")
+    assert client.get("/internal/pool").status_code == 401
+    wrong = client.get("/internal/caches", headers={"X-Internal-Token": "guess"})
+    assert wrong.status_code == 401
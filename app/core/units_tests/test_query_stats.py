@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from uuid import uuid4
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from app.core.database import get_async_db_session
+from app.core.query_stats import QueryStatsMiddleware, track_queries
+from app.main import app
+from app.organisations.models_organisations import Organisation
+
+
+def test_statements_of_async_sessions_are_counted():
+    names = [f"Counted {uuid4()}" for _ in range(5)]
+
+    async def scenario():
+        async with get_async_db_session() as session:
+            session.add_all([Organisation(name=name) for name in names])
+        with track_queries() as stats:
+            async with get_async_db_session() as session:
+                # One query per name: the textbook N+1
+                for name in names:
+                    statement = select(Organisation).where(Organisation.name == name)
+                    (await session.exec(statement)).one()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats.count == 5
+    assert stats.total_ms > 0
+    assert list(stats.repeated_shapes(threshold=5).values()) == [5]
+    assert stats.repeated_shapes(threshold=6) == {}
+
+
+def test_query_count_headers():
+    client = TestClient(app)
+    response = client.get("/")
+    assert response.headers["X-DB-Query-Count"] == "0"
+    assert float(response.headers["X-DB-Time-Ms"]) == 0
+
+    response = client.post(
+        "/api/v1/users/new",
+        json={
+            "email": f"{uuid4()}@example.com",
+            "password": "password123",
+            "first_name": "Query",
+            "last_name": "Counter",
+        },
+    )
+    assert response.status_code == 201
+    assert int(response.headers["X-DB-Query-Count"]) > 0
+
+
+def test_streamed_bodies_are_only_counted_in_the_log(caplog):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    async def rows():
+        async with get_async_db_session() as session:
+            yield str((await session.exec(select(Organisation.uuid))).first())
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(rows())
+
+    with caplog.at_level(logging.INFO, logger="app.core.query_stats"):
+        response = TestClient(app).get("/stream")
+
+    assert response.headers["X-DB-Query-Count"] == "0"
+    (record,) = [r for r in caplog.records if r.path == "/stream"]
+    assert (record.status_code, record.db_query_count) == (200, 1)
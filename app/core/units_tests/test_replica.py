@@ -0,0 +1,83 @@
+import asyncio
+from uuid import UUID, uuid4
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine, select
+from app.core import database
+from app.core.database import ReadSessionDep, get_async_db_session
+from app.core.migrations import run_migrations
+from app.lots.models import Lot
+
+
+def _lot_names(orga_uuid):
+    async def read():
+        async with get_async_db_session(read_only=True, orga_uuid=orga_uuid) as session:
+            statement = select(Lot.name).where(Lot.orga_uuid == orga_uuid)
+            return set((await session.exec(statement)).all())
+
+    return asyncio.run(read())
+
+
+def _use_replica(monkeypatch, url):
+    replica = create_async_engine(url)
+    monkeypatch.setattr(database, "async_replica_engine", replica)
+    monkeypatch.setattr(database, "_tenant_writes", {})
+    monkeypatch.setattr(database, "_replica_unavailable_until", 0.0)
+    return replica
+
+
+def test_reads_go_to_replica_until_tenant_writes(tmp_path, monkeypatch):
+    replica_path = tmp_path / "replica.db"
+    sync_replica = create_engine(f"sqlite:///{replica_path}")
+    run_migrations(sync_replica)
+    _use_replica(monkeypatch, f"sqlite+aiosqlite:///{replica_path}")
+
+    writer, reader = uuid4(), uuid4()
+    with sync_replica.begin() as conn:
+        for orga_uuid in (writer, reader):
+            conn.execute(
+                Lot.__table__.insert().values(
+                    name="On replica", orga_uuid=orga_uuid, tax_rate=20.0
+                )
+            )
+    sync_replica.dispose()
+
+    assert _lot_names(writer) == {"On replica"}
+
+    async def write():
+        async with get_async_db_session() as session:
+            session.add(Lot(name="On primary", orga_uuid=writer))
+
+    asyncio.run(write())
+
+    # The writer reads its own write, other tenants keep using the replica
+    assert _lot_names(writer) == {"On primary"}
+    assert _lot_names(reader) == {"On replica"}
+
+
+def test_unreachable_replica_falls_back_to_primary(tmp_path, monkeypatch):
+    _use_replica(monkeypatch, f"sqlite+aiosqlite:///{tmp_path}/missing/replica.db")
+    orga_uuid = uuid4()
+
+    async def write():
+        async with get_async_db_session() as session:
+            session.add(Lot(name="On primary", orga_uuid=orga_uuid))
+
+    asyncio.run(write())
+    monkeypatch.setattr(database, "_tenant_writes", {})
+
+    assert _lot_names(orga_uuid) == {"On primary"}
+    assert database._replica_unavailable_until > 0
+
+
+def test_malformed_orga_uuid_is_left_to_validation():
+    app = FastAPI()
+
+    @app.get("/organisation/{orga_uuid}")
+    async def read(orga_uuid: UUID, session: ReadSessionDep):
+        return {"orga_uuid": str(orga_uuid)}
+
+    client = TestClient(app)
+    assert client.get("/organisation/not-a-uuid").status_code == 422
+    assert client.get(f"/organisation/{uuid4()}").status_code == 200
@@ -0,0 +1,46 @@
+import json
+from datetime import datetime
+from uuid import uuid4
+from app.core.responses import FastJSONResponse, type_adapter
+from app.lots.models import LotRead
+from app.main import app
+from app.organisations.models_organisations import Organisation
+
+
+def _lots(count: int) -> list[LotRead]:
+    organisation = Organisation(uuid=uuid4(), name="Responses")
+    return [
+        LotRead(
+            id=i,
+            name=f"Lot {i}",
+            created_at=datetime(2024, 5, 1, 14, 30),
+            orga_uuid=organisation.uuid,
+            organisation=organisation,
+        )
+        for i in range(count)
+    ]
+
+
+def test_models_are_rendered_like_their_json_dump():
+    lots = _lots(3)
+
+    assert json.loads(FastJSONResponse(lots[0]).body) == lots[0].model_dump(mode="json")
+    assert json.loads(FastJSONResponse(lots).body) == [
+        lot.model_dump(mode="json") for lot in lots
+    ]
+
+
+def test_plain_content_is_rendered_with_orjson():
+    response = FastJSONResponse({"detail": "Lot not found", "ids": [1, 2]})
+
+    assert response.body == b'{"detail":"Lot not found","ids":[1,2]}'
+    assert FastJSONResponse([]).body == b"[]"
+    assert response.media_type == "application/json"
+
+
+def test_type_adapters_are_built_once():
+    assert type_adapter(list[LotRead]) is type_adapter(list[LotRead])
+
+
+def test_default_response_class():
+    assert app.router.default_response_class is FastJSONResponse
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import threading
+from uuid import uuid4
+from sqlmodel import create_engine, select
+from app.core import slow_queries
+from app.core.config import settings
+from app.core.database import get_async_db_session
+from app.core.query_stats import track_queries
+from app.organisations.models_organisations import Organisation
+
+
+def _run_queries(name):
+    async def scenario():
+        with track_queries(route="GET /organisations"):
+            async with get_async_db_session() as session:
+                session.add(Organisation(name=name))
+                await session.flush()
+                statement = select(Organisation).where(Organisation.name == name)
+                (await session.exec(statement)).one()
+
+    asyncio.run(scenario())
+    # Wait for the plans captured in the background
+    slow_queries._explain_executor.submit(lambda: None).result()
+
+
+def test_slow_queries_are_logged_with_their_plan(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    name = f"Slow {uuid4()}"
+
+    with caplog.at_level(logging.WARNING, logger=slow_queries.__name__):
+        _run_queries(name)
+
+    records = {record.statement.split()[0]: record for record in caplog.records}
+    select_record = records["SELECT"]
+    assert select_record.route == "GET /organisations"
+    assert name in select_record.parameters
+    assert select_record.plan and select_record.explain_error is None
+    # Writes are logged without being explained
+    assert records["INSERT"].plan is None
+
+
+def test_fast_queries_are_not_logged(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 60_000.0)
+
+    with caplog.at_level(logging.WARNING, logger=slow_queries.__name__):
+        _run_queries(f"Fast {uuid4()}")
+
+    assert caplog.records == []
+
+
+def test_plans_pending_are_capped(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_MAX_PENDING", 1)
+    engine = create_engine("sqlite://")
+    monkeypatch.setattr(slow_queries, "_explain_engines", {engine: engine})
+    release = threading.Event()
+
+    def blocked_explain(*args, **kwargs):
+        release.wait()
+        return ["SCAN organisation"]
+
+    monkeypatch.setattr(slow_queries, "explain_statement", blocked_explain)
+
+    def report():
+        return slow_queries.report_slow_query(
+            engine, "SELECT 1", (), 600.0, False, None
+        )
+
+    with caplog.at_level(logging.WARNING, logger=slow_queries.__name__):
+        queued = report()
+        # The backlog is full: logged at once, without a plan
+        assert report() is None
+        release.set()
+        queued.result()
+        # Room again once the plan is captured
+        assert report() is not None
+        slow_queries._explain_executor.submit(lambda: None).result()
+
+    errors = [record.explain_error for record in caplog.records]
+    assert errors == ["Not explained: too many plans pending", None, None]
@@ -0,0 +1,158 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, update
+from app.auth.CRUD import verify_organization_access
+from app.clients.CRUD import CLIENT_SEARCH, search_clients
+from app.clients.models import Client
+from app.core import trigrams as trigrams_module
+from app.core.config import settings
+from app.core.database import get_db_session
+from app.core.query_stats import track_queries
+from app.core.trigrams import TrigramIndex, search_document, trigrams
+from app.main import app
+from app.organisations.models_organisations import Organisation
+
+
+def test_trigrams_match_pg_trgm():
+    # SELECT show_trgm('Jean-Luc')
+    assert trigrams("Jean-Luc") == {
+        "  j",
+        " je",
+        "jea",
+        "ean",
+        "an ",
+        "  l",
+        " lu",
+        "luc",
+        "uc ",
+    }
+    assert search_document(["Jean", None], ["06 12-34"]) == "jean  061234"
+
+
+def test_index_ranks_partial_and_misspelt_matches():
+    index = TrigramIndex()
+    index.add(1, "jean dupont")
+    index.add(2, "marie dupond")
+    index.add(3, "paul martin")
+    index.add(4, "dupont et fils")
+
+    assert index.search("dupont", 10) == [(1, 1.0), (4, 1.0), (2, 5 / 7)]
+    assert [key for key, _ in index.search("dupon", 10)] == [1, 2, 4]
+    assert index.search("durand", 10) == []
+    assert index.search("--", 10) == []
+
+    index.add(1, "jean durand")
+    index.remove(4)
+    assert [key for key, _ in index.search("dupont", 10)] == [2]
+    assert [key for key, _ in index.search("durand", 10)] == [1]
+
+
+def _seed():
+    with get_db_session() as session:
+        org, other = Organisation(name="Trigrams"), Organisation(name="Other")
+        session.add_all([org, other])
+        session.flush()
+        clients = [
+            Client(orga_uuid=org.uuid, first_name="Jeanne", last_name="Martin"),
+            Client(
+                orga_uuid=org.uuid,
+                company="Galerie Martineau",
+                email="contact@martineau.fr",
+            ),
+            Client(orga_uuid=org.uuid, last_name="Petit", phone="06 12 34 56 78"),
+            Client(orga_uuid=other.uuid, first_name="Jeanne", last_name="Martin"),
+        ]
+        session.add_all(clients)
+        session.commit()
+        return org.uuid, [client.id for client in clients]
+
+
+def test_client_search_is_scoped_and_follows_changes():
+    orga_uuid, (martin, galerie, petit, _) = _seed()
+
+    matches = search_clients(orga_uuid, "martin")
+    assert [match.id for match in matches] == [martin, galerie]
+    assert matches[0].score == 1.0
+    assert [match.id for match in search_clients(orga_uuid, "0612345")] == [petit]
+
+    # The index is built once, then each lookup only loads its matches
+    with track_queries() as stats:
+        assert [match.id for match in search_clients(orga_uuid, "jeane")] == [martin]
+    assert stats.count == 1
+
+    with get_db_session() as session:
+        session.get(Client, petit).last_name = "Martinez"
+        session.delete(session.get(Client, galerie))
+        session.commit()
+    assert [match.id for match in search_clients(orga_uuid, "martin")] == [
+        martin,
+        petit,
+    ]
+
+
+def test_search_route():
+    orga_uuid, (martin, *_) = _seed()
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        client = TestClient(app)
+        response = client.get(
+            f"/api/v1/clients/organization/{orga_uuid}/search", params={"q": "jeanne"}
+        )
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == martin
+        assert response.json()[0]["orga_uuid"] == str(orga_uuid)
+    finally:
+        app.dependency_overrides.pop(verify_organization_access, None)
+
+
+def test_concurrent_first_lookups_wait_for_a_single_build(monkeypatch):
+    orga_uuid, (martin, *_) = _seed()
+    builds = []
+    run_build = CLIENT_SEARCH._run_build
+
+    def slow_build(*args):
+        builds.append(1)
+        time.sleep(0.1)
+        run_build(*args)
+
+    monkeypatch.setattr(CLIENT_SEARCH, "_run_build", slow_build)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(lambda _: search_clients(orga_uuid, "jeanne"), range(4))
+        )
+
+    assert len(builds) == 1
+    assert all([match.id for match in matches] == [martin] for matches in results)
+
+
+def test_stale_index_is_refreshed_in_the_background(monkeypatch):
+    orga_uuid, (martin, *_) = _seed()
+    search_clients(orga_uuid, "jeanne")
+    # A client added by another worker: this one's index does not know it
+    with get_db_session() as session:
+        session.execute(
+            insert(Client).values(orga_uuid=orga_uuid, first_name="Jeannette")
+        )
+
+    later = time.monotonic() + settings.FUZZY_INDEX_CACHE_SECONDS + 1
+    monkeypatch.setattr(trigrams_module, "monotonic", lambda: later)
+    # Served by the stale index while the refresh runs
+    assert [match.id for match in search_clients(orga_uuid, "jeanne")] == [martin]
+    build = CLIENT_SEARCH._builds.get(orga_uuid)
+    if build is not None:
+        build.future.result()
+    assert len(search_clients(orga_uuid, "jeanne")) == 2
+
+
+def test_stale_index_never_returns_another_organisations_row():
+    orga_uuid, (martin, galerie, petit, other_martin) = _seed()
+    search_clients(orga_uuid, "martin")
+    # Moved by another worker: this one's index still lists it
+    with get_db_session() as session:
+        other_uuid = session.get(Client, other_martin).orga_uuid
+        session.execute(
+            update(Client).where(Client.id == martin).values(orga_uuid=other_uuid)
+        )
+
+    assert [match.id for match in search_clients(orga_uuid, "martin")] == [galerie]
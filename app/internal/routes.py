@@ -0,0 +1,47 @@
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.core import database
+from app.core.cache import get_cache_stats
+from app.core.config import settings
+from app.core.passwords import PASSWORD_HASHER
+from app.core.pool import get_pool_stats
+
+
+def verify_internal_token(x_internal_token: str | None = Header(None)) -> None:
+    """
+    The internal routes are disabled unless `INTERNAL_API_TOKEN` is set, and
+    then need it in the `X-Internal-Token` header.
+    """
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_internal_token is None or not secrets.compare_digest(
+        x_internal_token.encode(), settings.INTERNAL_API_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=401, detail="Invalid internal token")
+
+
+router = APIRouter(dependencies=[Depends(verify_internal_token)])
+
+
+@router.get("/pool", response_model=dict, status_code=200)
+async def read_pool_stats():
+    stats = {
+        "primary": get_pool_stats(database.engine),
+        "primary_async": get_pool_stats(database.async_engine.sync_engine),
+    }
+    if database.async_replica_engine is not None:
+        stats["replica_async"] = get_pool_stats(
+            database.async_replica_engine.sync_engine
+        )
+    return stats
+
+
+@router.get("/caches", response_model=dict, status_code=200)
+async def read_cache_stats():
+    return get_cache_stats()
+
+
+@router.get("/passwords", response_model=dict, status_code=200)
+async def read_password_hasher_stats():
+    return PASSWORD_HASHER.stats()
@@ -1,51 +1,89 @@
 from uuid import UUID
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.inventories.models import (
     Inventory,
     InventoryCreate,
     InventoryRead,
     InventoryUpdate,
 )
-from app.core.exceptions import DatabaseOperationError
-from app.core.database import get_db_session
-from app.lots.models import LotRead
+from app.core.exceptions import DatabaseOperationError, PaginationError
+from app.core.database import get_async_db_session
+from app.core.loading import load_policy
+from app.core.pagination import KeysetPagination, Page
+from app.lots.CRUD import (
+    LOT_PAGINATION,
+    LOT_READ_LIST,
+    LOT_READ_LOADING,
+    LOT_SEARCH_PAGINATION,
+    lot_text_search,
+)
+from app.lots.models import Lot, LotRead
+
+# What InventoryRead serialises
+INVENTORY_READ_LOADING = load_policy(
+    selectinload(Inventory.lots).options(*LOT_READ_LOADING)
+)
 
+INVENTORY_PAGINATION = KeysetPagination(
+    Inventory.uuid,
+    {
+        "created_at": Inventory.created_at,
+        "inventory_date": Inventory.inventory_date,
+    },
+)
 
-async def create_inventory(inventory_create: InventoryCreate) -> InventoryRead:
+
+async def create_inventory(
+    inventory_create: InventoryCreate, session: AsyncSession | None = None
+) -> InventoryRead:
     """
     Create a new inventory in the database.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
             inventory = Inventory.model_validate(inventory_create)
             session.add(inventory)
-            session.commit()
-            session.refresh(inventory)
+            await session.flush()
+            inventory = await session.get(
+                Inventory,
+                inventory.uuid,
+                options=INVENTORY_READ_LOADING,
+                populate_existing=True,
+            )
             return InventoryRead.model_validate(inventory)
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to create inventory: {str(e)}")
 
 
-async def get_inventory_by_uuid(inventory_uuid: UUID) -> InventoryRead:
+async def get_inventory_by_uuid(
+    inventory_uuid: UUID, session: AsyncSession | None = None
+) -> InventoryRead:
     """
     Retrieve an inventory by its UUID.
     """
-    with get_db_session() as session:
-        inventory = session.get(Inventory, inventory_uuid)
+    async with get_async_db_session(session) as session:
+        inventory = await session.get(
+            Inventory, inventory_uuid, options=INVENTORY_READ_LOADING
+        )
         if not inventory:
             raise ValueError(f"Inventory with uuid {inventory_uuid} not found")
         return InventoryRead.model_validate(inventory)
 
 
 async def update_inventory(
-    inventory_uuid: UUID, inventory_update: InventoryUpdate
+    inventory_uuid: UUID,
+    inventory_update: InventoryUpdate,
+    session: AsyncSession | None = None,
 ) -> InventoryRead:
     """
     Update an existing inventory in the database.
     """
-    with get_db_session() as session:
-        inventory = session.get(Inventory, inventory_uuid)
+    async with get_async_db_session(session) as session:
+        inventory = await session.get(
+            Inventory, inventory_uuid, options=INVENTORY_READ_LOADING
+        )
         if not inventory:
             raise ValueError(f"Inventory with uuid {inventory_uuid} not found")
 
@@ -54,66 +92,88 @@ async def update_inventory(
             for key, value in inventory_data.items():
                 setattr(inventory, key, value)
             session.add(inventory)
-            session.commit()
-            session.refresh(inventory)
+            await session.flush()
+            inventory = await session.get(
+                Inventory,
+                inventory.uuid,
+                options=INVENTORY_READ_LOADING,
+                populate_existing=True,
+            )
             return InventoryRead.model_validate(inventory)
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to update inventory: {str(e)}")
 
 
-async def delete_inventory(inventory_uuid: UUID) -> InventoryRead:
+async def delete_inventory(
+    inventory_uuid: UUID, session: AsyncSession | None = None
+) -> InventoryRead:
     """
     Delete an inventory from the database.
     """
-    with get_db_session() as session:
-        inventory = session.get(Inventory, inventory_uuid)
+    async with get_async_db_session(session) as session:
+        inventory = await session.get(
+            Inventory, inventory_uuid, options=INVENTORY_READ_LOADING
+        )
         if not inventory:
             raise ValueError(f"Inventory with uuid {inventory_uuid} not found")
 
         try:
             deleted_inventory = InventoryRead.model_validate(inventory)
-            session.delete(inventory)
-            session.commit()
+            await session.delete(inventory)
+            await session.flush()
             return deleted_inventory
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to delete inventory: {str(e)}")
 
 
 async def get_inventories_of_organisation(
-    orga_uuid: UUID, skip: int = 0, limit: int = 100
-) -> list[InventoryRead]:
+    orga_uuid: UUID,
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str = "created_at",
+    descending: bool = False,
+    session: AsyncSession | None = None,
+) -> Page[InventoryRead]:
     """
-    Retrieve inventories for a specific organisation.
+    Retrieve a page of inventories for a specific organisation, sorted by
+    `sort_by` then uuid.
     """
-    with get_db_session() as session:
+    statement = INVENTORY_PAGINATION.apply(
+        select(Inventory)
+        .where(Inventory.orga_uuid == orga_uuid)
+        .options(*INVENTORY_READ_LOADING),
+        sort_by,
+        descending,
+        cursor,
+        limit,
+    )
+    async with get_async_db_session(session) as session:
         try:
-            statement = (
-                select(Inventory)
-                .where(Inventory.orga_uuid == orga_uuid)
-                .offset(skip)
-                .limit(limit)
+            inventories = (await session.exec(statement)).all()
+            return INVENTORY_PAGINATION.page(
+                inventories, sort_by, descending, limit, InventoryRead
             )
-            results = session.exec(statement)
-            return [InventoryRead.model_validate(inventory) for inventory in results]
         except Exception as e:
             raise DatabaseOperationError(
                 f"Failed to get inventories of organisation: {str(e)}"
             )
 
 
-async def get_lots_of_inventory(inventory_uuid: UUID) -> list[LotRead]:
+async def get_lots_of_inventory(
+    inventory_uuid: UUID, session: AsyncSession | None = None
+) -> list[LotRead]:
     """
     Retrieve all lots of a specific inventory.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
-            inventory = session.get(Inventory, inventory_uuid)
+            inventory = await session.get(
+                Inventory, inventory_uuid, options=INVENTORY_READ_LOADING
+            )
             if not inventory:
                 raise ValueError(f"Inventory with uuid {inventory_uuid} not found")
 
-            return [LotRead.model_validate(lot) for lot in inventory.lots]
+            return LOT_READ_LIST.validate_python(inventory.lots, from_attributes=True)
         except Exception as e:
             raise DatabaseOperationError(f"Failed to get lots of inventory: {str(e)}")
 
@@ -124,48 +184,79 @@ async def search_and_filter_lots(
     min_estimate: float | None = None,
     max_estimate: float | None = None,
     category: str | None = None,
-) -> list[LotRead]:
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str | None = None,
+    descending: bool = False,
+    session: AsyncSession | None = None,
+) -> Page[LotRead]:
     """
     Search and filter lots within an inventory based on various criteria.
+
+    All the criteria are applied by the database in a single query: only
+    the lots of the requested page are loaded.
+
+    Args:
+
+        inventory_uuid (UUID): The ID of the inventory.
+        search_term (str | None): Words to look for with the full-text index.
+        min_estimate (float | None): Minimum low estimate.
+        max_estimate (float | None): Maximum high estimate.
+        category (str | None): Category of the lots.
+        cursor (str | None): The `next_cursor` of the previous page, None for the first page.
+        limit (int): The maximum number of lots to return.
+        sort_by (str | None): "relevance" (the default with a search term), or one of `LOT_PAGINATION.sort_fields` ("id" by default).
+        descending (bool): Whether to sort in descending order, not for "relevance".
+
+    Returns:
+        Page[LotRead]: The matching lots and the cursor of the next page.
+
+    Raises:
+        ValueError: If the inventory does not exist.
+        PaginationError: If the cursor or the sort is invalid.
+        DatabaseOperationError: If an error occurs during the search.
     """
-    with get_db_session() as session:
-        try:
-            inventory = session.get(Inventory, inventory_uuid)
-            if not inventory:
-                raise ValueError(f"Inventory with uuid {inventory_uuid} not found")
+    if sort_by is None:
+        sort_by = "relevance" if search_term else "id"
+    if sort_by == "relevance" and not search_term:
+        raise PaginationError("Sorting by relevance needs a search term")
+
+    statement = (
+        select(Lot)
+        .options(*LOT_READ_LOADING)
+        .where(Lot.inventory_uuid == inventory_uuid)
+    )
+    if min_estimate is not None:
+        statement = statement.where(Lot.low_estimate >= min_estimate)
+    if max_estimate is not None:
+        statement = statement.where(Lot.high_estimate <= max_estimate)
+    if category:
+        statement = statement.where(Lot.category == category)
+
+    async with get_async_db_session(session) as session:
+        inventory = await session.exec(
+            select(Inventory.uuid).where(Inventory.uuid == inventory_uuid)
+        )
+        if inventory.first() is None:
+            raise ValueError(f"Inventory with uuid {inventory_uuid} not found")
 
-            filtered_lots = inventory.lots
-
-            if search_term:
-                filtered_lots = [lot for lot in filtered_lots if search_term.lower() in lot.name.lower() or search_term.lower() in lot.description.lower()]  # type: ignore
-
-            if min_estimate is not None:
-                filtered_lots = [
-                    lot
-                    for lot in filtered_lots
-                    if (
-                        lot.low_estimate is not None
-                        and lot.low_estimate >= min_estimate
-                    )
-                ]
-
-            if max_estimate is not None:
-                filtered_lots = [
-                    lot
-                    for lot in filtered_lots
-                    if (
-                        lot.high_estimate is not None
-                        and lot.high_estimate <= max_estimate
-                    )
-                ]
-
-            if category:
-                filtered_lots = [
-                    lot
-                    for lot in filtered_lots
-                    if (lot.category is not None and lot.category == category)
-                ]
-
-            return [LotRead.model_validate(lot) for lot in filtered_lots]
+        if search_term:
+            statement = lot_text_search(
+                statement,
+                search_term,
+                session.bind.dialect.name,
+                ranked=sort_by == "relevance",
+            )
+        if sort_by == "relevance":
+            statement = LOT_SEARCH_PAGINATION.apply(statement, cursor, limit)
+        else:
+            statement = LOT_PAGINATION.apply(
+                statement, sort_by, descending, cursor, limit
+            )
+        try:
+            lots = (await session.exec(statement)).all()
+            if sort_by == "relevance":
+                return LOT_SEARCH_PAGINATION.page(lots, cursor, limit, LotRead)
+            return LOT_PAGINATION.page(lots, sort_by, descending, limit, LotRead)
         except Exception as e:
             raise DatabaseOperationError(f"Failed to search and filter lots: {str(e)}")
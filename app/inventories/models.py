@@ -1,11 +1,10 @@
 # from typing import TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, Index, SQLModel, Relationship
 from datetime import datetime, timezone
 from enum import Enum
 from uuid import UUID, uuid4
 from app.lots.models import Lot
 from app.organisations.models_organisations import Organisation
-from app.sellers.models import Seller
 
 # if TYPE_CHECKING:
 
@@ -33,14 +32,26 @@ class InventoryBase(SQLModel):
 
 
 class Inventory(InventoryBase, table=True):
+    # Tenant-scoped lookups, in the (filter, id) order used to paginate
+    __table_args__ = (
+        Index("ix_inventory_orga_uuid_uuid", "orga_uuid", "uuid"),
+        Index(
+            "ix_inventory_orga_uuid_created_at_uuid", "orga_uuid", "created_at", "uuid"
+        ),
+        Index(
+            "ix_inventory_orga_uuid_inventory_date_uuid",
+            "orga_uuid",
+            "inventory_date",
+            "uuid",
+        ),
+        Index("ix_inventory_seller_id", "seller_id"),
+    )
+
     uuid: UUID = Field(default_factory=uuid4, primary_key=True, index=True, unique=True)
     orga_uuid: UUID = Field(foreign_key="organisation.uuid")
     organisation: Organisation = Relationship(back_populates="inventories")
     lots: list["Lot"] = Relationship(
-        sa_relationship_kwargs={
-            "primaryjoin": "foreign(Lot.id) == Inventory.uuid",
-            "lazy": "selectin",
-        }
+        sa_relationship_kwargs={"foreign_keys": "Lot.inventory_uuid"}
     )
     seller_id: int | None = Field(default=None, foreign_key="seller.id")
 
@@ -50,13 +61,11 @@ class InventoryCreate(InventoryBase):
 
 
 class InventoryRead(InventoryBase):
-    id: int
     uuid: UUID
     orga_uuid: UUID
     public_url: str | None = None
     lots: list[Lot] = []
     seller_id: int | None = None
-    seller: Seller
 
 
 class InventoryUpdate(SQLModel):
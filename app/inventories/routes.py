@@ -3,34 +3,51 @@ from uuid import UUID
 from app.inventories.models import InventoryCreate, InventoryRead, InventoryUpdate
 from app.lots.models import LotRead
 from app.inventories import CRUD
-from app.core.exceptions import DatabaseOperationError
+from app.core.config import settings
+from app.core.exceptions import DatabaseOperationError, PaginationError
 from app.auth.CRUD import CurrentUser
+from app.core.database import ReadSessionDep, SessionDep
+from app.core.pagination import Page
+from app.core.responses import FastJSONResponse
 
 router = APIRouter()
 
 
 @router.post("/", response_model=InventoryRead)
-async def create_inventory(inventory: InventoryCreate, current_user: CurrentUser):
+async def create_inventory(
+    inventory: InventoryCreate, current_user: CurrentUser, session: SessionDep
+):
     try:
-        return await CRUD.create_inventory(inventory)
+        return FastJSONResponse(await CRUD.create_inventory(inventory, session=session))
     except DatabaseOperationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{inventory_uuid}", response_model=InventoryRead)
-async def get_inventory(inventory_uuid: UUID, current_user: CurrentUser):
+async def get_inventory(
+    inventory_uuid: UUID, current_user: CurrentUser, session: SessionDep
+):
     try:
-        return await CRUD.get_inventory_by_uuid(inventory_uuid)
+        return FastJSONResponse(
+            await CRUD.get_inventory_by_uuid(inventory_uuid, session=session)
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.patch("/{inventory_uuid}", response_model=InventoryRead)
 async def update_inventory(
-    inventory_uuid: UUID, inventory_update: InventoryUpdate, current_user: CurrentUser
+    inventory_uuid: UUID,
+    inventory_update: InventoryUpdate,
+    current_user: CurrentUser,
+    session: SessionDep,
 ):
     try:
-        return await CRUD.update_inventory(inventory_uuid, inventory_update)
+        return FastJSONResponse(
+            await CRUD.update_inventory(
+                inventory_uuid, inventory_update, session=session
+            )
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except DatabaseOperationError as e:
@@ -38,52 +55,85 @@ async def update_inventory(
 
 
 @router.delete("/{inventory_uuid}", response_model=InventoryRead)
-async def delete_inventory(inventory_uuid: UUID, current_user: CurrentUser):
+async def delete_inventory(
+    inventory_uuid: UUID, current_user: CurrentUser, session: SessionDep
+):
     try:
-        return await CRUD.delete_inventory(inventory_uuid)
+        return FastJSONResponse(
+            await CRUD.delete_inventory(inventory_uuid, session=session)
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except DatabaseOperationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/organisation/{orga_uuid}", response_model=list[InventoryRead])
+@router.get("/organisation/{orga_uuid}", response_model=Page[InventoryRead])
 async def get_inventories_of_organisation(
     orga_uuid: UUID,
     current_user: CurrentUser,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=100),
+    session: ReadSessionDep,
+    cursor: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    sort_by: str = Query("created_at"),
+    descending: bool = Query(False),
 ):
     try:
-        return await CRUD.get_inventories_of_organisation(orga_uuid, skip, limit)
-    except DatabaseOperationError as e:
+        return FastJSONResponse(
+            await CRUD.get_inventories_of_organisation(
+                orga_uuid, cursor, limit, sort_by, descending, session=session
+            )
+        )
+    except (PaginationError, DatabaseOperationError) as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{inventory_uuid}/lots", response_model=list[LotRead])
-async def get_lots_of_inventory(inventory_uuid: UUID, current_user: CurrentUser):
+async def get_lots_of_inventory(
+    inventory_uuid: UUID, current_user: CurrentUser, session: SessionDep
+):
     try:
-        return await CRUD.get_lots_of_inventory(inventory_uuid)
+        return FastJSONResponse(
+            await CRUD.get_lots_of_inventory(inventory_uuid, session=session)
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except DatabaseOperationError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{inventory_uuid}/search", response_model=list[LotRead])
+@router.get("/{inventory_uuid}/search", response_model=Page[LotRead])
 async def search_and_filter_lots(
     inventory_uuid: UUID,
     current_user: CurrentUser,
+    # On the primary: without the organisation in the path, a read session
+    # would skip the read-your-writes window of freshly imported lots
+    session: SessionDep,
     search_term: str | None = None,
     min_estimate: float | None = None,
     max_estimate: float | None = None,
     category: str | None = None,
+    cursor: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    sort_by: str | None = Query(None),
+    descending: bool = Query(False),
 ):
     try:
-        return await CRUD.search_and_filter_lots(
-            inventory_uuid, search_term, min_estimate, max_estimate, category
+        return FastJSONResponse(
+            await CRUD.search_and_filter_lots(
+                inventory_uuid,
+                search_term,
+                min_estimate,
+                max_estimate,
+                category,
+                cursor=cursor,
+                limit=limit,
+                sort_by=sort_by,
+                descending=descending,
+                session=session,
+            )
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    except DatabaseOperationError as e:
+    except (PaginationError, DatabaseOperationError) as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -103,7 +103,7 @@ async def test_get_inventories_of_organisation():
         await create_inventory(inventory_create)
 
     # Retrieve inventories
-    inventories = await get_inventories_of_organisation(orga_uuid)
+    inventories = (await get_inventories_of_organisation(orga_uuid)).items
     assert len(inventories) == 3
 
     # Clean up
@@ -0,0 +1,50 @@
+from datetime import datetime
+from fastapi.testclient import TestClient
+from app.auth.CRUD import get_current_user
+from app.core.database import get_db_session
+from app.inventories.models import Inventory, InventoryType
+from app.lots.models import Lot
+from app.main import app
+from app.organisations.models_organisations import Organisation
+
+
+def _inventory(orga_uuid) -> Inventory:
+    return Inventory(
+        orga_uuid=orga_uuid,
+        title="Succession",
+        inventory_type=InventoryType.SUCCESSION,
+        inventory_date=datetime(2024, 3, 1),
+        location="Bordeaux",
+    )
+
+
+def test_inventories_of_organisation_route():
+    with get_db_session() as session:
+        org = Organisation(name="Inventory list")
+        session.add(org)
+        session.flush()
+        inventories = [_inventory(org.uuid) for _ in range(3)]
+        session.add_all(inventories)
+        session.flush()
+        session.add(Lot(orga_uuid=org.uuid, inventory_uuid=inventories[0].uuid))
+        session.commit()
+        orga_uuid = org.uuid
+        expected = sorted(str(inventory.uuid) for inventory in inventories)
+
+    app.dependency_overrides[get_current_user] = lambda: None
+    try:
+        client = TestClient(app)
+        url = f"/api/v1/inventories/organisation/{orga_uuid}"
+        first = client.get(url, params={"limit": 2})
+        second = client.get(
+            url, params={"limit": 2, "cursor": first.json()["next_cursor"]}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert first.status_code == second.status_code == 200
+    items = first.json()["items"] + second.json()["items"]
+    assert sorted(item["uuid"] for item in items) == expected
+    assert all(item["orga_uuid"] == str(orga_uuid) for item in items)
+    assert sum(len(item["lots"]) for item in items) == 1
+    assert second.json()["next_cursor"] is None
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import datetime
+from uuid import uuid4
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+from app.auth.CRUD import get_current_user
+from app.core import database
+from app.core.database import get_db_session
+from app.core.migrations import run_migrations
+from app.core.exceptions import PaginationError
+from app.core.query_stats import track_queries
+from app.inventories.CRUD import search_and_filter_lots
+from app.inventories.models import Inventory, InventoryType
+from app.lots.models import Lot
+from app.main import app
+from app.organisations.models_organisations import Organisation
+
+
+def _inventory(orga_uuid) -> Inventory:
+    return Inventory(
+        orga_uuid=orga_uuid,
+        title="Succession",
+        inventory_type=InventoryType.SUCCESSION,
+        inventory_date=datetime(2024, 3, 1),
+        location="Bordeaux",
+    )
+
+
+@pytest.fixture(scope="module")
+def inventory():
+    with get_db_session() as session:
+        org = Organisation(name="Inventory search")
+        session.add(org)
+        session.flush()
+        inventory, other = _inventory(org.uuid), _inventory(org.uuid)
+        session.add_all([inventory, other])
+        session.flush()
+        lots = {
+            name: Lot(
+                orga_uuid=org.uuid,
+                inventory_uuid=inventory.uuid,
+                name=name,
+                category=category,
+                low_estimate=low,
+                high_estimate=high,
+            )
+            for name, category, low, high in [
+                ("Fauteuil cabriolet", "Mobilier", 200, 300),
+                ("Commode Louis XV", "Mobilier", 1000, 1500),
+                ("Table de chevet", "Mobilier", None, None),
+                ("Pendule", "Horlogerie", 400, 600),
+                ("Bergère", "Mobilier", 500, 800),
+            ]
+        }
+        session.add_all(lots.values())
+        session.add(
+            Lot(
+                orga_uuid=org.uuid,
+                inventory_uuid=other.uuid,
+                name="Chaise",
+                category="Mobilier",
+                low_estimate=300,
+                high_estimate=400,
+            )
+        )
+        session.commit()
+        return inventory.uuid, {name: lot.id for name, lot in lots.items()}
+
+
+def _search(inventory_uuid, **kwargs):
+    return asyncio.run(search_and_filter_lots(inventory_uuid, **kwargs))
+
+
+def test_filters_are_combined_in_one_query(inventory):
+    inventory_uuid, _ = inventory
+
+    with track_queries() as stats:
+        page = _search(
+            inventory_uuid, min_estimate=200, max_estimate=1000, category="Mobilier"
+        )
+
+    assert [lot.name for lot in page.items] == ["Fauteuil cabriolet", "Bergère"]
+    # The inventory check, the matching lots, their organisation
+    assert stats.count == 3
+    (lots_query,) = [shape for shape in stats.shapes if "FROM lot" in shape]
+    for predicate in ("lot.low_estimate >=", "lot.high_estimate <=", "lot.category ="):
+        assert predicate in lots_query
+
+
+def test_sorting_and_pagination(inventory):
+    inventory_uuid, ids = inventory
+
+    first = _search(inventory_uuid, category="Mobilier", limit=2, descending=True)
+    second = _search(
+        inventory_uuid,
+        category="Mobilier",
+        limit=2,
+        descending=True,
+        cursor=first.next_cursor,
+    )
+
+    assert [lot.id for lot in first.items + second.items] == sorted(
+        (ids[name] for name in ids if name != "Pendule"), reverse=True
+    )
+    assert second.next_cursor is None
+
+
+def test_text_search_with_filters(inventory):
+    inventory_uuid, ids = inventory
+
+    ranked = _search(inventory_uuid, search_term="commode", max_estimate=2000)
+    by_id = _search(inventory_uuid, search_term="mobilier", sort_by="id")
+
+    assert [lot.id for lot in ranked.items] == [ids["Commode Louis XV"]]
+    assert [lot.id for lot in by_id.items] == sorted(
+        ids[name] for name in ids if name != "Pendule"
+    )
+    with pytest.raises(PaginationError):
+        _search(inventory_uuid, sort_by="relevance")
+    with pytest.raises(ValueError):
+        _search(uuid4())
+
+
+def test_search_route_reads_fresh_lots_from_the_primary(
+    inventory, tmp_path, monkeypatch
+):
+    inventory_uuid, ids = inventory
+    # An empty replica: a lagging one has not received the inventory yet
+    replica_path = tmp_path / "replica.db"
+    run_migrations(create_engine(f"sqlite:///{replica_path}"))
+    monkeypatch.setattr(
+        database,
+        "async_replica_engine",
+        create_async_engine(f"sqlite+aiosqlite:///{replica_path}"),
+    )
+    monkeypatch.setattr(database, "_replica_unavailable_until", 0.0)
+    app.dependency_overrides[get_current_user] = lambda: None
+    try:
+        response = TestClient(app).get(
+            f"/api/v1/inventories/{inventory_uuid}/search",
+            params={"category": "Horlogerie"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [lot["id"] for lot in response.json()["items"]] == [ids["Pendule"]]
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, Index, SQLModel, Relationship
 from datetime import datetime, timedelta
 from enum import Enum
 import hashlib
@@ -40,6 +40,13 @@ class InvoiceBase(SQLModel):
 
 
 class Invoice(InvoiceBase, table=True):
+    # Tenant-scoped lookups, in the (filter, id) order used to paginate
+    __table_args__ = (
+        Index("ix_invoice_orga_uuid_id", "orga_uuid", "id"),
+        Index("ix_invoice_client_id_id", "client_id", "id"),
+        Index("ix_invoice_sale_id_id", "sale_id", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     lots: list["Lot"] = Relationship(back_populates="invoice")
     orga_uuid: UUID = Field(default=None, foreign_key="organisation.uuid")
@@ -47,7 +54,6 @@ class Invoice(InvoiceBase, table=True):
         back_populates="invoices",
         sa_relationship_kwargs={
             "foreign_keys": "Invoice.orga_uuid",
-            "lazy": "selectin",
         },
     )
     sale_id: int | None = Field(default=None, foreign_key="sale.id")
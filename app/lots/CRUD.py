@@ -1,11 +1,92 @@
+from collections.abc import AsyncIterator, Hashable, Iterable, Sequence
+from itertools import chain, pairwise
+import re
+from typing import Any
 from uuid import UUID
+from pydantic import BaseModel
+from sqlalchemy import (
+    Row,
+    Select,
+    String,
+    case,
+    cast,
+    column,
+    event,
+    false,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    table,
+    text,
+    union_all,
+)
+from sqlalchemy.orm import Session as ORMSession, raiseload, selectinload
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.lots.models import Lot, LotCreate, LotRead, LotUpdate
-from app.core.exceptions import DatabaseOperationError, LotNotFoundError
-from app.core.database import get_db_session
-
-
-async def create_lot(lot_create: LotCreate) -> LotRead:
+from app.lots.models_list import (
+    FacetCount,
+    LotFacets,
+    LotIncluded,
+    LotListItem,
+    LotListPage,
+)
+from app.organisations.models_organisations import Organisation
+from app.clients.models import Client
+from app.inventories.models import Inventory
+from app.sales.models import Sale
+from app.sellers.models import Seller
+from app.core.exceptions import (
+    DatabaseOperationError,
+    LotNotFoundError,
+    NotFoundError,
+)
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import get_async_db_session, mark_tenant_write
+from app.core.fieldsets import trimmed_model
+from app.core.loading import load_policy
+from app.core.pagination import KeysetPagination, OffsetPagination
+from app.core.responses import type_adapter
+
+# Rows per multi-row INSERT: ~30 columns keeps a chunk under SQLite's
+# 32766 bound parameters
+LOTS_BATCH_CHUNK_SIZE = 1000
+
+# What LotRead serialises
+LOT_READ_LOADING = load_policy(selectinload(Lot.organisation).raiseload("*"))
+# Validates lists of lots in one call instead of one model_validate per lot
+LOT_READ_LIST = type_adapter(list[LotRead])
+# What LotListItem serialises: the related records go to `included`
+LOT_LIST_LOADING = load_policy()
+
+# Rows fetched per round trip by the export's server-side cursor
+LOTS_EXPORT_BATCH_SIZE = 1000
+
+LOT_PAGINATION = KeysetPagination(Lot.id, {"id": Lot.id, "created_at": Lot.created_at})
+# Search results are ordered by relevance
+LOT_SEARCH_PAGINATION = OffsetPagination()
+
+# Full-text index of lots, see the "Lot full-text search index" migration
+_LOT_FTS = table("lot_fts", column("rowid"))
+# bm25 weights of the lot_fts columns: name, description, category
+_LOT_FTS_WEIGHTS = "10.0, 1.0, 5.0"
+_WORD = re.compile(r"\w+")
+
+# Bounds of the low estimate buckets of the facets, the last one is open
+ESTIMATE_BUCKETS = (0, 100, 500, 1_000, 5_000, 10_000)
+# Facets by (orga_uuid, "inventory", inventory_uuid) or (orga_uuid, "sale", sale_id)
+LOT_FACETS_CACHE: TTLCache[tuple[UUID, str, Hashable], LotFacets] = TTLCache(
+    "lot_facets",
+    maxsize=settings.LOT_FACETS_CACHE_SIZE,
+    ttl=settings.LOT_FACETS_CACHE_SECONDS,
+)
+
+
+async def create_lot(
+    lot_create: LotCreate, session: AsyncSession | None = None
+) -> LotRead:
     """
     Create a new lot in the database.
 
@@ -19,102 +100,282 @@ async def create_lot(lot_create: LotCreate) -> LotRead:
     Raises:
         HTTPException: If an error occurs during lot creation or if the user is not authorized.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
             lot = Lot.model_validate(lot_create)
             session.add(lot)
-            session.commit()
-            session.refresh(lot)
+            await session.flush()
+            lot = await session.get(
+                Lot, lot.id, options=LOT_READ_LOADING, populate_existing=True
+            )
             return LotRead.model_validate(lot)
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to create lot: {str(e)}")
 
 
-async def create_lots_batch(lots_create: list[LotCreate]) -> list[LotRead]:
+async def create_lots_batch(
+    lots_create: list[LotCreate],
+    session: AsyncSession | None = None,
+    chunk_size: int = LOTS_BATCH_CHUNK_SIZE,
+) -> list[LotRead]:
     """
     Create multiple lots in the database in a single transaction.
 
+    Lots are inserted with multi-row `INSERT ... RETURNING` statements of
+    `chunk_size` rows, so the generated ids come back with the insert itself
+    instead of one refresh per lot.
+
     Args:
 
         lots_create (List[LotCreate]): A list of lot data to create.
+        chunk_size (int): Number of lots per INSERT statement.
 
     Returns:
-        List[LotRead]: The list of created lot data.
+        List[LotRead]: The list of created lot data, in input order.
 
     Raises:
         DatabaseOperationError: If an error occurs during lot creation.
     """
-    with get_db_session() as session:
+    if not lots_create:
+        return []
+
+    async with get_async_db_session(session) as session:
         try:
-            lots = [Lot.model_validate(lot_create) for lot_create in lots_create]
-            session.add_all(lots)
-            session.commit()
-            for lot in lots:
-                session.refresh(lot)
-            return [LotRead.model_validate(lot) for lot in lots]
+            rows = [
+                Lot.model_validate(lot_create).model_dump(exclude={"id"})
+                for lot_create in lots_create
+            ]
+            statement = insert(Lot).returning(
+                *Lot.__table__.columns  # type: ignore[attr-defined]
+            )
+            created = []
+            for start in range(0, len(rows), chunk_size):
+                result = await session.exec(
+                    statement, params=rows[start : start + chunk_size]
+                )
+                # RETURNING order is not guaranteed, ids follow the VALUES
+                # order. (sort_by_parameter_order would make SQLite fall back
+                # to one INSERT per row.)
+                created.extend(
+                    sorted(result.mappings().all(), key=lambda row: row["id"])
+                )
+
+            # Core inserts bypass the ORM flush which tracks facet changes
+            track_lot_facet_changes(
+                session.sync_session,
+                chain.from_iterable(
+                    _facet_keys(
+                        [row["orga_uuid"]], [row["inventory_uuid"]], [row["sale_id"]]
+                    )
+                    for row in created
+                ),
+            )
+            orga_uuids = {row["orga_uuid"] for row in created}
+            organisations = await session.exec(
+                select(Organisation)
+                .where(Organisation.uuid.in_(orga_uuids))
+                .options(raiseload("*"))
+            )
+            organisations_by_uuid = {orga.uuid: orga for orga in organisations}
+            lots = LOT_READ_LIST.validate_python(
+                [
+                    {**row, "organisation": organisations_by_uuid[row["orga_uuid"]]}
+                    for row in created
+                ],
+                from_attributes=True,
+            )
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to create lots in batch: {str(e)}")
 
+    # Core inserts bypass the ORM flush which tracks tenant writes
+    for orga_uuid in orga_uuids:
+        mark_tenant_write(orga_uuid)
+    return lots
+
+
+async def check_lots_target(
+    orga_uuid: UUID,
+    sale_id: int | None = None,
+    inventory_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+) -> None:
+    """
+    Check that the sale and the inventory lots are added to belong to the
+    organisation.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        sale_id (int | None): The ID of the sale, if any.
+        inventory_uuid (UUID | None): The ID of the inventory, if any.
 
-async def get_lot_by_id(lot_id: int) -> LotRead:
+    Raises:
+        NotFoundError: If the sale or the inventory is not one of the organisation.
+    """
+    async with get_async_db_session(session) as session:
+        for key, value in ((Sale.id, sale_id), (Inventory.uuid, inventory_uuid)):
+            if value is None:
+                continue
+            statement = select(key).where(
+                key == value, key.class_.orga_uuid == orga_uuid
+            )
+            if (await session.exec(statement)).first() is None:
+                raise NotFoundError(
+                    f"{key.class_.__name__} {value} not found in organisation"
+                )
+
+
+# Columns of a lot referencing a record which must be of its organisation
+LOT_REFERENCES = {"seller_id": Seller.id, "sale_id": Sale.id, "buyer_id": Client.id}
+
+
+async def get_foreign_lot_references(
+    orga_uuid: UUID,
+    lots: Iterable[Any],
+    attributes: Iterable[str] = tuple(LOT_REFERENCES),
+    session: AsyncSession | None = None,
+) -> dict[str, set[int]]:
+    """
+    Find the sellers, sales and buyers referenced by `lots` which are not
+    records of the organisation, with one query per kind of record whatever
+    the number of lots.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        lots (Iterable): Lots, or rows, with `seller_id`, `sale_id` and `buyer_id` attributes.
+        attributes (Iterable[str]): The columns to check, of `LOT_REFERENCES`.
+
+    Returns:
+        Dict[str, Set[int]]: The unknown or foreign ids, by column of the lot.
+    """
+    lots = list(lots)
+    foreign: dict[str, set[int]] = {}
+    async with get_async_db_session(session) as session:
+        for attribute in attributes:
+            key = LOT_REFERENCES[attribute]
+            ids = {getattr(lot, attribute, None) for lot in lots} - {None}
+            if not ids:
+                continue
+            statement = select(key).where(
+                key.in_(ids), key.class_.orga_uuid == orga_uuid
+            )
+            ids -= set((await session.exec(statement)).all())
+            if ids:
+                foreign[attribute] = ids
+    return foreign
+
+
+async def check_lots_references(
+    orga_uuid: UUID, lots: Iterable[Any], session: AsyncSession | None = None
+) -> None:
+    """
+    Check that the sellers, sales and buyers referenced by `lots` belong to
+    the organisation.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        lots (Iterable): Lots with `seller_id`, `sale_id` and `buyer_id` attributes.
+
+    Raises:
+        NotFoundError: If a referenced record is not one of the organisation.
+    """
+    foreign = await get_foreign_lot_references(orga_uuid, lots, session=session)
+    if foreign:
+        details = ", ".join(
+            f"{attribute} {sorted(ids)}" for attribute, ids in foreign.items()
+        )
+        raise NotFoundError(f"Not found in organisation: {details}")
+
+
+async def get_lot_by_id(
+    lot_id: int,
+    fields: tuple[str, ...] | None = None,
+    orga_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+) -> LotRead | BaseModel:
     """
     Retrieve a lot by its ID.
 
     Args:
 
         lot_id (int): The ID of the lot to retrieve.
+        fields (tuple[str, ...] | None): Only select these columns, see `parse_fields`.
+        orga_uuid (UUID | None): The organisation the lot must belong to, if any.
 
     Returns:
-        LotRead: The retrieved lot data.
+        LotRead | BaseModel: The retrieved lot data, trimmed to `fields` if given.
 
     Raises:
         HTTPException: If the lot is not found or if the user is not authorized.
     """
-    with get_db_session() as session:
-        lot = session.get(Lot, lot_id)
-        if not lot:
+    async with get_async_db_session(session) as session:
+        if fields:
+            statement = select(*(getattr(Lot, name) for name in fields)).where(
+                Lot.id == lot_id
+            )
+            if orga_uuid is not None:
+                statement = statement.where(Lot.orga_uuid == orga_uuid)
+            row = (await session.exec(statement)).first()
+            if not row:
+                raise LotNotFoundError(f"Lot with id {lot_id} not found")
+            return trimmed_model(LotRead, fields).model_validate(row._mapping)
+
+        lot = await session.get(Lot, lot_id, options=LOT_READ_LOADING)
+        if not lot or orga_uuid not in (None, lot.orga_uuid):
             raise LotNotFoundError(f"Lot with id {lot_id} not found")
         return LotRead.model_validate(lot)
 
 
-async def update_lot(lot_update: LotUpdate) -> LotRead:
+async def update_lot(
+    lot_id: int,
+    lot_update: LotUpdate,
+    orga_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+) -> LotRead:
     """
-    Update an existing lot in the database.
+    Update an existing lot in the database. A lot stays in its organisation.
 
     Args:
 
         lot_id (int): The ID of the lot to update.
-        lot_update (LotUpdate): The updated lot data.
+        lot_update (LotUpdate): The updated lot data, only the fields set are applied.
+        orga_uuid (UUID | None): The organisation the lot must belong to, if any.
 
     Returns:
         LotRead: The updated lot data.
 
     Raises:
-        HTTPException: If the lot is not found or if the user is not authorized.
+        LotNotFoundError: If the lot is not found in the organisation.
+        DatabaseOperationError: If an error occurs during the update operation.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
+        lot = await session.get(Lot, lot_id, options=LOT_READ_LOADING)
+        if not lot or orga_uuid not in (None, lot.orga_uuid):
+            raise LotNotFoundError(f"Lot with id {lot_id} not found")
+
         try:
-            lot_data = lot_update.model_dump(exclude_unset=True)
+            lot_data = lot_update.model_dump(exclude_unset=True, exclude={"orga_uuid"})
             for key, value in lot_data.items():
-                setattr(lot_update, key, value)
-            session.add(lot_update)
-            session.commit()
-            session.refresh(lot_update)
-            return LotRead.model_validate(lot_update)
+                setattr(lot, key, value)
+            lot.updated_at = lot_update.updated_at
+            await session.flush()
+            return LotRead.model_validate(lot)
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to update lot: {str(e)}")
 
 
-async def delete_lot(lot_id: int) -> LotRead:
+async def delete_lot(
+    lot_id: int, orga_uuid: UUID | None = None, session: AsyncSession | None = None
+) -> LotRead:
     """
     Delete a lot from the database.
 
     Args:
 
         lot_id (int): The ID of the lot to delete.
+        orga_uuid (UUID | None): The organisation the lot must belong to, if any.
 
     Returns:
         LotRead: The deleted lot data.
@@ -122,32 +383,421 @@ async def delete_lot(lot_id: int) -> LotRead:
     Raises:
         HTTPException: If the lot is not found or if the user is not authorized.
     """
-    with get_db_session() as session:
-        lot = session.get(Lot, lot_id)
-        if not lot:
+    async with get_async_db_session(session) as session:
+        lot = await session.get(Lot, lot_id, options=LOT_READ_LOADING)
+        if not lot or orga_uuid not in (None, lot.orga_uuid):
             raise LotNotFoundError(f"Lot with id {lot_id} not found")
 
         try:
             deleted_lot = LotRead.model_validate(lot)
-            session.delete(lot)
-            session.commit()
+            await session.delete(lot)
+            await session.flush()
             return deleted_lot
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to delete lot: {str(e)}")
 
 
+async def _included_records(
+    session: AsyncSession, items: list, orga_uuid: UUID
+) -> LotIncluded:
+    """
+    Load the organisations, sales and sellers referenced by `items`, with one
+    query per kind of record whatever the number of lots. Only the records of
+    `orga_uuid` are included: a lot referencing another organisation's
+    record must not disclose it.
+    """
+    included: dict[str, dict] = {}
+    for name, attribute, key, scope in (
+        ("organisations", "orga_uuid", Organisation.uuid, Organisation.uuid),
+        ("sales", "sale_id", Sale.id, Sale.orga_uuid),
+        ("sellers", "seller_id", Seller.id, Seller.orga_uuid),
+    ):
+        keys = {getattr(item, attribute, None) for item in items} - {None}
+        if not keys:
+            continue
+        statement = (
+            select(key.class_)
+            .where(key.in_(keys), scope == orga_uuid)
+            .options(*load_policy())
+        )
+        included[name] = {
+            getattr(record, key.key): record
+            for record in (await session.exec(statement)).all()
+        }
+    return LotIncluded.model_validate(included, from_attributes=True)
+
+
+def lot_text_search(
+    statement: Select, query: str, dialect: str, ranked: bool = True
+) -> Select:
+    """
+    Restrict a select over `Lot` to the lots whose name, description or
+    category contain every word of `query` (or a word starting with it),
+    best matches first unless `ranked` is False.
+
+    Uses the full-text index: the FTS5 table on SQLite, the French
+    `search_vector` on Postgres. Other words than letters and digits are
+    ignored, so the query cannot inject search operators.
+    """
+    words = _WORD.findall(query.lower())
+    if not words:
+        return statement.where(false())
+    if dialect == "postgresql":
+        search_vector = literal_column("lot.search_vector")
+        ts_query = func.to_tsquery("french", " & ".join(f"{w}:*" for w in words))
+        statement = statement.where(search_vector.op("@@")(ts_query))
+        rank = func.ts_rank(search_vector, ts_query).desc()
+    else:
+        match = " ".join(f'"{word}"*' for word in words)
+        statement = statement.join(_LOT_FTS, _LOT_FTS.c.rowid == Lot.id).where(
+            text("lot_fts MATCH :lot_fts_query").bindparams(lot_fts_query=match)
+        )
+        rank = text(f"bm25(lot_fts, {_LOT_FTS_WEIGHTS})")
+    return statement.order_by(rank, Lot.id) if ranked else statement
+
+
+async def search_lots(
+    orga_uuid: UUID,
+    query: str,
+    inventory_uuid: UUID | None = None,
+    sale_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+    session: AsyncSession | None = None,
+) -> LotListPage:
+    """
+    Full-text search of the lots of an organisation, ranked by relevance.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        query (str): The words to look for in the name, description and category of the lots.
+        inventory_uuid (UUID | None): Only search the lots of this inventory.
+        sale_id (int | None): Only search the lots of this sale.
+        cursor (str | None): The `next_cursor` of the previous page, None for the first page.
+        limit (int): The maximum number of lots to return.
+
+    Returns:
+        LotListPage: The matching lots, best first, the records they reference and the cursor of the next page.
+
+    Raises:
+        PaginationError: If the cursor is invalid.
+        DatabaseOperationError: If an error occurs during the search.
+    """
+    statement = select(Lot).options(*LOT_LIST_LOADING).where(Lot.orga_uuid == orga_uuid)
+    if inventory_uuid is not None:
+        statement = statement.where(Lot.inventory_uuid == inventory_uuid)
+    if sale_id is not None:
+        statement = statement.where(Lot.sale_id == sale_id)
+    async with get_async_db_session(
+        session, read_only=True, orga_uuid=orga_uuid
+    ) as session:
+        statement = LOT_SEARCH_PAGINATION.apply(
+            lot_text_search(statement, query, session.bind.dialect.name),
+            cursor,
+            limit,
+        )
+        try:
+            lots = (await session.exec(statement)).all()
+            page = LOT_SEARCH_PAGINATION.page(
+                lots,
+                cursor,
+                limit,
+                LotListItem,
+                page_model=LotListPage[LotListItem],
+            )
+            page.included = await _included_records(session, page.items, orga_uuid)
+            return page
+        except Exception as e:
+            raise DatabaseOperationError(f"Failed to search lots: {str(e)}")
+
+
 async def get_lots_of_organisation(
-    orga_uuid: UUID, skip: int = 0, limit: int = 100
-) -> list[LotRead]:
-    with get_db_session() as session:
+    orga_uuid: UUID,
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str = "id",
+    descending: bool = False,
+    fields: tuple[str, ...] | None = None,
+    session: AsyncSession | None = None,
+) -> LotListPage:
+    """
+    Retrieve a page of lots of an organisation.
+
+    Lots only carry the keys of their organisation, sale and seller; these
+    records are returned once in `included`.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        cursor (str | None): The `next_cursor` of the previous page, None for the first page.
+        limit (int): The maximum number of lots to return.
+        sort_by (str): The field to sort by, one of `LOT_PAGINATION.sort_fields`.
+        descending (bool): Whether to sort in descending order.
+        fields (tuple[str, ...] | None): Only select these columns, see `parse_fields`.
+
+    Returns:
+        LotListPage: The retrieved lots, trimmed to `fields` if given, the records they reference and the cursor of the next page.
+
+    Raises:
+        PaginationError: If the cursor or the sort field is invalid.
+        DatabaseOperationError: If an error occurs during the retrieval operation.
+    """
+    if fields:
+        # The sort field is needed to build the next cursor, even if not requested
+        columns = dict.fromkeys((*fields, sort_by))
+        statement = select(*(getattr(Lot, name) for name in columns))
+        item_model = trimmed_model(LotListItem, fields)
+    else:
+        statement = select(Lot).options(*LOT_LIST_LOADING)
+        item_model = LotListItem
+
+    statement = LOT_PAGINATION.apply(
+        statement.where(Lot.orga_uuid == orga_uuid),
+        sort_by,
+        descending,
+        cursor,
+        limit,
+    )
+    async with get_async_db_session(session) as session:
         try:
-            statement = (
-                select(Lot).where(Lot.orga_uuid == orga_uuid).offset(skip).limit(limit)
+            lots = (await session.exec(statement)).all()
+            page = LOT_PAGINATION.page(
+                lots,
+                sort_by,
+                descending,
+                limit,
+                item_model,
+                page_model=LotListPage[item_model],
             )
-            results = session.exec(statement)
-            return [LotRead.model_validate(lot) for lot, _ in results]
+            page.included = await _included_records(session, page.items, orga_uuid)
+            return page
         except Exception as e:
             raise DatabaseOperationError(
                 f"Failed to get lots of organisation: {str(e)}"
             )
+
+
+async def _stream_rows(
+    statement: Select, orga_uuid: UUID, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Rows of `statement`, read through a server-side cursor (`yield_per`) on a
+    session of their own, which stays open while the caller iterates: only
+    one batch is held in memory whatever the size of the result.
+    """
+    statement = statement.execution_options(yield_per=batch_size)
+    async with get_async_db_session(read_only=True, orga_uuid=orga_uuid) as session:
+        try:
+            result = await session.stream(statement)
+            async for rows in result.partitions():
+                yield rows
+        except Exception as e:
+            raise DatabaseOperationError(f"Failed to export lots: {str(e)}")
+
+
+async def stream_lots_of_organisation(
+    orga_uuid: UUID, batch_size: int = LOTS_EXPORT_BATCH_SIZE
+) -> AsyncIterator[list[LotListItem]]:
+    """
+    Stream all the lots of an organisation, in id order, `batch_size` at a
+    time, holding a single batch in memory.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        batch_size (int): Number of lots fetched and yielded at a time.
+
+    Yields:
+        List[LotListItem]: The next batch of lots.
+
+    Raises:
+        DatabaseOperationError: If an error occurs while reading the lots.
+    """
+    columns = [getattr(Lot, name) for name in LotListItem.model_fields]
+    statement = select(*columns).where(Lot.orga_uuid == orga_uuid).order_by(Lot.id)
+    batch_adapter = type_adapter(list[LotListItem])
+    async for rows in _stream_rows(statement, orga_uuid, batch_size):
+        yield batch_adapter.validate_python(rows, from_attributes=True)
+
+
+async def stream_lots_of_sale(
+    orga_uuid: UUID, sale_id: int, batch_size: int = LOTS_EXPORT_BATCH_SIZE
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream the lots of a sale with the name of their buyer, in id order,
+    `batch_size` at a time, holding a single batch in memory.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation of the sale.
+        sale_id (int): The ID of the sale.
+        batch_size (int): Number of lots fetched and yielded at a time.
+
+    Yields:
+        List[Row]: The next batch of rows: the lot columns, `buyer_first_name`, `buyer_last_name` and `buyer_company`.
+
+    Raises:
+        DatabaseOperationError: If an error occurs while reading the lots.
+    """
+    statement = (
+        select(
+            *Lot.__table__.columns,  # type: ignore[attr-defined]
+            Client.first_name.label("buyer_first_name"),
+            Client.last_name.label("buyer_last_name"),
+            Client.company.label("buyer_company"),
+        )
+        # A buyer of another organisation is not disclosed
+        .outerjoin(
+            Client, (Client.id == Lot.buyer_id) & (Client.orga_uuid == orga_uuid)
+        )
+        .where(Lot.orga_uuid == orga_uuid, Lot.sale_id == sale_id)
+        .order_by(Lot.id)
+    )
+    async for rows in _stream_rows(statement, orga_uuid, batch_size):
+        yield rows
+
+
+def _facet_keys(
+    orga_uuids: Iterable[UUID],
+    inventory_uuids: Iterable[UUID | None],
+    sale_ids: Iterable[int | None],
+) -> set[tuple[UUID, str, Hashable]]:
+    """Cache keys of the facets counting a lot with any of these values."""
+    orga_uuids = list(orga_uuids)
+    return {
+        (orga_uuid, scope, value)
+        for scope, values in (("inventory", inventory_uuids), ("sale", sale_ids))
+        for value in values
+        if value is not None
+        for orga_uuid in orga_uuids
+    }
+
+
+def track_lot_facet_changes(
+    session: ORMSession, keys: Iterable[tuple[UUID, str, Hashable]]
+) -> None:
+    """
+    Invalidate the cached facets of `keys` once `session` commits. ORM
+    flushes of lots are tracked automatically; Core statements must call this.
+    """
+    session.info.setdefault("lot_facet_keys", set()).update(keys)
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _collect_lot_facet_changes(session: ORMSession, flush_context: Any) -> None:
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Lot):
+            attrs = inspect(obj).attrs
+            # Previous values too: a lot moved to another sale changes both.
+            # History never loads anything, unlike reading the attributes
+            track_lot_facet_changes(
+                session,
+                _facet_keys(
+                    attrs.orga_uuid.history.sum(),
+                    attrs.inventory_uuid.history.sum(),
+                    attrs.sale_id.history.sum(),
+                ),
+            )
+
+
+@event.listens_for(ORMSession, "after_commit")
+def _invalidate_lot_facets(session: ORMSession) -> None:
+    for key in session.info.pop("lot_facet_keys", ()):
+        LOT_FACETS_CACHE.invalidate(key)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _forget_lot_facet_changes(session: ORMSession) -> None:
+    session.info.pop("lot_facet_keys", None)
+
+
+def _estimate_bucket() -> Any:
+    """Label of the `ESTIMATE_BUCKETS` interval of the low estimate of a lot."""
+    # Labels are inlined: as bound parameters, Postgres could not tell that
+    # the CASE of the select list is the one of the GROUP BY
+    return case(
+        (Lot.low_estimate.is_(None), None),
+        *(
+            (Lot.low_estimate < upper, literal_column(f"'{lower}-{upper}'", String))
+            for lower, upper in pairwise(ESTIMATE_BUCKETS)
+        ),
+        else_=literal_column(f"'{ESTIMATE_BUCKETS[-1]}+'", String),
+    )
+
+
+async def get_lot_facets(
+    orga_uuid: UUID,
+    inventory_uuid: UUID | None = None,
+    sale_id: int | None = None,
+    session: AsyncSession | None = None,
+) -> LotFacets:
+    """
+    Count the lots of an inventory or of a sale per category, per estimate
+    bucket and per seller.
+
+    The three counts are computed by the database in a single `UNION ALL`
+    of `GROUP BY` queries and cached until a lot of the inventory or sale
+    changes (or for `LOT_FACETS_CACHE_SECONDS`, for changes made by another
+    worker).
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        inventory_uuid (UUID | None): The ID of the inventory.
+        sale_id (int | None): The ID of the sale.
+
+    Returns:
+        LotFacets: The counts, most frequent values first.
+
+    Raises:
+        ValueError: If not exactly one of `inventory_uuid` and `sale_id` is given.
+        DatabaseOperationError: If an error occurs while counting the lots.
+    """
+    if (inventory_uuid is None) == (sale_id is None):
+        raise ValueError("Facets are counted for either an inventory or a sale")
+    if inventory_uuid is not None:
+        key: tuple[UUID, str, Hashable] = (orga_uuid, "inventory", inventory_uuid)
+        scope = Lot.inventory_uuid == inventory_uuid
+    else:
+        key = (orga_uuid, "sale", sale_id)
+        scope = Lot.sale_id == sale_id
+    cached = LOT_FACETS_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    facets = {
+        "categories": Lot.category,
+        "estimates": _estimate_bucket(),
+        "sellers": cast(Lot.seller_id, String),
+    }
+    statement = union_all(
+        *(
+            select(
+                literal_column(f"'{name}'", String).label("facet"),
+                value.label("value"),
+                func.count().label("count"),
+            )
+            .where(Lot.orga_uuid == orga_uuid, scope)
+            .group_by(literal_column("2"))  # the value, by position
+            for name, value in facets.items()
+        )
+    )
+    async with get_async_db_session(
+        session, read_only=True, orga_uuid=orga_uuid
+    ) as session:
+        try:
+            rows = (await session.exec(statement)).all()  # type: ignore[call-overload]
+        except Exception as e:
+            raise DatabaseOperationError(f"Failed to count lots: {str(e)}")
+
+    counts: dict[str, list[FacetCount]] = {name: [] for name in facets}
+    for row in sorted(rows, key=lambda row: (-row.count, row.value or "")):
+        counts[row.facet].append(FacetCount(value=row.value, count=row.count))
+    result = LotFacets(
+        # Every lot is in exactly one estimate bucket
+        total=sum(facet.count for facet in counts["estimates"]),
+        **counts,
+    )
+    LOT_FACETS_CACHE.set(key, result)
+    return result
@@ -1,10 +1,10 @@
 from typing import TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, Index, SQLModel, Relationship
 from datetime import datetime
 from uuid import UUID
+from app.organisations.models_organisations import Organisation
 
 if TYPE_CHECKING:
-    from app.organisations.models_organisations import Organisation
     from app.sales.models import Sale
     from app.clients.models import Client
     from app.invoices.models import Invoice
@@ -40,6 +40,17 @@ class LotBase(SQLModel):
 
 
 class Lot(LotBase, table=True):
+    # Tenant-scoped lookups, in the (filter, id) order used to paginate
+    __table_args__ = (
+        Index("ix_lot_orga_uuid_id", "orga_uuid", "id"),
+        Index("ix_lot_orga_uuid_created_at_id", "orga_uuid", "created_at", "id"),
+        Index("ix_lot_sale_id_id", "sale_id", "id"),
+        Index("ix_lot_seller_id_id", "seller_id", "id"),
+        Index("ix_lot_buyer_id_id", "buyer_id", "id"),
+        Index("ix_lot_invoice_id_id", "invoice_id", "id"),
+        Index("ix_lot_inventory_uuid_id", "inventory_uuid", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     seller_id: int | None = Field(default=None, foreign_key="seller.id")
     seller: "Seller" = Relationship(
@@ -58,11 +69,11 @@ class Lot(LotBase, table=True):
         back_populates="lots",
         sa_relationship_kwargs={
             "foreign_keys": "Lot.orga_uuid",
-            "lazy": "selectin",
         },
     )
     invoice_id: int | None = Field(default=None, foreign_key="invoice.id")
     invoice: "Invoice" = Relationship(back_populates="lots")
+    inventory_uuid: UUID | None = Field(default=None, foreign_key="inventory.uuid")
 
 
 class LotCreate(LotBase):
@@ -71,9 +82,43 @@ class LotCreate(LotBase):
     seller_id: int | None = None
     sale_id: int | None = None
     buyer_id: int | None = None
+    inventory_uuid: UUID | None = None
     orga_uuid: UUID
 
 
+class LotBatchItem(LotBase):
+    seller_id: int | None = None
+    sale_id: int | None = None
+    buyer_id: int | None = None
+
+
+class LotBatchCreate(SQLModel):
+    """Catalogue import: many lots of a single organisation."""
+
+    orga_uuid: UUID
+    lots: list[LotBatchItem]
+
+    def to_lots_create(self) -> list[LotCreate]:
+        return [
+            LotCreate(**lot.model_dump(), orga_uuid=self.orga_uuid) for lot in self.lots
+        ]
+
+
+class LotImportError(SQLModel):
+    """A spreadsheet line that was not imported, `line` as numbered in the file."""
+
+    line: int
+    field: str | None = None
+    message: str
+
+
+class LotImportReport(SQLModel):
+    imported: int
+    lot_ids: list[int]
+    errors: list[LotImportError]
+    ignored_columns: list[str]
+
+
 class LotRead(LotBase):
     id: int
     # seller: Optional["SellerRead"] = None
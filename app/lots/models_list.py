@@ -0,0 +1,62 @@
+from enum import Enum
+from typing import Generic, TypeVar
+from uuid import UUID
+from sqlmodel import SQLModel
+
+from app.core.pagination import Page
+from app.lots.models import LotBase
+from app.organisations.models_organisations import OrganisationRead
+from app.sales.models import SaleSummary
+from app.sellers.models import SellerRead
+
+T = TypeVar("T")
+
+
+class LotListItem(LotBase):
+    """A lot in a list: related records are referenced by key only."""
+
+    id: int
+    orga_uuid: UUID
+    seller_id: int | None = None
+    sale_id: int | None = None
+    buyer_id: int | None = None
+    inventory_uuid: UUID | None = None
+
+
+class LotIncluded(SQLModel):
+    """The records referenced by the lots of a page, each sent once."""
+
+    organisations: dict[UUID, OrganisationRead] = {}
+    sales: dict[int, SaleSummary] = {}
+    sellers: dict[int, SellerRead] = {}
+
+
+class LotListPage(Page[T], Generic[T]):
+    """
+    A page of `LotListItem` (or of its `fields` projection) and the records
+    its lots reference, so that an organisation shared by a whole catalogue
+    is serialised once instead of once per lot.
+    """
+
+    included: LotIncluded = LotIncluded()
+
+
+class LotExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class FacetCount(SQLModel):
+    """Number of lots with a value of a facet, None for the lots without."""
+
+    value: str | None = None
+    count: int
+
+
+class LotFacets(SQLModel):
+    """Counts of the lots of an inventory or a sale, to refine a search."""
+
+    total: int = 0
+    categories: list[FacetCount] = []
+    estimates: list[FacetCount] = []
+    sellers: list[FacetCount] = []
@@ -1,54 +1,262 @@
 from uuid import UUID
 from typing import List
-from fastapi import APIRouter, HTTPException, Query, Depends
-
-from app.lots.models import LotCreate, LotRead, LotUpdate
-from app.lots.utils import create, get, update, delete, get_lots_of_organization
-from app.auth.CRUD import verify_organization_access
+from fastapi import APIRouter, File, HTTPException, Query, Depends, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
+from app.lots.models import (
+    Lot,
+    LotBatchCreate,
+    LotCreate,
+    LotImportReport,
+    LotRead,
+    LotUpdate,
+)
+from app.lots.models_list import (
+    LotExportFormat,
+    LotFacets,
+    LotListItem,
+    LotListPage,
+)
+from app.lots.utils import (
+    create,
+    create_batch,
+    get,
+    update,
+    delete,
+    export_lots,
+    export_sale_xlsx,
+    get_lots_of_organization,
+    check_lots_target,
+    get_facets,
+    import_lots,
+    search,
+    EXPORT_MEDIA_TYPES,
+    XLSX_MEDIA_TYPE,
+)
+from app.auth.CRUD import VerifiedOrganization, verify_organization_access
+from app.core.config import settings
+from app.core.database import ReadSessionDep, SessionDep
+from app.core.exceptions import (
+    DatabaseOperationError,
+    FieldSelectionError,
+    LotNotFoundError,
+    NotFoundError,
+    SpreadsheetError,
+)
+from app.core.fieldsets import parse_fields
+from app.core.responses import FastJSONResponse
 
 router = APIRouter(dependencies=[Depends(verify_organization_access)])
 
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated lot columns to return, e.g. name,stock_number",
+)
+
+
+def parse_lot_fields(
+    fields: str | None, read_model: type[BaseModel] = LotRead
+) -> tuple[str, ...] | None:
+    try:
+        return parse_fields(fields, read_model, Lot)
+    except FieldSelectionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def check_scope(orga_uuid: UUID, scope: UUID) -> None:
+    """The organisation of a body must be the one the request is scoped to."""
+    if orga_uuid != scope:
+        raise HTTPException(
+            status_code=403, detail="User not authorized for this organization"
+        )
+
 
 @router.post("/new", response_model=LotRead)
-async def create_lot(lot_create: LotCreate):
+async def create_lot(
+    lot_create: LotCreate, scope: VerifiedOrganization, session: SessionDep
+):
+    check_scope(lot_create.orga_uuid, scope)
     try:
-        return await create(lot_data=lot_create)
+        return FastJSONResponse(await create(lot_data=lot_create, session=session))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{lot_id}", response_model=LotRead)
-async def get_lot(lot_id: int):
+@router.post("/batch", response_model=List[LotRead], status_code=201)
+async def create_lots_batch(
+    batch: LotBatchCreate, scope: VerifiedOrganization, session: SessionDep
+):
+    check_scope(batch.orga_uuid, scope)
     try:
-        return await get(lot_id)
+        lots = await create_batch(batch, session=session)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(lots, status_code=201)
+
+
+@router.post(
+    "/organization/{orga_uuid}/import",
+    response_model=LotImportReport,
+    status_code=201,
+)
+async def import_lots_of_organization(
+    orga_uuid: UUID,
+    session: SessionDep,
+    file: UploadFile = File(..., description="A .xlsx or .csv file, one lot per line"),
+    sale_id: int | None = Query(None),
+    inventory_uuid: UUID | None = Query(None),
+):
+    try:
+        report = await import_lots(
+            file.file,
+            file.filename or "",
+            orga_uuid,
+            sale_id=sale_id,
+            inventory_uuid=inventory_uuid,
+            session=session,
+        )
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except (SpreadsheetError, DatabaseOperationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(report, status_code=201)
+
+
+@router.get("/{lot_id}", response_model=LotRead)
+async def get_lot(
+    lot_id: int,
+    scope: VerifiedOrganization,
+    session: SessionDep,
+    fields: str | None = FIELDS_QUERY,
+):
+    projection = parse_lot_fields(fields)
+    try:
+        lot = await get(lot_id, fields=projection, orga_uuid=scope, session=session)
+    except LotNotFoundError:
         raise HTTPException(status_code=404, detail="Lot not found")
+    # A LotRead, or its projection on `fields`, serialised as is
+    return FastJSONResponse(lot)
 
 
-@router.get("/organization/{orga_uuid}", response_model=List[LotRead])
+@router.get("/organization/{orga_uuid}", response_model=LotListPage[LotListItem])
 async def list_lots(
-    orga_uuid: UUID, skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=100)
+    orga_uuid: UUID,
+    session: ReadSessionDep,
+    cursor: str | None = Query(None),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    sort_by: str = Query("id"),
+    descending: bool = Query(False),
+    fields: str | None = FIELDS_QUERY,
+):
+    projection = parse_lot_fields(fields, LotListItem)
+    try:
+        page = await get_lots_of_organization(
+            orga_uuid=orga_uuid,
+            cursor=cursor,
+            limit=limit,
+            sort_by=sort_by,
+            descending=descending,
+            fields=projection,
+            session=session,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(page)
+
+
+@router.get("/organization/{orga_uuid}/export")
+async def export_lots_of_organization(
+    orga_uuid: UUID, format: LotExportFormat = Query(LotExportFormat.NDJSON)
+):
+    # The export reads through its own session: the request's one is closed
+    # before the body is streamed
+    filename = f"lots-{orga_uuid}.{format.value}"
+    return StreamingResponse(
+        export_lots(orga_uuid, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/organization/{orga_uuid}/sale/{sale_id}/export")
+async def export_sale(orga_uuid: UUID, sale_id: int, session: SessionDep):
+    try:
+        await check_lots_target(orga_uuid, sale_id=sale_id, session=session)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return StreamingResponse(
+        export_sale_xlsx(orga_uuid, sale_id),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="sale-{sale_id}.xlsx"'},
+    )
+
+
+@router.get("/organization/{orga_uuid}/search", response_model=LotListPage[LotListItem])
+async def search_lots(
+    orga_uuid: UUID,
+    session: ReadSessionDep,
+    q: str = Query(..., min_length=1, description="Words to look for"),
+    inventory_uuid: UUID | None = Query(None),
+    sale_id: int | None = Query(None),
+    cursor: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=settings.MAX_PAGE_SIZE),
 ):
     try:
-        return await get_lots_of_organization(
-            orga_uuid=orga_uuid, skip=skip, limit=limit
+        page = await search(
+            orga_uuid,
+            q,
+            inventory_uuid=inventory_uuid,
+            sale_id=sale_id,
+            cursor=cursor,
+            limit=limit,
+            session=session,
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(page)
+
+
+@router.get("/organization/{orga_uuid}/facets", response_model=LotFacets)
+async def get_lot_facets(
+    orga_uuid: UUID,
+    session: ReadSessionDep,
+    inventory_uuid: UUID | None = Query(None),
+    sale_id: int | None = Query(None),
+):
+    try:
+        facets = await get_facets(
+            orga_uuid, inventory_uuid=inventory_uuid, sale_id=sale_id, session=session
+        )
+    except (ValueError, DatabaseOperationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(facets)
 
 
 @router.patch("/{lot_id}", response_model=LotRead)
-async def update_lot(lot_update: LotUpdate):
+async def update_lot(
+    lot_id: int,
+    lot_update: LotUpdate,
+    scope: VerifiedOrganization,
+    session: SessionDep,
+):
+    check_scope(lot_update.orga_uuid, scope)
     try:
-        return await update(lot_update)
+        lot = await update(lot_id, lot_update, orga_uuid=scope, session=session)
+        return FastJSONResponse(lot)
+    except LotNotFoundError:
+        raise HTTPException(status_code=404, detail="Lot not found")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/{lot_id}", response_model=LotRead)
-async def delete_lot(lot_id: int):
+async def delete_lot(lot_id: int, scope: VerifiedOrganization, session: SessionDep):
     try:
-        return await delete(lot_id)
+        return FastJSONResponse(await delete(lot_id, orga_uuid=scope, session=session))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
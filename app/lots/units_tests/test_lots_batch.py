@@ -0,0 +1,84 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.auth.CRUD import verify_organization_access
+from app.core.query_stats import track_queries
+from app.lots.CRUD import create_lots_batch
+from app.lots.models import LotCreate
+from app.main import app
+from app.organisations.CRUD import create_organisation
+from app.organisations.models_organisations import OrganisationCreate
+from app.sellers.CRUD import create_seller
+from app.sellers.models import SellerCreate
+
+
+def test_batch_is_inserted_in_chunks():
+    async def scenario():
+        org = await create_organisation(OrganisationCreate(name="Catalogue"))
+        lots_create = [
+            LotCreate(name=f"Lot {i}", orga_uuid=org.uuid) for i in range(250)
+        ]
+        with track_queries() as stats:
+            lots = await create_lots_batch(lots_create, chunk_size=100)
+        return org, lots, stats
+
+    org, lots, stats = asyncio.run(scenario())
+
+    assert [lot.name for lot in lots] == [f"Lot {i}" for i in range(250)]
+    assert len({lot.id for lot in lots}) == 250
+    assert all(lot.organisation.uuid == org.uuid for lot in lots)
+    inserts = [shape for shape in stats.shapes if shape.startswith("INSERT")]
+    # Three chunks, no per-lot refresh
+    assert sum(stats.shapes[shape] for shape in inserts) == 3
+    assert stats.count == 4
+
+
+def test_batch_endpoint():
+    org = asyncio.run(create_organisation(OrganisationCreate(name="Catalogue")))
+    app.dependency_overrides[verify_organization_access] = lambda: org.uuid
+    try:
+        response = TestClient(app).post(
+            "/api/v1/lots/batch",
+            json={
+                "orga_uuid": str(org.uuid),
+                "lots": [{"name": "Commode"}, {"name": "Pendule", "starting_bid": 80}],
+            },
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    lots = response.json()
+    assert [lot["name"] for lot in lots] == ["Commode", "Pendule"]
+    assert all(lot["orga_uuid"] == str(org.uuid) for lot in lots)
+    assert lots[1]["id"] == lots[0]["id"] + 1
+
+
+def test_batch_endpoint_rejects_records_of_other_organisations():
+    org = asyncio.run(create_organisation(OrganisationCreate(name="Catalogue")))
+    victim = asyncio.run(create_organisation(OrganisationCreate(name="Victim")))
+    seller = create_seller(SellerCreate(orga_uuid=victim.uuid))
+    app.dependency_overrides[verify_organization_access] = lambda: org.uuid
+    try:
+        client = TestClient(app)
+        foreign = client.post(
+            "/api/v1/lots/batch",
+            json={
+                "orga_uuid": str(org.uuid),
+                "lots": [
+                    {"name": "Commode"},
+                    {"name": "Pendule", "seller_id": seller.id},
+                ],
+            },
+        )
+        unknown = client.post(
+            "/api/v1/lots/batch",
+            json={"orga_uuid": str(org.uuid), "lots": [{"buyer_id": 10**9}]},
+        )
+        listed = client.get(f"/api/v1/lots/organization/{org.uuid}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert foreign.status_code == 404
+    assert f"seller_id [{seller.id}]" in foreign.json()["detail"]
+    assert unknown.status_code == 404
+    assert listed.json()["items"] == []
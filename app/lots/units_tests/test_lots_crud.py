@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from app.core.exceptions import LotNotFoundError
+from app.lots.models import LotCreate, LotRead
+from app.lots.CRUD import (
+    create_lot,
+    create_lots_batch,
+    get_lot_by_id,
+    delete_lot,
+    get_lots_of_organisation,
+)
+from app.organisations.CRUD import create_organisation
+from app.organisations.models_organisations import OrganisationCreate
+
+
+def test_lot_crud_scenario():
+    async def scenario():
+        org = await create_organisation(OrganisationCreate(name="Test Organisation"))
+
+        created = await create_lot(LotCreate(name="Test Lot", orga_uuid=org.uuid))
+        assert isinstance(created, LotRead)
+        assert created.organisation.uuid == org.uuid
+
+        fetched = await get_lot_by_id(created.id)
+        assert fetched.name == "Test Lot"
+
+        batch = await create_lots_batch(
+            [LotCreate(name=f"Lot {i}", orga_uuid=org.uuid) for i in range(3)]
+        )
+        assert [lot.name for lot in batch] == ["Lot 0", "Lot 1", "Lot 2"]
+
+        lots = (await get_lots_of_organisation(org.uuid)).items
+        assert len(lots) == 4
+
+        await delete_lot(created.id)
+        with pytest.raises(LotNotFoundError):
+            await get_lot_by_id(created.id)
+
+    asyncio.run(scenario())
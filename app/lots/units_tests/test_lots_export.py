@@ -0,0 +1,83 @@
+import asyncio
+import csv
+import io
+import json
+from fastapi.testclient import TestClient
+from app.auth.CRUD import verify_organization_access
+from app.lots.CRUD import create_lots_batch, stream_lots_of_organisation
+from app.lots.models import LotCreate
+from app.main import app
+from app.organisations.CRUD import create_organisation
+from app.organisations.models_organisations import OrganisationCreate
+
+
+def _seed(count: int):
+    async def scenario():
+        org = await create_organisation(OrganisationCreate(name="Export"))
+        lots = await create_lots_batch(
+            [
+                LotCreate(name=f"Lot {i}", low_estimate=i * 10, orga_uuid=org.uuid)
+                for i in range(count)
+            ]
+        )
+        return org, lots
+
+    return asyncio.run(scenario())
+
+
+def _export(orga_uuid, format):
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        return TestClient(app).get(
+            f"/api/v1/lots/organization/{orga_uuid}/export", params={"format": format}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_lots_are_streamed_in_batches():
+    org, lots = _seed(25)
+
+    async def scenario():
+        return [
+            [lot.id for lot in batch]
+            async for batch in stream_lots_of_organisation(org.uuid, batch_size=10)
+        ]
+
+    batches = asyncio.run(scenario())
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert sum(batches, []) == [lot.id for lot in lots]
+
+
+def test_ndjson_export():
+    org, lots = _seed(3)
+
+    response = _export(org.uuid, "ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert f"lots-{org.uuid}.ndjson" in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["id"], row["name"]) for row in rows] == [
+        (lot.id, lot.name) for lot in lots
+    ]
+    assert all(row["orga_uuid"] == str(org.uuid) for row in rows)
+    assert all("organisation" not in row for row in rows)
+
+
+def test_csv_export():
+    org, lots = _seed(3)
+    empty, _ = _seed(0)
+
+    response = _export(org.uuid, "csv")
+    no_lots = _export(empty.uuid, "csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Lot 0", "Lot 1", "Lot 2"]
+    assert rows[2]["low_estimate"] == "20.0"
+    assert rows[0]["description"] == ""
+    assert no_lots.text.splitlines() == [response.text.splitlines()[0]]
+    assert _export(org.uuid, "xml").status_code == 422
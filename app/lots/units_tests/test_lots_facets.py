@@ -0,0 +1,107 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.auth.CRUD import verify_organization_access
+from app.core.database import get_db_session
+from app.core.query_stats import track_queries
+from app.lots.CRUD import create_lots_batch, get_lot_facets
+from app.lots.models import Lot, LotCreate
+from app.main import app
+from app.organisations.models_organisations import Organisation
+from app.sales.models import Sale
+from app.sellers.models import Seller
+
+
+def _seed():
+    with get_db_session() as session:
+        org = Organisation(name="Facets")
+        session.add(org)
+        session.flush()
+        sale = Sale(orga_uuid=org.uuid, title="Vente d'automne")
+        seller = Seller(orga_uuid=org.uuid, last_name="Durand")
+        session.add_all([sale, seller])
+        session.flush()
+        lots = [
+            Lot(orga_uuid=org.uuid, sale_id=sale.id, category="Mobilier"),
+            Lot(
+                orga_uuid=org.uuid,
+                sale_id=sale.id,
+                category="Mobilier",
+                low_estimate=250,
+                seller_id=seller.id,
+            ),
+            Lot(
+                orga_uuid=org.uuid,
+                sale_id=sale.id,
+                category="Horlogerie",
+                low_estimate=12_000,
+                seller_id=seller.id,
+            ),
+            # Not in the sale
+            Lot(orga_uuid=org.uuid, category="Bijoux", low_estimate=50),
+        ]
+        session.add_all(lots)
+        session.commit()
+        return org.uuid, sale.id, seller.id, lots[0].id
+
+
+def _counts(facet):
+    return {count.value: count.count for count in facet}
+
+
+def test_facets_are_counted_in_one_query_and_cached():
+    orga_uuid, sale_id, seller_id, _ = _seed()
+
+    with track_queries() as stats:
+        facets = asyncio.run(get_lot_facets(orga_uuid, sale_id=sale_id))
+    assert stats.count == 1
+
+    assert facets.total == 3
+    assert [(c.value, c.count) for c in facets.categories] == [
+        ("Mobilier", 2),
+        ("Horlogerie", 1),
+    ]
+    assert _counts(facets.estimates) == {None: 1, "100-500": 1, "10000+": 1}
+    assert _counts(facets.sellers) == {None: 1, str(seller_id): 2}
+
+    with track_queries() as stats:
+        assert asyncio.run(get_lot_facets(orga_uuid, sale_id=sale_id)) == facets
+    assert stats.count == 0
+
+
+def test_facets_are_invalidated_when_lots_change():
+    orga_uuid, sale_id, _, lot_id = _seed()
+    asyncio.run(get_lot_facets(orga_uuid, sale_id=sale_id))
+
+    # ORM change: the lot leaves the sale
+    with get_db_session() as session:
+        session.get(Lot, lot_id).sale_id = None
+        session.commit()
+    assert asyncio.run(get_lot_facets(orga_uuid, sale_id=sale_id)).total == 2
+
+    # Core insert
+    asyncio.run(
+        create_lots_batch(
+            [LotCreate(orga_uuid=orga_uuid, sale_id=sale_id, category="Bijoux")]
+        )
+    )
+    facets = asyncio.run(get_lot_facets(orga_uuid, sale_id=sale_id))
+    assert facets.total == 3
+    assert _counts(facets.categories)["Bijoux"] == 1
+
+
+def test_facets_route_needs_an_inventory_or_a_sale():
+    orga_uuid, sale_id, _, _ = _seed()
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        client = TestClient(app)
+        response = client.get(
+            f"/api/v1/lots/organization/{orga_uuid}/facets", params={"sale_id": sale_id}
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == 3
+        assert (
+            client.get(f"/api/v1/lots/organization/{orga_uuid}/facets").status_code
+            == 400
+        )
+    finally:
+        app.dependency_overrides.pop(verify_organization_access, None)
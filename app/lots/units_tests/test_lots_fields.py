@@ -0,0 +1,71 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.auth.CRUD import verify_organization_access
+from app.core.query_stats import track_queries
+from app.lots.CRUD import create_lots_batch, get_lot_by_id, get_lots_of_organisation
+from app.lots.models import LotCreate
+from app.main import app
+from app.organisations.CRUD import create_organisation
+from app.organisations.models_organisations import OrganisationCreate
+
+
+def _seed():
+    async def scenario():
+        org = await create_organisation(OrganisationCreate(name="Grid view"))
+        lots = await create_lots_batch(
+            [
+                LotCreate(name=f"Lot {i}", stock_number=f"S{i}", orga_uuid=org.uuid)
+                for i in range(3)
+            ]
+        )
+        return org, lots
+
+    return asyncio.run(scenario())
+
+
+def test_only_requested_columns_are_selected():
+    org, lots = _seed()
+    fields = ("id", "name", "stock_number")
+
+    async def scenario():
+        with track_queries() as stats:
+            page = await get_lots_of_organisation(org.uuid, fields=fields)
+            lot = await get_lot_by_id(lots[0].id, fields=fields)
+        return page, lot, stats
+
+    page, lot, stats = asyncio.run(scenario())
+
+    assert [item.model_dump() for item in page.items] == [
+        {"id": lot.id, "name": lot.name, "stock_number": lot.stock_number}
+        for lot in lots
+    ]
+    assert lot.model_dump() == {"id": lots[0].id, "name": "Lot 0", "stock_number": "S0"}
+    assert stats.count == 2
+    assert not any("description" in shape for shape in stats.shapes)
+
+
+def test_fields_query_parameter():
+    org, lots = _seed()
+    client = TestClient(app)
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        response = client.get(
+            f"/api/v1/lots/organization/{org.uuid}",
+            params={"fields": "name,low_estimate", "sort_by": "created_at"},
+        )
+        invalid = client.get(
+            f"/api/v1/lots/organization/{org.uuid}", params={"fields": "name,secret"}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [
+            {"id": lot.id, "name": lot.name, "low_estimate": None} for lot in lots
+        ],
+        "next_cursor": None,
+        # No key was requested, so no record is referenced
+        "included": {"organisations": {}, "sales": {}, "sellers": {}},
+    }
+    assert invalid.status_code == 400
@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime
+import io
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+from app.auth.CRUD import verify_organization_access
+from app.core.database import get_db_session
+from app.inventories.CRUD import get_lots_of_inventory
+from app.inventories.models import Inventory, InventoryType
+from app.lots.models import Lot
+from app.lots.utils import import_lots
+from app.main import app
+from app.organisations.models_organisations import Organisation
+from app.sales.models import Sale
+from app.sellers.models import Seller
+from sqlmodel import select
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _seed():
+    with get_db_session() as session:
+        org = Organisation(name="Import")
+        session.add(org)
+        session.flush()
+        sale = Sale(orga_uuid=org.uuid, title="Vente de printemps")
+        inventory = Inventory(
+            orga_uuid=org.uuid,
+            title="Succession Dupont",
+            inventory_type=InventoryType.SUCCESSION,
+            inventory_date=datetime(2024, 3, 1),
+            location="Paris",
+        )
+        session.add_all([sale, inventory])
+        session.commit()
+        return org.uuid, sale.id, inventory.uuid
+
+
+def _workbook(rows: list[list]) -> bytes:
+    workbook = Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _upload(orga_uuid, content: bytes, filename: str, media_type: str, **params):
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        return TestClient(app).post(
+            f"/api/v1/lots/organization/{orga_uuid}/import",
+            files={"file": (filename, content, media_type)},
+            params=params,
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_excel_import_into_a_sale():
+    orga_uuid, sale_id, _ = _seed()
+    content = _workbook(
+        [
+            ["Name", "Starting bid", "Low estimate", "Notes"],
+            ["Commode", 100, 80, "Louis XV"],
+            ["Miroir", "not a price", 50, None],
+            [None, None, None, None],
+            ["Pendule", "250.5", None, None],
+        ]
+    )
+
+    response = _upload(orga_uuid, content, "catalogue.xlsx", XLSX, sale_id=sale_id)
+
+    assert response.status_code == 201
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["ignored_columns"] == ["notes"]
+    assert [(e["line"], e["field"]) for e in report["errors"]] == [(3, "starting_bid")]
+    with get_db_session() as session:
+        lots = session.exec(select(Lot).where(Lot.id.in_(report["lot_ids"]))).all()
+        assert [(lot.name, lot.starting_bid) for lot in lots] == [
+            ("Commode", 100.0),
+            ("Pendule", 250.5),
+        ]
+        assert {(lot.orga_uuid, lot.sale_id) for lot in lots} == {(orga_uuid, sale_id)}
+
+
+def test_csv_import_into_an_inventory_in_chunks():
+    orga_uuid, _, inventory_uuid = _seed()
+    lines = ["name,high_estimate"] + [f"Lot {i},{i * 10}" for i in range(7)]
+    lines[5] = "Lot 4,cinquante"
+
+    async def scenario():
+        report = await import_lots(
+            io.BytesIO("\n".join(lines).encode()),
+            "inventaire.csv",
+            orga_uuid,
+            inventory_uuid=inventory_uuid,
+            chunk_size=3,
+        )
+        return report, await get_lots_of_inventory(inventory_uuid)
+
+    report, lots = asyncio.run(scenario())
+
+    assert report.imported == 6
+    assert [(error.line, error.field) for error in report.errors] == [
+        (6, "high_estimate")
+    ]
+    assert sorted(lot.name for lot in lots) == [f"Lot {i}" for i in range(7) if i != 4]
+
+
+def test_invalid_imports_are_rejected():
+    orga_uuid, _, _ = _seed()
+    _, other_sale_id, _ = _seed()
+    content = _workbook([["name"], ["Commode"]])
+
+    assert (
+        _upload(orga_uuid, b"%PDF", "catalogue.pdf", "application/pdf").status_code
+        == 400
+    )
+    assert _upload(orga_uuid, b"not a zip", "catalogue.xlsx", XLSX).status_code == 400
+    assert _upload(orga_uuid, b"", "empty.csv", "text/csv").status_code == 400
+    # The sale of another organisation
+    response = _upload(orga_uuid, content, "c.xlsx", XLSX, sale_id=other_sale_id)
+    assert response.status_code == 404
+
+
+def test_lines_referencing_other_organisations_are_reported():
+    orga_uuid, _, _ = _seed()
+    with get_db_session() as session:
+        victim = Organisation(name="Victim")
+        session.add(victim)
+        session.flush()
+        mine = Seller(orga_uuid=orga_uuid, last_name="Mine")
+        theirs = Seller(orga_uuid=victim.uuid, last_name="Theirs")
+        session.add_all([mine, theirs])
+        session.commit()
+        mine_id, theirs_id = mine.id, theirs.id
+    content = _workbook(
+        [
+            ["name", "seller_id", "buyer_id"],
+            ["Commode", mine_id, None],
+            ["Pendule", theirs_id, None],
+            ["Miroir", None, 10**9],
+        ]
+    )
+
+    response = _upload(orga_uuid, content, "catalogue.xlsx", XLSX)
+
+    assert response.status_code == 201
+    report = response.json()
+    assert report["imported"] == 1
+    assert [(error["line"], error["field"]) for error in report["errors"]] == [
+        (3, "seller_id"),
+        (4, "buyer_id"),
+    ]
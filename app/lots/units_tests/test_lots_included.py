@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+from app.auth.CRUD import verify_organization_access
+from app.core.database import get_db_session
+from app.lots.models import Lot
+from app.main import app
+from app.organisations.models_organisations import Organisation
+from app.sales.models import Sale
+from app.sellers.models import Seller
+
+
+def test_referenced_records_are_sent_once():
+    with get_db_session() as session:
+        org = Organisation(name="Included", siren_number=123456789)
+        session.add(org)
+        session.flush()
+        sale = Sale(orga_uuid=org.uuid, title="Spring sale")
+        sellers = [Seller(orga_uuid=org.uuid, last_name=f"S{i}") for i in range(2)]
+        session.add_all([sale, *sellers])
+        session.flush()
+        session.add_all(
+            Lot(
+                name=f"Lot {i}",
+                orga_uuid=org.uuid,
+                sale_id=sale.id,
+                seller_id=sellers[i % 2].id,
+            )
+            for i in range(10)
+        )
+        session.commit()
+        orga_uuid, sale_id = str(org.uuid), sale.id
+        seller_ids = sorted(seller.id for seller in sellers)
+
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        response = TestClient(app).get(f"/api/v1/lots/organization/{orga_uuid}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["items"]) == 10
+    assert all("organisation" not in lot for lot in body["items"])
+    assert {lot["orga_uuid"] for lot in body["items"]} == {orga_uuid}
+    assert list(body["included"]["organisations"]) == [orga_uuid]
+    assert body["included"]["organisations"][orga_uuid]["siren_number"] == 123456789
+    assert list(body["included"]["sales"]) == [str(sale_id)]
+    assert body["included"]["sales"][str(sale_id)]["title"] == "Spring sale"
+    assert sorted(map(int, body["included"]["sellers"])) == seller_ids
+    assert response.headers["X-DB-Query-Count"] == "4"
+
+
+def test_records_of_other_organisations_are_not_included():
+    with get_db_session() as session:
+        org, victim = Organisation(name="Mine"), Organisation(name="Victim")
+        session.add_all([org, victim])
+        session.flush()
+        seller = Seller(orga_uuid=victim.uuid, last_name="Secret")
+        sale = Sale(orga_uuid=victim.uuid, title="Private sale")
+        session.add_all([seller, sale])
+        session.flush()
+        session.add(
+            Lot(name="Lot", orga_uuid=org.uuid, seller_id=seller.id, sale_id=sale.id)
+        )
+        session.commit()
+        orga_uuid = str(org.uuid)
+
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        response = TestClient(app).get(f"/api/v1/lots/organization/{orga_uuid}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    included = response.json()["included"]
+    assert list(included["organisations"]) == [orga_uuid]
+    assert not included.get("sellers")
+    assert not included.get("sales")
@@ -0,0 +1,111 @@
+import io
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+from app.auth.CRUD import verify_organization_access
+from app.clients.models import Client
+from app.core.database import get_db_session
+from app.lots.models import Lot
+from app.lots.utils import SALE_SHEET_COLUMNS
+from app.main import app
+from app.organisations.models_organisations import Organisation
+from app.sales.models import Sale
+
+
+def _seed():
+    with get_db_session() as session:
+        org = Organisation(name="Results")
+        session.add(org)
+        session.flush()
+        sale = Sale(orga_uuid=org.uuid, title="Vente de printemps")
+        buyers = [
+            Client(orga_uuid=org.uuid, first_name="Jeanne", last_name="Martin"),
+            Client(orga_uuid=org.uuid, company="Galerie du Nord"),
+        ]
+        session.add_all([sale, *buyers])
+        session.flush()
+        session.add_all(
+            [
+                Lot(
+                    orga_uuid=org.uuid,
+                    sale_id=sale.id,
+                    name="Commode",
+                    low_estimate=800,
+                    high_estimate=1200,
+                    hammer_price=1500,
+                    buyer_id=buyers[0].id,
+                    buyer_premium=25,
+                ),
+                Lot(
+                    orga_uuid=org.uuid,
+                    sale_id=sale.id,
+                    name="Pendule",
+                    hammer_price=300,
+                    buyer_id=buyers[1].id,
+                ),
+                Lot(orga_uuid=org.uuid, sale_id=sale.id, name="Miroir"),
+                # Another sale of the same organisation
+                Lot(orga_uuid=org.uuid, name="Tapis"),
+            ]
+        )
+        session.commit()
+        return org.uuid, sale.id
+
+
+def _export(orga_uuid, sale_id):
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        return TestClient(app).get(
+            f"/api/v1/lots/organization/{orga_uuid}/sale/{sale_id}/export"
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_sale_results_workbook():
+    orga_uuid, sale_id = _seed()
+
+    response = _export(orga_uuid, sale_id)
+
+    assert response.status_code == 200
+    assert f"sale-{sale_id}.xlsx" in response.headers["content-disposition"]
+    sheet = load_workbook(io.BytesIO(response.content)).active
+    header, *rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert header == SALE_SHEET_COLUMNS
+    lots = [dict(zip(header, row)) for row in rows]
+    assert [lot["name"] for lot in lots] == ["Commode", "Pendule", "Miroir"]
+    assert [lot["buyer"] for lot in lots] == [
+        "Jeanne Martin",
+        "Galerie du Nord",
+        None,
+    ]
+    assert (lots[0]["hammer_price"], lots[0]["buyer_premium"]) == (1500, 25)
+    assert lots[0]["low_estimate"] == 800
+
+
+def test_sale_of_another_organisation_is_not_exported():
+    orga_uuid, _ = _seed()
+    _, other_sale_id = _seed()
+
+    assert _export(orga_uuid, other_sale_id).status_code == 404
+
+
+def test_buyer_of_another_organisation_is_not_exported():
+    orga_uuid, sale_id = _seed()
+    with get_db_session() as session:
+        victim = Organisation(name="Victim")
+        session.add(victim)
+        session.flush()
+        buyer = Client(orga_uuid=victim.uuid, company="Secret collector")
+        session.add(buyer)
+        session.flush()
+        session.add(
+            Lot(orga_uuid=orga_uuid, sale_id=sale_id, name="Vase", buyer_id=buyer.id)
+        )
+        session.commit()
+
+    response = _export(orga_uuid, sale_id)
+
+    sheet = load_workbook(io.BytesIO(response.content)).active
+    header, *rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+    lots = {row[header.index("name")]: row for row in rows}
+    assert lots["Vase"][header.index("buyer")] is None
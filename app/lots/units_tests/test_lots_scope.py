@@ -0,0 +1,132 @@
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.auth.CRUD import create_access_token
+from app.auth.models import PublicAccessTokenPayload
+from app.core.database import get_db_session
+from app.core.exceptions import DatabaseOperationError
+from app.lots import routes
+from app.lots.models import Lot
+from app.main import app
+from app.organisations.models_organisations import Organisation
+from app.organisations.models_permissions import Role
+
+client = TestClient(app)
+
+
+def _seed():
+    with get_db_session() as session:
+        org, other = Organisation(name="Mine"), Organisation(name="Not mine")
+        session.add_all([org, other])
+        session.flush()
+        lots = [
+            Lot(orga_uuid=org.uuid, name="Commode"),
+            Lot(orga_uuid=other.uuid, name="Pendule"),
+        ]
+        session.add_all(lots)
+        session.commit()
+        token = create_access_token(
+            PublicAccessTokenPayload(
+                user_uuid=str(uuid4()),
+                orga_uuids=[str(org.uuid)],
+                role=Role.OWNER.value,
+            )
+        )
+        return org.uuid, other.uuid, [lot.id for lot in lots], token
+
+
+def _headers(token, orga_uuid=None):
+    headers = {"Authorization": f"Bearer {token}"}
+    if orga_uuid is not None:
+        headers["X-Organisation-UUID"] = str(orga_uuid)
+    return headers
+
+
+def test_scope_from_the_path():
+    orga_uuid, other_uuid, _, token = _seed()
+
+    response = client.get(
+        f"/api/v1/lots/organization/{orga_uuid}", headers=_headers(token)
+    )
+    assert response.status_code == 200
+    assert [lot["name"] for lot in response.json()["items"]] == ["Commode"]
+
+    forbidden = client.get(
+        f"/api/v1/lots/organization/{other_uuid}", headers=_headers(token)
+    )
+    assert forbidden.status_code == 403
+    mismatch = client.get(
+        f"/api/v1/lots/organization/{orga_uuid}",
+        headers=_headers(token, other_uuid),
+    )
+    assert mismatch.status_code == 400
+
+
+def test_scope_from_the_header():
+    orga_uuid, other_uuid, (mine, not_mine), token = _seed()
+
+    def status(lot_id, scope=None):
+        return client.get(
+            f"/api/v1/lots/{lot_id}", headers=_headers(token, scope)
+        ).status_code
+
+    assert status(mine) == 400
+    response = client.get(f"/api/v1/lots/{mine}", headers=_headers(token, orga_uuid))
+    assert response.status_code == 200
+    assert response.json()["name"] == "Commode"
+    # Another organisation's lot does not exist in this scope
+    assert status(not_mine, orga_uuid) == 404
+    assert status(not_mine, other_uuid) == 403
+
+    # Bodies must stay in the scope
+    batch = client.post(
+        "/api/v1/lots/batch",
+        json={"orga_uuid": str(other_uuid), "lots": [{"name": "Miroir"}]},
+        headers=_headers(token, orga_uuid),
+    )
+    assert batch.status_code == 403
+
+    deleted = client.delete(f"/api/v1/lots/{mine}", headers=_headers(token, orga_uuid))
+    assert deleted.status_code == 200
+
+
+def test_update_in_scope():
+    orga_uuid, other_uuid, (mine, not_mine), token = _seed()
+
+    response = client.patch(
+        f"/api/v1/lots/{mine}",
+        json={"orga_uuid": str(orga_uuid), "starting_bid": 120},
+        headers=_headers(token, orga_uuid),
+    )
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["starting_bid"]) == (
+        "Commode",
+        120,
+    )
+    lot = client.get(f"/api/v1/lots/{mine}", headers=_headers(token, orga_uuid))
+    assert lot.json()["starting_bid"] == 120
+
+
+def test_update_of_another_organisations_lot():
+    orga_uuid, other_uuid, (mine, not_mine), token = _seed()
+
+    response = client.patch(
+        f"/api/v1/lots/{not_mine}",
+        json={"orga_uuid": str(orga_uuid), "name": "Volée"},
+        headers=_headers(token, orga_uuid),
+    )
+    assert response.status_code == 404
+    with get_db_session() as session:
+        assert session.get(Lot, not_mine).name == "Pendule"
+
+
+def test_database_errors_are_not_reported_as_missing_lots(monkeypatch):
+    orga_uuid, _, (mine, _), token = _seed()
+
+    async def failing_get(*args, **kwargs):
+        raise DatabaseOperationError("Connection lost")
+
+    monkeypatch.setattr(routes, "get", failing_get)
+    response = TestClient(app, raise_server_exceptions=False).get(
+        f"/api/v1/lots/{mine}", headers=_headers(token, orga_uuid)
+    )
+    assert response.status_code == 500
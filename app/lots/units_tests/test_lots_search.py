@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime
+from fastapi.testclient import TestClient
+from app.auth.CRUD import verify_organization_access
+from app.core.database import get_db_session
+from app.inventories.CRUD import search_and_filter_lots
+from app.inventories.models import Inventory, InventoryType
+from app.lots.CRUD import search_lots
+from app.lots.models import Lot
+from app.main import app
+from app.organisations.models_organisations import Organisation
+
+
+def _seed():
+    with get_db_session() as session:
+        org, other = Organisation(name="Search"), Organisation(name="Other")
+        session.add_all([org, other])
+        session.flush()
+        inventory = Inventory(
+            orga_uuid=org.uuid,
+            title="Succession",
+            inventory_type=InventoryType.SUCCESSION,
+            inventory_date=datetime(2024, 3, 1),
+            location="Lyon",
+        )
+        session.add(inventory)
+        session.flush()
+        lots = [
+            Lot(
+                orga_uuid=org.uuid, name="Miroir", description="Au-dessus de la commode"
+            ),
+            Lot(
+                orga_uuid=org.uuid,
+                name="Commode Louis XV",
+                category="Mobilier",
+                inventory_uuid=inventory.uuid,
+            ),
+            Lot(orga_uuid=org.uuid, name="Pendule à l'Éléphant", category="Horlogerie"),
+            Lot(orga_uuid=other.uuid, name="Commode Empire"),
+        ]
+        session.add_all(lots)
+        session.commit()
+        return org.uuid, inventory.uuid, [lot.id for lot in lots]
+
+
+def _search(orga_uuid, query, **kwargs):
+    return asyncio.run(search_lots(orga_uuid, query, **kwargs))
+
+
+def test_search_is_ranked_and_scoped_to_the_organisation():
+    orga_uuid, _, (mirror, commode, clock, _) = _seed()
+
+    page = _search(orga_uuid, "commode")
+
+    # A match on the name ranks above one in the description
+    assert [lot.id for lot in page.items] == [commode, mirror]
+    assert list(page.included.organisations) == [orga_uuid]
+    # Accents and case are folded, word prefixes match
+    assert [lot.id for lot in _search(orga_uuid, "ELEPH pendule").items] == [clock]
+    assert [lot.id for lot in _search(orga_uuid, "horloger").items] == [clock]
+    assert _search(orga_uuid, "commode pendule").items == []
+
+
+def test_search_filters_and_pagination():
+    orga_uuid, inventory_uuid, (mirror, commode, _, _) = _seed()
+
+    in_inventory = _search(orga_uuid, "commode", inventory_uuid=inventory_uuid)
+    first = _search(orga_uuid, "commode", limit=1)
+    second = _search(orga_uuid, "commode", limit=1, cursor=first.next_cursor)
+
+    assert [lot.id for lot in in_inventory.items] == [commode]
+    assert [lot.id for lot in first.items + second.items] == [commode, mirror]
+    assert second.next_cursor is None
+
+
+def test_index_follows_updates_and_deletes():
+    orga_uuid, _, (mirror, commode, _, _) = _seed()
+    with get_db_session() as session:
+        session.get(Lot, commode).name = "Secrétaire"
+        session.delete(session.get(Lot, mirror))
+        session.commit()
+
+    assert _search(orga_uuid, "commode").items == []
+    assert [lot.id for lot in _search(orga_uuid, "secretaire").items] == [commode]
+
+
+def test_search_operators_are_not_interpreted():
+    orga_uuid, _, _ = _seed()
+
+    for query in ['"commode', "commode OR miroir", "NEAR(a b)", "*", "-"]:
+        _search(orga_uuid, query)
+
+    assert _search(orga_uuid, "*").items == []
+
+
+def test_inventory_search_uses_the_index():
+    _, inventory_uuid, (_, commode, _, _) = _seed()
+
+    page = asyncio.run(search_and_filter_lots(inventory_uuid, search_term="louis"))
+
+    assert [lot.id for lot in page.items] == [commode]
+
+
+def test_search_endpoint():
+    orga_uuid, _, (mirror, commode, _, _) = _seed()
+    app.dependency_overrides[verify_organization_access] = lambda: None
+    try:
+        client = TestClient(app)
+        response = client.get(
+            f"/api/v1/lots/organization/{orga_uuid}/search", params={"q": "commode"}
+        )
+        invalid = client.get(
+            f"/api/v1/lots/organization/{orga_uuid}/search",
+            params={"q": "commode", "cursor": "nope"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [lot["id"] for lot in response.json()["items"]] == [commode, mirror]
+    assert invalid.status_code == 400
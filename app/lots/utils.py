@@ -71,28 +71,451 @@ Archivage des Lots
 
 """
 
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+import csv
+import io
+from itertools import islice
+import tempfile
+from typing import Any, BinaryIO
 from uuid import UUID
-from app.lots.models import LotCreate, LotRead, LotUpdate
+from zipfile import BadZipFile
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+import pandas as pd
+from pydantic import BaseModel, ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.exceptions import SpreadsheetError
+from app.core.responses import type_adapter
+from app.lots.models import (
+    LotBase,
+    LotBatchCreate,
+    LotCreate,
+    LotImportError,
+    LotImportReport,
+    LotRead,
+    LotUpdate,
+)
+from app.lots.models_list import (
+    LotExportFormat,
+    LotFacets,
+    LotListItem,
+    LotListPage,
+)
 from app.lots import CRUD
 
-
-async def create(lot_data: LotCreate) -> LotRead:
-    return await CRUD.create_lot(lot_data)
+# Spreadsheet lines validated and inserted at a time
+IMPORT_CHUNK_SIZE = 1000
+# The sale, inventory and organisation come from the request, not the file
+IMPORT_COLUMNS = {*LotBase.model_fields, "seller_id", "buyer_id"}
+# Columns of the file referencing records which must be of the organisation
+IMPORT_REFERENCES = ("seller_id", "buyer_id")
+
+SpreadsheetChunk = list[tuple[int, dict[str, Any]]]
+
+EXPORT_MEDIA_TYPES = {
+    LotExportFormat.NDJSON: "application/x-ndjson",
+    LotExportFormat.CSV: "text/csv; charset=utf-8",
+}
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Bytes per chunk when streaming a generated workbook
+XLSX_STREAM_CHUNK_SIZE = 64 * 1024
+# Columns of a sale's sheet, named like the import columns so that a
+# catalogue can be exported, edited and imported again
+SALE_SHEET_COLUMNS = [
+    "id",
+    "stock_number",
+    "name",
+    "description",
+    "category",
+    "low_estimate",
+    "high_estimate",
+    "starting_bid",
+    "reserve_price",
+    "hammer_price",
+    "buyer",
+    "buyer_premium",
+    "seller_premium",
+    "tax_rate",
+    "hallmark_fees",
+    "expert_fees",
+    "restoration_fees",
+    "transport_fees",
+]
+
+
+async def create(lot_data: LotCreate, session: AsyncSession | None = None) -> LotRead:
+    await CRUD.check_lots_references(lot_data.orga_uuid, [lot_data], session=session)
+    return await CRUD.create_lot(lot_data, session=session)
+
+
+async def create_batch(
+    batch: LotBatchCreate, session: AsyncSession | None = None
+) -> list[LotRead]:
+    await CRUD.check_lots_references(batch.orga_uuid, batch.lots, session=session)
+    return await CRUD.create_lots_batch(batch.to_lots_create(), session=session)
 
 
-async def get(lot_id: int) -> LotRead:
-    return await CRUD.get_lot_by_id(lot_id)
+async def get(
+    lot_id: int,
+    fields: tuple[str, ...] | None = None,
+    orga_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+) -> LotRead | BaseModel:
+    return await CRUD.get_lot_by_id(
+        lot_id, fields=fields, orga_uuid=orga_uuid, session=session
+    )
 
 
-async def update(lot_update: LotUpdate) -> LotRead:
-    return await CRUD.update_lot(lot_update)
+async def update(
+    lot_id: int,
+    lot_update: LotUpdate,
+    orga_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+) -> LotRead:
+    return await CRUD.update_lot(
+        lot_id, lot_update, orga_uuid=orga_uuid, session=session
+    )
 
 
-async def delete(lot_id: int) -> LotRead:
-    return await CRUD.delete_lot(lot_id)
+async def delete(
+    lot_id: int, orga_uuid: UUID | None = None, session: AsyncSession | None = None
+) -> LotRead:
+    return await CRUD.delete_lot(lot_id, orga_uuid=orga_uuid, session=session)
 
 
 async def get_lots_of_organization(
-    orga_uuid: UUID, skip: int = 0, limit: int = 100
-) -> list[LotRead]:
-    return await CRUD.get_lots_of_organisation(orga_uuid, skip=skip, limit=limit)
+    orga_uuid: UUID,
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str = "id",
+    descending: bool = False,
+    fields: tuple[str, ...] | None = None,
+    session: AsyncSession | None = None,
+) -> LotListPage:
+    return await CRUD.get_lots_of_organisation(
+        orga_uuid,
+        cursor=cursor,
+        limit=limit,
+        sort_by=sort_by,
+        descending=descending,
+        fields=fields,
+        session=session,
+    )
+
+
+async def export_lots_ndjson(orga_uuid: UUID) -> AsyncIterator[bytes]:
+    """One JSON object per lot and per line, a chunk per batch of lots."""
+    serializer = type_adapter(LotListItem)
+    async for lots in CRUD.stream_lots_of_organisation(orga_uuid):
+        yield b"".join(serializer.dump_json(lot) + b"\n" for lot in lots)
+
+
+async def export_lots_csv(orga_uuid: UUID) -> AsyncIterator[str]:
+    """A header line then one line per lot, a chunk per batch of lots."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(LotListItem.model_fields))
+    writer.writeheader()
+    async for lots in CRUD.stream_lots_of_organisation(orga_uuid):
+        writer.writerows(lot.model_dump(mode="json") for lot in lots)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header of an organisation without lots
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_lots(orga_uuid: UUID, format: LotExportFormat) -> AsyncIterator:
+    if format is LotExportFormat.CSV:
+        return export_lots_csv(orga_uuid)
+    return export_lots_ndjson(orga_uuid)
+
+
+async def search(
+    orga_uuid: UUID,
+    query: str,
+    inventory_uuid: UUID | None = None,
+    sale_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+    session: AsyncSession | None = None,
+) -> LotListPage:
+    return await CRUD.search_lots(
+        orga_uuid,
+        query,
+        inventory_uuid=inventory_uuid,
+        sale_id=sale_id,
+        cursor=cursor,
+        limit=limit,
+        session=session,
+    )
+
+
+async def get_facets(
+    orga_uuid: UUID,
+    inventory_uuid: UUID | None = None,
+    sale_id: int | None = None,
+    session: AsyncSession | None = None,
+) -> LotFacets:
+    return await CRUD.get_lot_facets(
+        orga_uuid, inventory_uuid=inventory_uuid, sale_id=sale_id, session=session
+    )
+
+
+def _column_name(cell: Any) -> str:
+    return str(cell).strip().lower().replace(" ", "_") if cell is not None else ""
+
+
+def _xlsx_chunks(
+    workbook: Any, header: list[str], rows: Iterator[tuple], chunk_size: int
+) -> Iterator[SpreadsheetChunk]:
+    try:
+        lines = enumerate(rows, start=2)
+        while chunk := list(islice(lines, chunk_size)):
+            yield [
+                (line, dict(zip(header, values)))
+                for line, values in chunk
+                if any(value not in (None, "") for value in values)
+            ]
+    finally:
+        workbook.close()
+
+
+def _csv_chunks(file: BinaryIO, chunk_size: int) -> Iterator[SpreadsheetChunk]:
+    reader = pd.read_csv(
+        file,
+        chunksize=chunk_size,
+        dtype=str,
+        keep_default_na=False,
+        skip_blank_lines=False,
+        encoding="utf-8-sig",
+    )
+    try:
+        for frame in reader:
+            frame.columns = [_column_name(name) for name in frame.columns]
+            records = frame.to_dict("records")
+            # Line 1 is the header
+            first_line = int(frame.index[0]) + 2
+            yield [
+                (line, record)
+                for line, record in enumerate(records, start=first_line)
+                if any(record.values())
+            ]
+    except (ValueError, UnicodeDecodeError) as e:
+        raise SpreadsheetError(f"Unreadable CSV file: {e}")
+    finally:
+        reader.close()
+
+
+def read_spreadsheet(
+    file: BinaryIO, filename: str, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> tuple[list[str], Iterator[SpreadsheetChunk]]:
+    """
+    Open a .xlsx or .csv spreadsheet of lots, one lot per line after a header
+    line naming the columns.
+
+    Returns the header and an iterator of chunks of `chunk_size` lines, each
+    line as its number in the file and its cells by column. Rows are read as
+    the iterator advances: with openpyxl's read-only mode for workbooks, by
+    chunked pandas reads for CSV files.
+
+    Raises:
+        SpreadsheetError: If the file is not a readable spreadsheet.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension in ("xlsx", "xlsm"):
+        try:
+            workbook = load_workbook(file, read_only=True, data_only=True)
+        except (BadZipFile, InvalidFileException, KeyError) as e:
+            raise SpreadsheetError(f"Unreadable Excel file: {e}")
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_column_name(cell) for cell in next(rows, ())]
+        chunks = _xlsx_chunks(workbook, header, rows, chunk_size)
+    elif extension == "csv":
+        try:
+            columns = pd.read_csv(file, nrows=0, encoding="utf-8-sig").columns
+        except (ValueError, UnicodeDecodeError) as e:
+            raise SpreadsheetError(f"Unreadable CSV file: {e}")
+        file.seek(0)
+        header = [_column_name(name) for name in columns]
+        chunks = _csv_chunks(file, chunk_size)
+    else:
+        raise SpreadsheetError("Expected a .xlsx or .csv file")
+
+    if not any(header):
+        raise SpreadsheetError("The first line must name the columns")
+    return header, chunks
+
+
+def validate_lots(
+    chunk: SpreadsheetChunk, defaults: dict[str, Any]
+) -> tuple[list[tuple[int, LotCreate]], list[LotImportError]]:
+    """
+    Validate a chunk of spreadsheet lines as `LotCreate`, in one call.
+
+    Empty cells are left out so that fields take their default. Lines with
+    errors are reported and left out, the others are returned with their
+    line number.
+    """
+    lines = [line for line, _ in chunk]
+    rows = [
+        {
+            **{
+                column: value
+                for column, value in cells.items()
+                if column in IMPORT_COLUMNS and value not in (None, "")
+            },
+            **defaults,
+        }
+        for _, cells in chunk
+    ]
+    adapter = type_adapter(list[LotCreate])
+    try:
+        return list(zip(lines, adapter.validate_python(rows))), []
+    except ValidationError as e:
+        errors = []
+        for error in e.errors():
+            index, *location = error["loc"]
+            errors.append(
+                LotImportError(
+                    line=lines[int(index)],
+                    field=".".join(map(str, location)) or None,
+                    message=error["msg"],
+                )
+            )
+    failed_lines = {error.line for error in errors}
+    valid = [(line, row) for line, row in zip(lines, rows) if line not in failed_lines]
+    lots = adapter.validate_python([row for _, row in valid])
+    return [(line, lot) for (line, _), lot in zip(valid, lots)], errors
+
+
+async def reject_foreign_references(
+    orga_uuid: UUID,
+    lines: list[tuple[int, LotCreate]],
+    session: AsyncSession | None = None,
+) -> tuple[list[LotCreate], list[LotImportError]]:
+    """
+    Leave out and report the lines referencing a seller or a buyer which is
+    not one of the organisation, with one query per column for the chunk.
+    """
+    foreign = await CRUD.get_foreign_lot_references(
+        orga_uuid,
+        (lot for _, lot in lines),
+        attributes=IMPORT_REFERENCES,
+        session=session,
+    )
+    lots: list[LotCreate] = []
+    errors: list[LotImportError] = []
+    for line, lot in lines:
+        line_errors = [
+            LotImportError(
+                line=line,
+                field=attribute,
+                message=f"{getattr(lot, attribute)} not found in organisation",
+            )
+            for attribute, ids in foreign.items()
+            if getattr(lot, attribute) in ids
+        ]
+        if line_errors:
+            errors.extend(line_errors)
+        else:
+            lots.append(lot)
+    return lots, errors
+
+
+async def import_lots(
+    file: BinaryIO,
+    filename: str,
+    orga_uuid: UUID,
+    sale_id: int | None = None,
+    inventory_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> LotImportReport:
+    """
+    Create the lots of a spreadsheet, for a sale and/or an inventory of the
+    organisation.
+
+    The file is read, validated and inserted `chunk_size` lines at a time,
+    reading off the event loop. Invalid lines are reported in the result
+    without stopping the import of the others, as are the lines whose
+    seller or buyer is unknown or of another organisation.
+    """
+    await CRUD.check_lots_target(orga_uuid, sale_id, inventory_uuid, session=session)
+    header, chunks = await asyncio.to_thread(
+        read_spreadsheet, file, filename, chunk_size
+    )
+    defaults = {
+        "orga_uuid": orga_uuid,
+        "sale_id": sale_id,
+        "inventory_uuid": inventory_uuid,
+    }
+    lot_ids: list[int] = []
+    errors: list[LotImportError] = []
+    while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+        lines, chunk_errors = validate_lots(chunk, defaults)
+        lots, reference_errors = await reject_foreign_references(
+            orga_uuid, lines, session=session
+        )
+        errors.extend(
+            sorted(chunk_errors + reference_errors, key=lambda error: error.line)
+        )
+        if lots:
+            created = await CRUD.create_lots_batch(lots, session=session)
+            lot_ids.extend(lot.id for lot in created)
+    return LotImportReport(
+        imported=len(lot_ids),
+        lot_ids=lot_ids,
+        errors=errors,
+        ignored_columns=[
+            column for column in header if column and column not in IMPORT_COLUMNS
+        ],
+    )
+
+
+def _buyer_name(row: Any) -> str | None:
+    if row.buyer_company:
+        return row.buyer_company
+    name = " ".join(filter(None, (row.buyer_first_name, row.buyer_last_name)))
+    return name or None
+
+
+def _append_sale_rows(sheet: Any, rows: list) -> None:
+    for row in rows:
+        sheet.append(
+            [
+                _buyer_name(row) if column == "buyer" else getattr(row, column)
+                for column in SALE_SHEET_COLUMNS
+            ]
+        )
+
+
+async def export_sale_xlsx(orga_uuid: UUID, sale_id: int) -> AsyncIterator[bytes]:
+    """
+    The lots of a sale, with their estimates, result, buyer and fees, as an
+    Excel workbook.
+
+    Rows go from the database cursor to openpyxl's write-only worksheet one
+    batch at a time, so the sheet is never held in memory; the workbook is
+    then zipped into a temporary file streamed in chunks.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Lots")
+    sheet.append(SALE_SHEET_COLUMNS)
+    async for rows in CRUD.stream_lots_of_sale(orga_uuid, sale_id):
+        await asyncio.to_thread(_append_sale_rows, sheet, rows)
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(workbook.save, file)
+        file.seek(0)
+        while chunk := await asyncio.to_thread(file.read, XLSX_STREAM_CHUNK_SIZE):
+            yield chunk
+
+
+async def check_lots_target(
+    orga_uuid: UUID,
+    sale_id: int | None = None,
+    inventory_uuid: UUID | None = None,
+    session: AsyncSession | None = None,
+) -> None:
+    await CRUD.check_lots_target(orga_uuid, sale_id, inventory_uuid, session=session)
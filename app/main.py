@@ -1,13 +1,22 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import async_engine, engine
+from app.core.migrations import run_migrations
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.responses import FastJSONResponse
 from fastapi import APIRouter
 from app.users.routes import router as users_router
 from app.inventories.routes import router as inventories_router
 from app.lots.routes import router as lots_router
 from app.auth.routes import router as auth_router
+from app.clients.routes import router as clients_router
+from app.sellers.routes import router as sellers_router
+from app.internal.routes import router as internal_router
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -17,38 +26,61 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 """ if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True) """
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    # generate_unique_id_function=custom_generate_unique_id,
-)
-
-# Set all CORS enabled origins
-if settings.BACKEND_CORS_ORIGINS:
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[
-            str(origin).strip("/") for origin in settings.BACKEND_CORS_ORIGINS
-        ],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        # Blocking DDL: keep it off the event loop
+        await asyncio.to_thread(run_migrations, engine)
+    yield
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+        # generate_unique_id_function=custom_generate_unique_id,
     )
 
+    # Set all CORS enabled origins
+    if settings.BACKEND_CORS_ORIGINS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=[
+                str(origin).strip("/") for origin in settings.BACKEND_CORS_ORIGINS
+            ],
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
 
-@app.get("/")
-async def read_main():
-    return {"msg": "Hello World"}
+    app.add_middleware(QueryStatsMiddleware)
 
+    @app.get("/")
+    async def read_main():
+        return {"msg": "Hello World"}
+
+    api_router = APIRouter()
+    api_router.include_router(users_router, prefix="/users", tags=["users"])
+    api_router.include_router(lots_router, prefix="/lots", tags=["lots"])
+    api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
+    api_router.include_router(clients_router, prefix="/clients", tags=["clients"])
+    api_router.include_router(sellers_router, prefix="/sellers", tags=["sellers"])
+    api_router.include_router(
+        inventories_router, prefix="/inventories", tags=["inventories"]
+    )
+    app.include_router(api_router, prefix=settings.API_V1_STR)
+    # Operational endpoints, kept out of the public OpenAPI schema and
+    # behind INTERNAL_API_TOKEN
+    app.include_router(
+        internal_router, prefix="/internal", tags=["internal"], include_in_schema=False
+    )
 
-init_db()
+    return app
 
 
-api_router = APIRouter()
-api_router.include_router(users_router, prefix="/users", tags=["users"])
-api_router.include_router(lots_router, prefix="/lots", tags=["lots"])
-api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
-api_router.include_router(
-    inventories_router, prefix="/inventories", tags=["inventories"]
-)
-app.include_router(api_router, prefix=settings.API_V1_STR)
+app = create_app()
@@ -1,5 +1,6 @@
 from uuid import UUID
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.organisations.models_organisations import (
     Organisation,
     OrganisationCreate,
@@ -13,11 +14,12 @@ from app.core.exceptions import (
     UserNotFoundError,
 )
 from app.organisations.models_permissions import UserRole, UserOrganisationLink
-from app.core.database import get_db_session
+from app.core.database import get_async_db_session
 
 
 async def create_organisation(
     organisation_create: OrganisationCreate,
+    session: AsyncSession | None = None,
 ) -> OrganisationRead:
     """
     Create a new organisation in the database.
@@ -35,20 +37,21 @@ async def create_organisation(
     Raises:
         DatabaseOperationError: If an error occurs during organisation creation.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
             organisation = Organisation.model_validate(organisation_create)
             session.add(organisation)
-            session.commit()
-            session.refresh(organisation)
+            await session.flush()
+            await session.refresh(organisation)
             return OrganisationRead.model_validate(organisation)
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to create organisation: {str(e)}")
 
 
 async def update_organisation(
-    orga_uuid: UUID, organisation_update: OrganisationUpdate
+    orga_uuid: UUID,
+    organisation_update: OrganisationUpdate,
+    session: AsyncSession | None = None,
 ) -> OrganisationRead:
     """
     Update an existing organisation in the database.
@@ -65,9 +68,9 @@ async def update_organisation(
         OrganisationNotFoundError: If the organisation is not found.
         DatabaseOperationError: If an error occurs during the update operation.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
-            db_organisation = session.get(Organisation, orga_uuid)
+            db_organisation = await session.get(Organisation, orga_uuid)
             if not db_organisation:
                 raise OrganisationNotFoundError(
                     f"Organisation with id {orga_uuid} not found"
@@ -78,17 +81,18 @@ async def update_organisation(
                 setattr(db_organisation, key, value)
 
             session.add(db_organisation)
-            session.commit()
-            session.refresh(db_organisation)
+            await session.flush()
+            await session.refresh(db_organisation)
             return OrganisationRead.model_validate(db_organisation)
         except OrganisationNotFoundError:
             raise
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to update organisation: {str(e)}")
 
 
-async def get_organisation_by_id(orga_uuid: UUID) -> OrganisationRead:
+async def get_organisation_by_id(
+    orga_uuid: UUID, session: AsyncSession | None = None
+) -> OrganisationRead:
     """
     Retrieve an organisation by its ID.
 
@@ -102,8 +106,8 @@ async def get_organisation_by_id(orga_uuid: UUID) -> OrganisationRead:
     Raises:
         OrganisationNotFoundError: If the organisation is not found.
     """
-    with get_db_session() as session:
-        organisation = session.get(Organisation, orga_uuid)
+    async with get_async_db_session(session) as session:
+        organisation = await session.get(Organisation, orga_uuid)
         if not organisation:
             raise OrganisationNotFoundError(
                 f"Organisation with id {orga_uuid} not found"
@@ -111,7 +115,9 @@ async def get_organisation_by_id(orga_uuid: UUID) -> OrganisationRead:
         return OrganisationRead.model_validate(organisation)
 
 
-async def delete_organisation(orga_uuid: UUID) -> OrganisationRead:
+async def delete_organisation(
+    orga_uuid: UUID, session: AsyncSession | None = None
+) -> OrganisationRead:
     """
     Delete an organisation from the database.
 
@@ -126,25 +132,26 @@ async def delete_organisation(orga_uuid: UUID) -> OrganisationRead:
         OrganisationNotFoundError: If the organisation is not found.
         DatabaseOperationError: If an error occurs during the delete operation.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
-            organisation = session.get(Organisation, orga_uuid)
+            organisation = await session.get(Organisation, orga_uuid)
             if not organisation:
                 raise OrganisationNotFoundError(
                     f"Organisation with id {orga_uuid} not found"
                 )
 
-            session.delete(organisation)
-            session.commit()
+            await session.delete(organisation)
+            await session.flush()
             return OrganisationRead.model_validate(organisation)
         except OrganisationNotFoundError:
             raise
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to delete organisation: {str(e)}")
 
 
-async def get_members_from_organisation(orga_uuid: UUID) -> list[UserRead]:
+async def get_members_from_organisation(
+    orga_uuid: UUID, session: AsyncSession | None = None
+) -> list[UserRead]:
     """
     Retrieve all members of an organisation.
 
@@ -158,8 +165,8 @@ async def get_members_from_organisation(orga_uuid: UUID) -> list[UserRead]:
     Raises:
         OrganisationNotFoundError: If the organisation is not found.
     """
-    with get_db_session() as session:
-        organisation = session.get(Organisation, orga_uuid)
+    async with get_async_db_session(session) as session:
+        organisation = await session.get(Organisation, orga_uuid)
         if not organisation:
             raise OrganisationNotFoundError(
                 f"Organisation with id {orga_uuid} not found"
@@ -170,12 +177,15 @@ async def get_members_from_organisation(orga_uuid: UUID) -> list[UserRead]:
             .join(UserOrganisationLink)
             .where(UserOrganisationLink.orga_uuid == orga_uuid)
         )
-        results = session.exec(statement).all()
+        results = (await session.exec(statement)).all()
         return [UserRead.model_validate(user) for user, _ in results]
 
 
 async def add_member_to_organisation(
-    user_uuid: UUID, orga_uuid: UUID, role: UserRole
+    user_uuid: UUID,
+    orga_uuid: UUID,
+    role: UserRole,
+    session: AsyncSession | None = None,
 ) -> UserOrganisationLink:
     """
     Add a user as a member of an organisation.
@@ -194,13 +204,13 @@ async def add_member_to_organisation(
         OrganisationNotFoundError: If the organisation is not found.
         DatabaseOperationError: If an error occurs during the operation.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
-            user = session.get(User, user_uuid)
+            user = await session.get(User, user_uuid)
             if not user:
                 raise UserNotFoundError(f"User with id {user_uuid} not found")
 
-            organisation = session.get(Organisation, orga_uuid)
+            organisation = await session.get(Organisation, orga_uuid)
             if not organisation:
                 raise OrganisationNotFoundError(
                     f"Organisation with id {orga_uuid} not found"
@@ -210,7 +220,7 @@ async def add_member_to_organisation(
                 UserOrganisationLink.user_uuid == user_uuid,
                 UserOrganisationLink.orga_uuid == orga_uuid,
             )
-            existing_link = session.exec(statement).first()
+            existing_link = (await session.exec(statement)).first()
             if existing_link:
                 raise DatabaseOperationError(
                     "User is already a member of this organisation"
@@ -220,20 +230,21 @@ async def add_member_to_organisation(
                 user_uuid=user_uuid, orga_uuid=orga_uuid, role=role
             )
             session.add(user_org_link)
-            session.commit()
-            session.refresh(user_org_link)
+            await session.flush()
+            await session.refresh(user_org_link)
 
             return user_org_link
         except (UserNotFoundError, OrganisationNotFoundError):
             raise
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(
                 f"Failed to add member to organisation: {str(e)}"
             )
 
 
-async def remove_member_from_organisation(user_uuid: UUID, orga_uuid: UUID) -> None:
+async def remove_member_from_organisation(
+    user_uuid: UUID, orga_uuid: UUID, session: AsyncSession | None = None
+) -> None:
     """
     Remove a user from an organisation.
 
@@ -245,9 +256,11 @@ async def remove_member_from_organisation(user_uuid: UUID, orga_uuid: UUID) -> N
     Raises:
         DatabaseOperationError: If an error occurs during the operation or if trying to remove the owner.
     """
-    with get_db_session() as session:
+    async with get_async_db_session(session) as session:
         try:
-            user_org_link = session.get(UserOrganisationLink, (user_uuid, orga_uuid))
+            user_org_link = await session.get(
+                UserOrganisationLink, (user_uuid, orga_uuid)
+            )
             if not user_org_link:
                 raise DatabaseOperationError(
                     "User is not a member of this organisation"
@@ -258,10 +271,9 @@ async def remove_member_from_organisation(user_uuid: UUID, orga_uuid: UUID) -> N
                     "Cannot remove the owner of the organisation"
                 )
 
-            session.delete(user_org_link)
-            session.commit()
+            await session.delete(user_org_link)
+            await session.flush()
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(
                 f"Failed to remove member from organisation: {str(e)}"
             )
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from enum import Enum
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 from datetime import datetime
 from uuid import uuid4, UUID
 from sqlmodel import Relationship
@@ -48,6 +48,8 @@ class UserRole(str, Enum):
 
 
 class UserOrganisationLink(SQLModel, table=True):
+    __table_args__ = (Index("ix_userorganisationlink_orga_uuid", "orga_uuid"),)
+
     user_uuid: UUID = Field(
         default=uuid4,
         foreign_key="user.uuid",
@@ -3,11 +3,15 @@ from app.organisations.CRUD_permissions import add_or_update_user_role_organisat
 from app.organisations.CRUD import get_members_from_organisation
 from app.organisations.models_permissions import UserOrganisationLink, UserRole
 from app.users.models import UserRead
+from sqlmodel.ext.asyncio.session import AsyncSession
 from uuid import UUID
 
 
 async def add_user_to_organisation(
-    user_uuid: UUID, orga_uuid: UUID, role: UserRole
+    user_uuid: UUID,
+    orga_uuid: UUID,
+    role: UserRole,
+    session: AsyncSession | None = None,
 ) -> UserOrganisationLink | None:
     """
     Ajoute un utilisateur à une organisation avec un rôle spécifique.
@@ -20,14 +24,18 @@ async def add_user_to_organisation(
         created_at=datetime.now(),
         updated_at=datetime.now(),
     )
-    return await add_or_update_user_role_organisation_link(user_org_link)
+    return await add_or_update_user_role_organisation_link(
+        user_org_link, session=session
+    )
 
 
-async def get_users_from_organisation(orga_uuid: UUID) -> list[UserRead]:
+async def get_users_from_organisation(
+    orga_uuid: UUID, session: AsyncSession | None = None
+) -> list[UserRead]:
     """
     Récupère la liste des utilisateurs d'une organisation.
     """
-    return await get_members_from_organisation(orga_uuid)
+    return await get_members_from_organisation(orga_uuid, session=session)
 
 
 async def get_role_from_organisation(
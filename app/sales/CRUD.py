@@ -1,7 +1,19 @@
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from app.sales.models import Sale, SaleCreate, SaleRead, SaleUpdate
 from app.core.exceptions import DatabaseOperationError, SaleNotFoundError
 from app.core.database import get_db_session
+from app.core.loading import load_policy
+from app.core.pagination import KeysetPagination, Page
+from app.core.responses import type_adapter
+from app.lots.CRUD import LOT_READ_LOADING
+
+# What SaleRead serialises
+SALE_READ_LOADING = load_policy(selectinload(Sale.lots).options(*LOT_READ_LOADING))
+
+SALE_PAGINATION = KeysetPagination(
+    Sale.id, {"id": Sale.id, "created_at": Sale.created_at}
+)
 
 
 def create_sale(sale_create: SaleCreate) -> SaleRead:
@@ -45,7 +57,7 @@ def get_sale_by_id(sale_id: int) -> SaleRead:
         HTTPException: If the sale is not found or if the user is not authorized.
     """
     with get_db_session() as session:
-        sale = session.get(Sale, sale_id)
+        sale = session.get(Sale, sale_id, options=SALE_READ_LOADING)
         if not sale:
             raise SaleNotFoundError(f"Sale with id {sale_id} not found")
         return SaleRead.model_validate(sale)
@@ -119,29 +131,53 @@ def get_sales(skip: int = 0, limit: int = 100) -> list[SaleRead]:
     """
     with get_db_session() as session:
         try:
-            statement = select(Sale).offset(skip).limit(limit)
+            statement = (
+                select(Sale).options(*SALE_READ_LOADING).offset(skip).limit(limit)
+            )
             sales = session.exec(statement).all()
-            return [SaleRead.model_validate(sale) for sale in sales]
+            return type_adapter(list[SaleRead]).validate_python(
+                sales, from_attributes=True
+            )
         except Exception as e:
             raise DatabaseOperationError(f"Failed to retrieve sales: {str(e)}")
 
 
 def get_sales_by_organisation(
-    orga_uuid: int, skip: int = 0, limit: int = 100
-) -> list[SaleRead]:
+    orga_uuid: int,
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str = "id",
+    descending: bool = False,
+) -> Page[SaleRead]:
     """
-    Retrieve a list of sales for a specific organisation.
+    Retrieve a page of sales for a specific organisation.
+
+    Args:
+
+        orga_uuid (int): The ID of the organisation.
+        cursor (str | None): The `next_cursor` of the previous page, None for the first page.
+        limit (int): The maximum number of sales to return.
+        sort_by (str): The field to sort by, one of `SALE_PAGINATION.sort_fields`.
+        descending (bool): Whether to sort in descending order.
+
+    Returns:
+        Page[SaleRead]: The retrieved sales and the cursor of the next page.
+
+    Raises:
+        PaginationError: If the cursor or the sort field is invalid.
+        DatabaseOperationError: If an error occurs during the retrieval operation.
     """
+    statement = SALE_PAGINATION.apply(
+        select(Sale).where(Sale.orga_uuid == orga_uuid).options(*SALE_READ_LOADING),
+        sort_by,
+        descending,
+        cursor,
+        limit,
+    )
     with get_db_session() as session:
         try:
-            statement = (
-                select(Sale)
-                .where(Sale.orga_uuid == orga_uuid)
-                .offset(skip)
-                .limit(limit)
-            )
             sales = session.exec(statement).all()
-            return [SaleRead.model_validate(sale) for sale in sales]
+            return SALE_PAGINATION.page(sales, sort_by, descending, limit, SaleRead)
         except Exception as e:
             raise DatabaseOperationError(
                 f"Failed to retrieve sales for organisation: {str(e)}"
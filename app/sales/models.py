@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, Index, SQLModel, Relationship
 from datetime import datetime
 from enum import Enum
 from app.lots.models import Lot, LotRead
@@ -41,6 +41,12 @@ class SaleBase(SQLModel):
 
 
 class Sale(SaleBase, table=True):
+    # Tenant-scoped lookups, in the (filter, id) order used to paginate
+    __table_args__ = (
+        Index("ix_sale_orga_uuid_id", "orga_uuid", "id"),
+        Index("ix_sale_orga_uuid_created_at_id", "orga_uuid", "created_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     lots: list["Lot"] = Relationship(back_populates="sale")
     orga_uuid: UUID = Field(default=None, foreign_key="organisation.uuid")
@@ -48,7 +54,6 @@ class Sale(SaleBase, table=True):
         back_populates="sales",
         sa_relationship_kwargs={
             "foreign_keys": "Sale.orga_uuid",
-            "lazy": "selectin",
         },
     )
     invoices: list["Invoice"] = Relationship(back_populates="sale")
@@ -65,6 +70,13 @@ class SaleRead(SaleBase):
     lots: list["LotRead"] | None = None
 
 
+class SaleSummary(SaleBase):
+    """A sale without its lots, referenced from lot lists."""
+
+    orga_uuid: UUID
+    id: int
+
+
 class SaleUpdate(SaleBase):
     updated_at: datetime = Field(default_factory=datetime.now)
 
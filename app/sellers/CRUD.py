@@ -1,9 +1,33 @@
 from sqlmodel import select
-from app.sellers.models import Seller, SellerCreate, SellerRead, SellerUpdate
+from app.sellers.models import (
+    Seller,
+    SellerCreate,
+    SellerMatch,
+    SellerRead,
+    SellerUpdate,
+)
 from app.core.exceptions import DatabaseOperationError, SellerNotFoundError
 from app.core.database import get_db_session
+from app.core.loading import load_policy
+from app.core.pagination import KeysetPagination, Page
+from app.core.trigrams import (
+    PERSON_SEARCH_COLUMNS,
+    PERSON_SEARCH_DIGIT_COLUMNS,
+    TrigramSearch,
+)
 from uuid import UUID
 
+# SellerRead serialises no relationship
+SELLER_READ_LOADING = load_policy()
+
+SELLER_PAGINATION = KeysetPagination(
+    Seller.id, {"id": Seller.id, "created_at": Seller.created_at}
+)
+
+SELLER_SEARCH = TrigramSearch(
+    Seller, PERSON_SEARCH_COLUMNS, PERSON_SEARCH_DIGIT_COLUMNS
+)
+
 
 def create_seller(seller_create: SellerCreate) -> SellerRead:
     """
@@ -46,7 +70,7 @@ def get_seller_by_id(seller_id: int) -> SellerRead:
         SellerNotFoundError: If the seller is not found.
     """
     with get_db_session() as session:
-        seller = session.get(Seller, seller_id)
+        seller = session.get(Seller, seller_id, options=SELLER_READ_LOADING)
         if not seller:
             raise SellerNotFoundError(f"Seller with id {seller_id} not found")
         return SellerRead.model_validate(seller)
@@ -117,34 +141,75 @@ def delete_seller(seller_id: int) -> SellerRead:
 
 
 def get_sellers_by_organisation(
-    orga_uuid: UUID, skip: int = 0, limit: int = 100
-) -> list[SellerRead]:
+    orga_uuid: UUID,
+    cursor: str | None = None,
+    limit: int = 100,
+    sort_by: str = "id",
+    descending: bool = False,
+) -> Page[SellerRead]:
     """
-    Retrieve a list of sellers for a specific organisation.
+    Retrieve a page of sellers for a specific organisation.
 
     Args:
 
-        orga_uuid (int): The ID of the organisation.
-        skip (int): The number of sellers to skip (for pagination).
+        orga_uuid (UUID): The ID of the organisation.
+        cursor (str | None): The `next_cursor` of the previous page, None for the first page.
         limit (int): The maximum number of sellers to return.
+        sort_by (str): The field to sort by, one of `SELLER_PAGINATION.sort_fields`.
+        descending (bool): Whether to sort in descending order.
 
     Returns:
-        list[SellerRead]: A list of retrieved sellers for the specified organisation.
+        Page[SellerRead]: The retrieved sellers and the cursor of the next page.
 
     Raises:
+        PaginationError: If the cursor or the sort field is invalid.
         DatabaseOperationError: If an error occurs during the retrieval operation.
     """
+    statement = SELLER_PAGINATION.apply(
+        select(Seller)
+        .where(Seller.orga_uuid == orga_uuid)
+        .options(*SELLER_READ_LOADING),
+        sort_by,
+        descending,
+        cursor,
+        limit,
+    )
     with get_db_session() as session:
         try:
-            statement = (
-                select(Seller)
-                .where(Seller.orga_uuid == orga_uuid)
-                .offset(skip)
-                .limit(limit)
-            )
             sellers = session.exec(statement).all()
-            return [SellerRead.model_validate(seller) for seller in sellers]
+            return SELLER_PAGINATION.page(
+                sellers, sort_by, descending, limit, SellerRead
+            )
         except Exception as e:
             raise DatabaseOperationError(
                 f"Failed to retrieve sellers for organisation: {str(e)}"
             )
+
+
+def search_sellers(orga_uuid: UUID, query: str, limit: int = 20) -> list[SellerMatch]:
+    """
+    Fuzzy lookup of the sellers of an organisation by partial name, company,
+    email or phone number, tolerant to typos.
+
+    Args:
+
+        orga_uuid (UUID): The ID of the organisation.
+        query (str): What the clerk typed.
+        limit (int): The maximum number of sellers to return.
+
+    Returns:
+        List[SellerMatch]: The matching sellers, best first.
+
+    Raises:
+        DatabaseOperationError: If an error occurs during the lookup.
+    """
+    with get_db_session() as session:
+        try:
+            return [
+                SellerMatch.model_validate({**seller.model_dump(), "score": score})
+                for seller, score in SELLER_SEARCH.search(
+                    session, orga_uuid, query, limit
+                )
+            ]
+        except Exception as e:
+            raise DatabaseOperationError(f"Failed to search sellers: {str(e)}")
@@ -1,5 +1,5 @@
 from typing import TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, Index, SQLModel, Relationship
 from datetime import datetime
 from uuid import UUID
 
@@ -23,12 +23,18 @@ class SellerBase(SQLModel):
 
 
 class Seller(SellerBase, table=True):
+    # Tenant-scoped lookups, in the (filter, id) order used to paginate
+    __table_args__ = (
+        Index("ix_seller_orga_uuid_id", "orga_uuid", "id"),
+        Index("ix_seller_orga_uuid_created_at_id", "orga_uuid", "created_at", "id"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     lots: list["Lot"] | None = Relationship(
         back_populates="seller",
-        sa_relationship_kwargs={"foreign_keys": "Lot.seller_id", "lazy": "selectin"},
+        sa_relationship_kwargs={"foreign_keys": "Lot.seller_id"},
     )
     orga_uuid: UUID = Field(
         default=None, foreign_key="organisation.uuid", nullable=False
@@ -37,7 +43,6 @@ class Seller(SellerBase, table=True):
         back_populates="sellers",
         sa_relationship_kwargs={
             "foreign_keys": "Seller.orga_uuid",
-            "lazy": "selectin",
         },
     )
 
@@ -54,6 +59,12 @@ class SellerRead(SellerBase):
     updated_at: datetime
 
 
+class SellerMatch(SellerRead):
+    """A seller found by the fuzzy lookup, `score` from 0 to 1."""
+
+    score: float
+
+
 class SellerUpdate(SQLModel):
     first_name: str | None = None
     last_name: str | None = None
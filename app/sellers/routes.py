@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from uuid import UUID
+
+from app.sellers.models import SellerMatch
+from app.sellers.CRUD import search_sellers
+from app.auth.CRUD import verify_organization_access
+from app.core.exceptions import DatabaseOperationError
+from app.core.responses import FastJSONResponse
+
+router = APIRouter(dependencies=[Depends(verify_organization_access)])
+
+
+@router.get("/organization/{orga_uuid}/search", response_model=list[SellerMatch])
+def search(
+    orga_uuid: UUID,
+    q: str = Query(..., min_length=1, description="Name, email or phone"),
+    limit: int = Query(20, ge=1, le=100),
+):
+    try:
+        return FastJSONResponse(search_sellers(orga_uuid, q, limit))
+    except DatabaseOperationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,91 +1,123 @@
 from uuid import UUID
-from sqlmodel import select, Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import CacheBackend, InProcessCache, TTLCache
 from app.core.config import settings
 from app.core.exceptions import DatabaseOperationError, UserNotFoundError
-from app.core.database import get_db_session
+from app.core.database import after_commit, get_async_db_session
+from app.core.passwords import PASSWORD_HASHER
 from app.users.models import User, UserCreate, UserRead, UserUpdate, UserRegister
 from app.organisations.models_permissions import UserOrganisationLink
 
+# Users by uuid, for the authentication of each request. Replace it with a
+# shared `CacheBackend` to invalidate the entries of every worker at once
+USER_CACHE: CacheBackend[UUID, UserRead] = InProcessCache(
+    TTLCache("users", maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_SECONDS)
+)
 
-def _get_password_hash(password: str) -> str:
-    return settings.pwd_context.hash(secret=password)
 
+async def _get_password_hash(password: str) -> str:
+    return await PASSWORD_HASHER.hash(password)
 
-def _get_user(session: Session, user_uuid: UUID) -> User:
-    user = session.get(User, user_uuid)
+
+async def _get_user(session: AsyncSession, user_uuid: UUID) -> User:
+    user = await session.get(User, user_uuid)
     if not user:
         raise UserNotFoundError(f"User with id {user_uuid} not found")
     return user
 
 
-async def create_user(user_create: UserCreate) -> UserRead:
-    with get_db_session() as session:
+async def create_user(
+    user_create: UserCreate, session: AsyncSession | None = None
+) -> UserRead:
+    async with get_async_db_session(session) as session:
         try:
             db_user = User(**user_create.model_dump())
-            db_user.password = _get_password_hash(db_user.password)
+            db_user.password = await _get_password_hash(db_user.password)
             session.add(db_user)
-            session.commit()
-            session.refresh(db_user)
+            await session.flush()
+            await session.refresh(db_user)
             return UserRead.model_validate(db_user)
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to create user: {e}")
 
 
-async def get_user_by_uuid(user_uuid: UUID) -> UserRead:
-    with get_db_session() as session:
-        user = _get_user(session, user_uuid)
+async def get_user_by_uuid(
+    user_uuid: UUID, session: AsyncSession | None = None
+) -> UserRead:
+    async with get_async_db_session(session) as session:
+        user = await _get_user(session, user_uuid)
         return UserRead.model_validate(user)
 
 
-async def get_user_by_email(email: str) -> UserRegister:
-    with get_db_session() as session:
+async def get_cached_user(
+    user_uuid: UUID, session: AsyncSession | None = None
+) -> UserRead:
+    """
+    `get_user_by_uuid` through `USER_CACHE`: the database is only queried
+    for users missing from the cache.
+    """
+    user = await USER_CACHE.get(user_uuid)
+    if user is None:
+        user = await get_user_by_uuid(user_uuid, session=session)
+        await USER_CACHE.set(user_uuid, user)
+    return user
+
+
+async def get_user_by_email(
+    email: str, session: AsyncSession | None = None
+) -> UserRegister:
+    async with get_async_db_session(session) as session:
         statement = select(User).where(User.email == email)
-        user = session.exec(statement).first()
+        user = (await session.exec(statement)).first()
         if not user:
             raise UserNotFoundError(f"User with email {email} not found")
         return UserRegister(uuid=user.uuid, password=user.password)
 
 
-async def update_user(user_update: UserUpdate) -> UserRead:
-    with get_db_session() as session:
+async def update_user(
+    user_update: UserUpdate, session: AsyncSession | None = None
+) -> UserRead:
+    async with get_async_db_session(session) as session:
         try:
-            db_user = _get_user(session, user_update.uuid)
+            db_user = await _get_user(session, user_update.uuid)
             user_data = user_update.model_dump(exclude_unset=True)
             for key, value in user_data.items():
                 setattr(db_user, key, value)
             session.add(db_user)
-            session.commit()
-            session.refresh(db_user)
+            await session.flush()
+            await session.refresh(db_user)
+            after_commit(session, lambda: USER_CACHE.invalidate(user_update.uuid))
             return UserRead.model_validate(db_user)
         except UserNotFoundError:
             raise
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to update user: {e}")
 
 
-async def delete_user(user_uuid: UUID) -> UserRead:
-    with get_db_session() as session:
+async def delete_user(user_uuid: UUID, session: AsyncSession | None = None) -> UserRead:
+    async with get_async_db_session(session) as session:
         try:
-            db_user = _get_user(session, user_uuid)
+            db_user = await _get_user(session, user_uuid)
             deleted_user = UserRead.model_validate(db_user)
-            session.delete(db_user)
-            session.commit()
+            await session.delete(db_user)
+            await session.flush()
+            after_commit(session, lambda: USER_CACHE.invalidate(user_uuid))
             return deleted_user
         except UserNotFoundError:
             raise
         except Exception as e:
-            session.rollback()
             raise DatabaseOperationError(f"Failed to delete user: {e}")
 
 
-async def get_all_orgas_of_user(user_uuid: UUID) -> list[UUID]:
-    with get_db_session() as session:
+async def get_all_orgas_of_user(
+    user_uuid: UUID, session: AsyncSession | None = None
+) -> list[UUID]:
+    async with get_async_db_session(session) as session:
         try:
             statement = select(UserOrganisationLink.orga_uuid).where(
                 UserOrganisationLink.user_uuid == user_uuid
             )
-            return list(session.exec(statement).unique())
+            return list((await session.exec(statement)).unique())
         except Exception as e:
             raise DatabaseOperationError(f"Failed to retrieve organisations ID: {e}")
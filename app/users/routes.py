@@ -13,21 +13,30 @@ from app.organisations.models_organisations import OrganisationCreate
 from app.organisations.CRUD import create_organisation
 from app.organisations.utils import add_user_to_organisation
 from app.organisations.models_permissions import UserRole
+from app.core.database import SessionDep
 
 
 router = APIRouter()
 
 
 @router.post("/new", response_model=UserRead, status_code=201)
-async def write_user(user_to_create: UserCreate) -> UserRead | None:
+async def write_user(
+    user_to_create: UserCreate, session: SessionDep
+) -> UserRead | None:
     try:
-        created_user = await create_user(user_create=user_to_create)
+        # Les trois écritures partagent la transaction de la requête
+        created_user = await create_user(user_create=user_to_create, session=session)
         organisation_details = OrganisationCreate(
             name=f"Organisation de {created_user.last_name}"
         )
-        user_orga = await create_organisation(organisation_create=organisation_details)
+        user_orga = await create_organisation(
+            organisation_create=organisation_details, session=session
+        )
         _ = await add_user_to_organisation(
-            user_uuid=created_user.uuid, orga_uuid=user_orga.uuid, role=UserRole.ADMIN
+            user_uuid=created_user.uuid,
+            orga_uuid=user_orga.uuid,
+            role=UserRole.ADMIN,
+            session=session,
         )
         return created_user
     except Exception as e:
@@ -43,28 +52,30 @@ async def get_current_user_info(current_user: CurrentUser) -> UserRead:
 
 
 @router.get("/{user_uuid}", response_model=UserRead, status_code=200)
-async def read_user(user_uuid: UUID) -> UserRead | None:
+async def read_user(user_uuid: UUID, session: SessionDep) -> UserRead | None:
     try:
-        user = await get_user_by_uuid(user_uuid=user_uuid)
+        user = await get_user_by_uuid(user_uuid=user_uuid, session=session)
         return user
     except Exception as e:
         raise HTTPException(status_code=500, detail=e)
 
 
 @router.patch("/{user_uuid}", response_model=UserRead, status_code=200)
-async def patch_user(user_update: UserUpdate) -> UserRead | None:
+async def patch_user(user_update: UserUpdate, session: SessionDep) -> UserRead | None:
     try:
-        user = await update_user(user_update=user_update)
+        user = await update_user(user_update=user_update, session=session)
         return user
     except Exception as e:
         raise HTTPException(status_code=500, detail="Something went wrong")
 
 
 @router.get("/me/organisations", response_model=list[UUID], status_code=200)
-async def get_user_organisations(request: Request):
+async def get_user_organisations(request: Request, session: SessionDep):
     try:
         user_uuid = request.state.user_uuid
-        organisations = await get_all_orgas_of_user(user_uuid=user_uuid)
+        organisations = await get_all_orgas_of_user(
+            user_uuid=user_uuid, session=session
+        )
         return organisations
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.exceptions import UserNotFoundError
+from app.main import app
+from app.users import routes as users_routes
+from app.users.CRUD import get_user_by_email
+
+client = TestClient(app, raise_server_exceptions=False)
+
+
+def _checkouts() -> int:
+    return async_engine.sync_engine.pool.metrics.wait_time_ms.count
+
+
+def _register(email: str):
+    return client.post(
+        f"{settings.API_V1_STR}/users/new",
+        json={"email": email, "password": "secret", "last_name": "Durand"},
+    )
+
+
+def test_login_uses_a_single_connection():
+    email = f"uow-{uuid4()}@example.com"
+    assert _register(email).status_code == 201
+
+    before = _checkouts()
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": email, "password": "secret"},
+    )
+    assert response.status_code == 200
+    assert _checkouts() - before == 1
+
+
+def test_user_registration_is_atomic(monkeypatch):
+    async def failing_link(**kwargs):
+        raise RuntimeError("link failed")
+
+    monkeypatch.setattr(users_routes, "add_user_to_organisation", failing_link)
+    email = f"uow-{uuid4()}@example.com"
+
+    assert _register(email).status_code == 500
+
+    # The user row written earlier in the request was rolled back
+    with pytest.raises(UserNotFoundError):
+        asyncio.run(get_user_by_email(email))
@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from uuid import uuid4
+
+from app.core.database import async_engine, get_async_db_session
+from app.core.exceptions import UserNotFoundError
+from app.core.query_stats import track_queries
+from app.users.CRUD import (
+    create_user,
+    delete_user,
+    get_cached_user,
+    update_user,
+)
+from app.users.models import UserCreate, UserUpdate
+
+
+def _create_user():
+    return asyncio.run(
+        create_user(UserCreate(email=f"cache-{uuid4()}@example.com", password="secret"))
+    )
+
+
+def _checkouts() -> int:
+    return async_engine.sync_engine.pool.metrics.wait_time_ms.count
+
+
+def test_cached_user_costs_no_connection():
+    user = _create_user()
+    assert asyncio.run(get_cached_user(user.uuid)) == user
+
+    before = _checkouts()
+    with track_queries() as stats:
+        assert asyncio.run(get_cached_user(user.uuid)) == user
+    assert stats.count == 0
+    assert _checkouts() == before
+
+
+def test_update_and_delete_invalidate_once_committed():
+    user = _create_user()
+    asyncio.run(get_cached_user(user.uuid))
+
+    async def update_then_read():
+        async with get_async_db_session() as session:
+            await update_user(
+                UserUpdate(uuid=user.uuid, email=user.email, last_name="Moreau"),
+                session=session,
+            )
+            # Not committed yet: other sessions still read the cached values
+            assert (await get_cached_user(user.uuid)).last_name is None
+        return await get_cached_user(user.uuid)
+
+    assert asyncio.run(update_then_read()).last_name == "Moreau"
+
+    async def rolled_back_update():
+        try:
+            async with get_async_db_session() as session:
+                await update_user(
+                    UserUpdate(uuid=user.uuid, email=user.email, last_name="Roux"),
+                    session=session,
+                )
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        return await get_cached_user(user.uuid)
+
+    assert asyncio.run(rolled_back_update()).last_name == "Moreau"
+
+    asyncio.run(delete_user(user.uuid))
+    with pytest.raises(UserNotFoundError):
+        asyncio.run(get_cached_user(user.uuid))
@@ -0,0 +1,164 @@
+"""
+Query plans and latencies of the lot lookups, with and without the tenant
+and foreign key indexes.
+
+Seeds a dedicated database (never point it at a real one: its schema is
+dropped first) with organisations of very different sizes, then times each
+lookup with the indexes dropped and once they are created again.
+
+    python -m benchmarks.lot_indexes --lots 1000000
+    python -m benchmarks.lot_indexes --database postgresql+psycopg://...
+"""
+
+import argparse
+from datetime import datetime
+import random
+from statistics import median
+from time import perf_counter
+from uuid import UUID, uuid4
+from sqlalchemy import Engine, Select, create_engine, select
+from sqlmodel import SQLModel
+
+from app.core.database import Client, Lot, Organisation, Sale, Seller
+from app.core.migrations import run_migrations
+from app.core.slow_queries import explain_statement
+
+BATCH_SIZE = 10_000
+PAGE_SIZE = 100
+
+
+def seed(engine: Engine, lots: int, organisations: int) -> UUID:
+    """Insert the dataset and return the uuid of the largest organisation."""
+    SQLModel.metadata.drop_all(engine)
+    run_migrations(engine)
+
+    rng = random.Random(42)
+    now = datetime.now()
+    orga_uuids = [uuid4() for _ in range(organisations)]
+    # One large auction house holding half of the lots, the rest spread out
+    weights = [organisations] + [1] * (organisations - 1)
+
+    with engine.begin() as conn:
+        conn.execute(
+            Organisation.__table__.insert(),  # type: ignore[attr-defined]
+            [
+                {
+                    "uuid": uuid,
+                    "name": f"Orga {i}",
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i, uuid in enumerate(orga_uuids)
+            ],
+        )
+        parents = {}
+        for model, extra in (
+            (Sale, {"status": "planned"}),
+            (Seller, {"professional": False}),
+            (Client, {"professional": False}),
+        ):
+            rows = [
+                {
+                    "id": i + 1,
+                    "orga_uuid": orga_uuids[i % organisations],
+                    "created_at": now,
+                    "updated_at": now,
+                    **extra,
+                }
+                for i in range(max(lots // 1000, organisations))
+            ]
+            conn.execute(model.__table__.insert(), rows)  # type: ignore[attr-defined]
+            parents[model] = len(rows)
+
+    insert = Lot.__table__.insert()  # type: ignore[attr-defined]
+    for start in range(0, lots, BATCH_SIZE):
+        rows = [
+            {
+                "orga_uuid": rng.choices(orga_uuids, weights)[0],
+                "name": f"Lot {i}",
+                "sale_id": rng.randint(1, parents[Sale]),
+                "seller_id": rng.randint(1, parents[Seller]),
+                "buyer_id": rng.randint(1, parents[Client]),
+                "tax_rate": 20.0,
+                "is_reserve_price_net": False,
+                "has_capital_gains_tax": False,
+                "has_copyright": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(start, min(start + BATCH_SIZE, lots))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert, rows)
+    return orga_uuids[0]
+
+
+def lookups(orga_uuid: UUID) -> dict[str, Select]:
+    return {
+        "lots of an organisation, first page": select(Lot)
+        .where(Lot.orga_uuid == orga_uuid)
+        .order_by(Lot.id)
+        .limit(PAGE_SIZE),
+        "lots of an organisation, page 100": select(Lot)
+        .where(Lot.orga_uuid == orga_uuid)
+        .order_by(Lot.id)
+        .offset(99 * PAGE_SIZE)
+        .limit(PAGE_SIZE),
+        "lots of a sale": select(Lot)
+        .where(Lot.sale_id == 1)
+        .order_by(Lot.id)
+        .limit(PAGE_SIZE),
+        "lots of a seller": select(Lot)
+        .where(Lot.seller_id == 1)
+        .order_by(Lot.id)
+        .limit(PAGE_SIZE),
+        "lots bought by a client": select(Lot)
+        .where(Lot.buyer_id == 1)
+        .order_by(Lot.id)
+        .limit(PAGE_SIZE),
+    }
+
+
+def measure(engine: Engine, orga_uuid: UUID, repeat: int) -> None:
+    for label, statement in lookups(orga_uuid).items():
+        sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+        timings = []
+        with engine.connect() as conn:
+            for _ in range(repeat):
+                start = perf_counter()
+                conn.execute(statement).all()
+                timings.append((perf_counter() - start) * 1000)
+        print(f"  {label}: median {median(timings):.2f} ms, max {max(timings):.2f} ms")
+        for line in explain_statement(engine, sql, None):
+            print(f"      {line}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", default="sqlite:///benchmark_lots.db")
+    parser.add_argument("--lots", type=int, default=1_000_000)
+    parser.add_argument("--organisations", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database)
+    start = perf_counter()
+    orga_uuid = seed(engine, args.lots, args.organisations)
+    print(f"Seeded {args.lots} lots in {perf_counter() - start:.1f} s")
+
+    indexes = Lot.__table__.indexes  # type: ignore[attr-defined]
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(conn)
+    print("\nWithout indexes")
+    measure(engine, orga_uuid, args.repeat)
+
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(conn)
+    print("\nWith indexes")
+    measure(engine, orga_uuid, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
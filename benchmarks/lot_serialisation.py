@@ -0,0 +1,81 @@
+"""
+Time to build and serialise a response of 10,000 `LotRead`.
+
+Before: one `LotRead.model_validate` per row in the CRUD layer, then
+FastAPI's `response_model` handling (dump, validate again, serialise) and
+the stdlib `JSONResponse`. After: a single `TypeAdapter` validation of the
+rows and `FastJSONResponse`, which dumps the models once with pydantic-core.
+
+    python -m benchmarks.lot_serialisation --lots 10000
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from statistics import median
+from time import perf_counter
+from uuid import uuid4
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.database import Lot, Organisation
+from app.core.responses import FastJSONResponse, type_adapter
+from app.lots.models import LotRead
+
+
+def build_lots(count: int) -> list[Lot]:
+    now = datetime.now()
+    organisation = Organisation(uuid=uuid4(), name="Benchmark", siren_number=1)
+    return [
+        Lot(
+            id=i,
+            name=f"Lot {i}",
+            description="Commode Louis XV en marqueterie",
+            starting_bid=100.0 + i,
+            low_estimate=80.0,
+            high_estimate=150.0,
+            stock_number=f"S{i}",
+            created_at=now,
+            updated_at=now,
+            orga_uuid=organisation.uuid,
+            organisation=organisation,
+        )
+        for i in range(count)
+    ]
+
+
+def before(lots: list[Lot]) -> bytes:
+    items = [LotRead.model_validate(lot) for lot in lots]
+    field = create_model_field("Response", list[LotRead], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=items))
+    return JSONResponse(content).body
+
+
+def after(lots: list[Lot]) -> bytes:
+    items = type_adapter(list[LotRead]).validate_python(lots, from_attributes=True)
+    return FastJSONResponse(items).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lots", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    lots = build_lots(args.lots)
+    for label, build in (("before", before), ("after", after)):
+        build(lots)  # Warm up: schemas and adapters are built on first use
+        timings = []
+        for _ in range(args.repeat):
+            start = perf_counter()
+            body = build(lots)
+            timings.append((perf_counter() - start) * 1000)
+        print(
+            f"{label}: median {median(timings):.1f} ms, "
+            f"max {max(timings):.1f} ms, {len(body) / 1024:.0f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import pytest
+from app.core.database import init_db
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fresh_db():
+    # The app no longer rebuilds its schema when imported: start every test
+    # session from an empty, fully migrated database
+    init_db()
@@ -126,8 +126,8 @@ def test_get_clients_by_organisation():
         )
         create_client(client_create=client_create)
 
-    results_org1 = get_clients_by_organisation(orga_uuid=org1.uuid)
-    results_org2 = get_clients_by_organisation(orga_uuid=org2.uuid)
+    results_org1 = get_clients_by_organisation(orga_uuid=org1.uuid).items
+    results_org2 = get_clients_by_organisation(orga_uuid=org2.uuid).items
 
     assert len(results_org1) == 3
     assert len(results_org2) == 2
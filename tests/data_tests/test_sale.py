@@ -159,8 +159,8 @@ def test_get_sales_by_organisation():
         )
         create_sale(sale_create=sale_create)
 
-    results_org1 = get_sales_by_organisation(orga_uuid=org1.uuid)
-    results_org2 = get_sales_by_organisation(orga_uuid=org2.uuid)
+    results_org1 = get_sales_by_organisation(orga_uuid=org1.uuid).items
+    results_org2 = get_sales_by_organisation(orga_uuid=org2.uuid).items
 
     assert len(results_org1) == 3
     assert len(results_org2) == 2
@@ -153,8 +153,8 @@ def test_get_sellers_by_organisation():
         )
         create_seller(seller_create=seller_create)
 
-    results_org1 = get_sellers_by_organisation(orga_uuid=org1.uuid)
-    results_org2 = get_sellers_by_organisation(orga_uuid=org2.uuid)
+    results_org1 = get_sellers_by_organisation(orga_uuid=org1.uuid).items
+    results_org2 = get_sellers_by_organisation(orga_uuid=org2.uuid).items
 
     assert len(results_org1) == 3
     assert len(results_org2) == 2